@@ -15,6 +15,14 @@ from pathlib import Path
 
 from core.config import get_output_path, update_state
 from core import ado as ado_client
+from core.images import (
+    RENDITION_DIR,
+    dedupe_screens,
+    human_bytes,
+    image_settings,
+    normalize_screens,
+)
+from core.workitem_cache import work_item_cache
 
 
 def run(proj: dict, figma_link: str, story_ids: list[str] | None = None) -> None:
@@ -45,6 +53,15 @@ def run(proj: dict, figma_link: str, story_ids: list[str] | None = None) -> None
     if screens is None:
         return
 
+    # Collapse duplicate frames, then normalize screenshots (downsized +
+    # re-encoded, cached in output/image_cache/)
+    image_cache = get_output_path(proj, RENDITION_DIR)
+    fetched = len(screens)
+    screens = dedupe_screens(screens, image_cache)
+    if len(screens) < fetched:
+        click.echo(f"  Collapsed {fetched - len(screens)} duplicate screenshot(s) into aliases")
+    image_bytes = normalize_screens(screens, image_cache, image_settings(proj))
+
     # Fetch ADO stories (optionally filtered)
     stories = _fetch_ado_stories(proj, story_ids)
     if stories is None:
@@ -55,6 +72,8 @@ def run(proj: dict, figma_link: str, story_ids: list[str] | None = None) -> None
         "figma_file_key": file_key,
         "screens": screens,
         "stories": stories,
+        "image_bytes": image_bytes,
+        "duplicate_screens": fetched - len(screens),
     }
     bundle_path = get_output_path(proj, "enrichment_bundle.json")
     with open(bundle_path, "w", encoding="utf-8") as f:
@@ -62,7 +81,9 @@ def run(proj: dict, figma_link: str, story_ids: list[str] | None = None) -> None
 
     click.secho(f"\n  ✓ Enrichment bundle ready", fg="green", bold=True)
     click.echo(f"    Bundle: {bundle_path}")
-    click.echo(f"    Screens: {len(screens)}")
+    click.echo(f"    Screens: {len(screens)} "
+               f"({human_bytes(image_bytes['original_bytes'])} → "
+               f"{human_bytes(image_bytes['normalized_bytes'])} normalized)")
     click.echo(f"    Stories: {len(stories)}")
     click.echo(f"\n  Next: analyze the bundle in conversation to generate detailed AC.")
 
@@ -172,7 +193,7 @@ def _fetch_ado_stories(proj: dict, story_ids: list[str] | None = None) -> list[d
 
     click.echo("  Fetching stories from ADO...")
     try:
-        data = ado_client.get_all_work_items(config)
+        data = ado_client.get_all_work_items(config, cache=work_item_cache(proj))
     except Exception as e:
         click.secho(f"  ✗ ADO fetch failed: {e}", fg="red")
         return None
@@ -2,27 +2,57 @@
 
 import json
 import click
+from dataclasses import asdict
 from pathlib import Path
 
 from core.config import (
     get_input_dir, get_changes_dir, get_output_path, update_state, update_status, save_project
 )
 from core.context import compute_input_hash, invalidate_downstream
+from core.dedup import deduplicated_text, find_duplicates, signature_cache, text_signatures
 from core.events import append_event
+from core.images import (
+    RENDITION_DIR,
+    group_duplicates,
+    human_bytes,
+    image_settings,
+    normalize_image,
+)
+from core.parse_cache import parse_cache
+from core.search import search_index
+from core.transcripts import PRECOMPACT_DIR, precompact_copy_path, write_precompact_copy
 from core.parser import (
     parse_directory, estimate_tokens, compute_file_hash, parsed_filename,
-    ParsedFile,
+    parsed_header, parsed_text, plan_context, ParsedFile, CONTEXT_BUDGET_TOKENS,
+    FORMAT_PRIORITY,
 )
 from core.usage import log_operation
 
+PAGE_INDEX_FILE = "pdf_page_index.json"
+CONTEXT_PLAN_FILE = "context_plan.json"
+
 
-def run(proj: dict) -> None:
+def run(proj: dict, workers: int | None = None, full_tables: bool = False,
+        dedup_view: bool = False) -> None:
     """
     Parse all files in input/ directory and produce:
       - output/parsed/<filename>.md  (one per source file)
       - output/requirements_manifest.json (metadata about parsed files)
+      - output/search_index.sqlite (BM25 index for `xproject search`)
+      - output/parsed_dedup/<filename>.md with `dedup_view` (or
+        ingest.dedup_view in project.yaml): parsed files with near-duplicate
+        files/paragraphs replaced by references (see core.dedup)
+      - output/context_plan.json (files in priority order within the
+        project.yaml context.budget_tokens budget; see parser.plan_context)
 
     Only new/changed files are written. Removed files are cleaned up.
+    Files are parsed on `workers` processes (default: parser.PARSE_WORKERS);
+    files unchanged since the last ingest come from output/.parse_cache/.
+    PDFs are streamed page by page straight into output/parsed/. Large PDFs
+    are split into page ranges parsed in parallel; the thresholds can be set
+    in project.yaml under ingest.pdf_split_pages / ingest.pdf_chunk_pages.
+    PDF pages with no table geometry skip table extraction unless
+    `full_tables` is set (which also re-parses cached files).
     """
     input_dir = get_input_dir(proj)
     changes_dir = get_changes_dir(proj)
@@ -38,12 +68,28 @@ def run(proj: dict) -> None:
         return
 
     # Parse all files from input/ and changes/
-    parsed = parse_directory(input_dir)
+    cache = parse_cache(proj)
+    parsed_dir = get_output_path(proj, "parsed")
+    parsed_dir.mkdir(parents=True, exist_ok=True)
+    ingest_cfg = proj.get("ingest", {})
+    parse_opts = {
+        "workers": workers,
+        "cache": cache,
+        "stream_dir": parsed_dir,
+        "pdf_split_pages": ingest_cfg.get("pdf_split_pages"),
+        "pdf_chunk_pages": ingest_cfg.get("pdf_chunk_pages"),
+        "full_tables": full_tables,
+    }
+    parsed = parse_directory(input_dir, **parse_opts)
     if changes_dir.exists() and any(changes_dir.rglob("*")):
-        changes_parsed = parse_directory(changes_dir)
+        changes_parsed = parse_directory(changes_dir, **parse_opts)
         if changes_parsed:
             click.echo(f"  Also parsing {len(changes_parsed)} file(s) from changes/")
             parsed.extend(changes_parsed)
+    cache.save()
+    if cache.hits:
+        click.echo(f"  Parse cache: {cache.hits} unchanged file(s) reused, "
+                   f"{cache.misses} parsed")
 
     if not parsed:
         click.secho("  ✗ No supported files found", fg="red")
@@ -71,29 +117,36 @@ def run(proj: dict) -> None:
     new_files = [f for f, status in file_changes.items() if status == "new"]
     changed_files = [f for f, status in file_changes.items() if status == "changed"]
     removed_files = [f for f in prev_hashes if f not in file_changes]
+    changed_pages = _update_page_index(proj, parsed)
 
     if prev_hashes and (new_files or changed_files or removed_files):
         click.secho(f"\n  Changes since last ingest:", fg="cyan")
         for f in new_files:
             click.echo(f"    + {f} (new)")
         for f in changed_files:
-            click.echo(f"    ~ {f} (changed)")
+            if changed_pages.get(f):
+                click.echo(f"    ~ {f} (changed: pages {_page_ranges(changed_pages[f])})")
+            else:
+                click.echo(f"    ~ {f} (changed)")
         for f in removed_files:
             click.echo(f"    - {f} (removed)")
 
-    # Ensure parsed directory exists
-    parsed_dir = get_output_path(proj, "parsed")
-    parsed_dir.mkdir(parents=True, exist_ok=True)
-
     # Write parsed .md files — only for new/changed files
+    # (streamed PDFs were already written during parsing)
     total_chars = 0
     written = 0
+    compact_dir = get_output_path(proj, PRECOMPACT_DIR)
     for pf in parsed:
-        if pf.error or pf.is_image or not pf.text.strip():
+        if pf.error or pf.is_image:
+            continue
+        if pf.parsed_path:
+            total_chars += len(parsed_header(pf.filename, pf.format)) + 2 + _text_length(pf)
+            continue
+        if not pf.text.strip():
             continue
         out_name = parsed_filename(pf.filename)
         out_path = parsed_dir / out_name
-        content = f"# {pf.filename} ({pf.format})\n\n{pf.text.strip()}"
+        content = f"{parsed_header(pf.filename, pf.format)}\n\n{pf.text.strip()}"
         total_chars += len(content)
 
         change = file_changes.get(pf.filename, "new")
@@ -101,47 +154,101 @@ def run(proj: dict) -> None:
             out_path.write_text(content, encoding="utf-8")
             written += 1
 
-    # Remove parsed files for deleted source files
+        # Pre-compacted transcripts also get a standalone copy in output/
+        if "precompact_reduction" in pf.metadata:
+            copy_path = precompact_copy_path(compact_dir, pf.filename)
+            if change in ("new", "changed") or not copy_path.exists():
+                write_precompact_copy(compact_dir, pf.filename, pf.text.strip(), pf.metadata)
+            pf.metadata["precompact_path"] = str(copy_path)
+
+    # Remove parsed files (and transcript copies) for deleted source files
     for fname in removed_files:
-        old_path = parsed_dir / parsed_filename(fname)
-        if old_path.exists():
-            old_path.unlink()
+        for old_path in (parsed_dir / parsed_filename(fname),
+                         precompact_copy_path(compact_dir, fname)):
+            if old_path.exists():
+                old_path.unlink()
 
     if written:
         click.secho(f"    Wrote {written} parsed file(s) to output/parsed/", fg="cyan")
 
-    # Save image references for downstream use
-    image_blocks = []
+    # Update the BM25 search index (only new/changed/removed parsed files)
+    search_stats = search_index(proj).update()
+    if search_stats["indexed"] or search_stats["removed"]:
+        click.secho(f"    Search index: {search_stats['indexed']} file(s) indexed, "
+                    f"{search_stats['removed']} removed", fg="cyan")
+
+    # Near-duplicate files/paragraphs (MinHash) — flagged in the manifest
+    duplicates = _detect_duplicates(proj, text_files)
+    tokens_saved = sum(duplicates.tokens_saved.values())
+    if duplicates.files or duplicates.paragraphs:
+        click.secho(f"\n  Near-duplicates: {len(duplicates.files)} file(s), "
+                    f"{sum(len(p) for p in duplicates.paragraphs.values())} paragraph(s) "
+                    f"(~{tokens_saved:,} tokens)", fg="cyan")
+        for fname, dup in duplicates.files.items():
+            click.echo(f"    ≈ {fname} ~ {dup['file']} ({dup['similarity']:.0%})")
+    if dedup_view or ingest_cfg.get("dedup_view"):
+        dedup_dir = _write_dedup_view(proj, text_files, duplicates)
+        click.secho(f"    Wrote deduplicated view to {dedup_dir.name}/", fg="cyan")
+
+    # Collapse duplicate images, normalize the rest (cached in
+    # output/image_cache/) and save references for downstream use
+    aliases = _dedupe_images(proj, images)
+    canonical = [pf for pf in images if "duplicate_of" not in pf.metadata]
+    image_bytes = _normalize_images(proj, canonical)
     if images:
         images_path = get_output_path(proj, "requirements_images.json")
         img_refs = []
-        for pf in images:
+        for pf in canonical:
             img_refs.append({
                 "filename": pf.filename,
                 "media_type": pf.image_media_type,
                 "size_bytes": pf.metadata.get("size_bytes", 0),
-                "path": str(input_dir / pf.filename),
+                "path": pf.image_path,
+                "normalized_path": pf.metadata.get("normalized_path", pf.image_path),
+                "normalized_media_type": pf.metadata.get("normalized_media_type",
+                                                         pf.image_media_type),
+                "normalized_bytes": pf.metadata.get("normalized_bytes",
+                                                    pf.metadata.get("size_bytes", 0)),
+                "aliases": aliases.get(pf.filename, []),
             })
         with open(images_path, "w", encoding="utf-8") as f:
             json.dump(img_refs, f, indent=2)
         click.secho(f"\n  📷 {len(images)} image(s) detected — will be sent to Claude vision", fg="cyan")
+        if len(canonical) < len(images):
+            click.echo(f"    Duplicates: {len(images) - len(canonical)} collapsed into "
+                       f"{len(canonical)} unique image(s)")
+        if image_bytes["image_original_bytes"]:
+            click.echo(f"    Normalized: {human_bytes(image_bytes['image_original_bytes'])} → "
+                       f"{human_bytes(image_bytes['image_normalized_bytes'])}")
 
     # Save manifest
     est_tokens = estimate_tokens("x" * total_chars)  # approximate
+    parse_times = _parse_times_by_format(parsed)
+    table_pages = _table_page_counts(parsed)
     manifest = {
         "project": project_name,
-        "files": [_file_manifest(pf, file_changes.get(pf.filename, "new")) for pf in parsed],
+        "files": [_file_manifest(pf, file_changes.get(pf.filename, "new"),
+                                 changed_pages.get(pf.filename), duplicates) for pf in parsed],
         "summary": {
             "total_files": len(parsed),
             "successful": len(success),
             "errors": len(errors),
             "text_files": len(text_files),
             "image_files": len(images),
+            "duplicate_images": len(images) - len(canonical),
+            "near_duplicate_files": len(duplicates.files),
+            "duplicate_paragraphs": sum(len(p) for p in duplicates.paragraphs.values()),
+            "estimated_tokens_saved": tokens_saved,
             "total_text_chars": total_chars,
             "estimated_tokens": est_tokens,
             "new_files": new_files,
             "changed_files": changed_files,
             "removed_files": removed_files,
+            "parse_seconds": round(sum(parse_times.values()), 3),
+            "parse_cache_hits": cache.hits,
+            "parse_seconds_by_format": parse_times,
+            **table_pages,
+            **image_bytes,
         },
     }
 
@@ -149,6 +256,13 @@ def run(proj: dict) -> None:
     with open(manifest_path, "w", encoding="utf-8") as f:
         json.dump(manifest, f, indent=2)
 
+    # Context plan: priority reading order within the discovery token budget
+    budget = proj.get("context", {}).get("budget_tokens", CONTEXT_BUDGET_TOKENS)
+    plan = plan_context(parsed, budget, file_changes)
+    plan_path = get_output_path(proj, CONTEXT_PLAN_FILE)
+    with open(plan_path, "w", encoding="utf-8") as f:
+        json.dump(asdict(plan), f, indent=2)
+
     # Compute hash and update state
     req_hash = compute_input_hash(proj)
 
@@ -173,6 +287,7 @@ def run(proj: dict) -> None:
     # Log usage
     log_operation(proj, "ingest", details={
         "files_parsed": len(success),
+        "parse_seconds": round(sum(parse_times.values()), 3),
         "new_files": len(new_files),
         "changed_files": len(changed_files),
         "removed_files": len(removed_files),
@@ -182,6 +297,14 @@ def run(proj: dict) -> None:
     click.secho(f"\n  ✓ Requirements ingested successfully", fg="green", bold=True)
     click.echo(f"    Parsed files: {parsed_dir}/ ({len(text_files)} files, {_human_size(total_chars)})")
     click.echo(f"    Manifest: {manifest_path}")
+    click.echo(f"    Context plan: {len(plan.included)} file(s) in ~{plan.used_tokens:,} of "
+               f"{budget:,} tokens, {len(plan.dropped)} dropped ({plan_path.name})")
+    if parse_times:
+        by_format = ", ".join(f"{fmt} {secs:.1f}s" for fmt, secs in parse_times.items())
+        click.echo(f"    Parse time: {sum(parse_times.values()):.1f}s ({by_format})")
+    if table_pages["table_fast_pages"] or table_pages["table_full_pages"]:
+        click.echo(f"    PDF tables: {table_pages['table_full_pages']} page(s) fully extracted, "
+                   f"{table_pages['table_fast_pages']} skipped (no table geometry)")
     click.echo(f"    Hash: {req_hash}")
     click.echo(f"\n    Next step: xproject discover {project_name}")
 
@@ -190,12 +313,12 @@ def _content_size(pf: ParsedFile) -> str:
     """Human-readable content size."""
     if pf.is_image:
         size = pf.metadata.get("size_bytes", 0)
-        return _human_size(size)
-    return _human_size(len(pf.text))
+        return human_bytes(size)
+    return _human_size(_text_length(pf))
 
 
 def _human_size(n: int) -> str:
-    """Convert byte/char count to human-readable."""
+    """Convert a character count to human-readable."""
     if n < 1024:
         return f"{n} chars"
     elif n < 1024 * 1024:
@@ -204,7 +327,18 @@ def _human_size(n: int) -> str:
         return f"{n/(1024*1024):.1f} MB"
 
 
-def _file_manifest(pf: ParsedFile, change_status: str = "new") -> dict:
+def _text_length(pf: ParsedFile) -> int:
+    """Text length, also for PDFs streamed to disk (text not held in memory)."""
+    return pf.metadata["text_length"] if pf.parsed_path else len(pf.text)
+
+
+def _content_hash(pf: ParsedFile) -> str:
+    """compute_file_hash() of the text, also for streamed PDFs."""
+    return pf.metadata["content_hash"] if pf.parsed_path else compute_file_hash(pf.text)
+
+
+def _file_manifest(pf: ParsedFile, change_status: str = "new",
+                   changed_pages: list[int] | None = None, duplicates=None) -> dict:
     """Create manifest entry for a parsed file."""
     entry = {
         "filename": pf.filename,
@@ -219,14 +353,141 @@ def _file_manifest(pf: ParsedFile, change_status: str = "new") -> dict:
         entry["media_type"] = pf.image_media_type
     else:
         entry["type"] = "text"
-        entry["text_length"] = len(pf.text)
-        entry["estimated_tokens"] = estimate_tokens(pf.text)
-        entry["content_hash"] = compute_file_hash(pf.text)
+        entry["text_length"] = _text_length(pf)
+        entry["estimated_tokens"] = _text_length(pf) // 4
+        entry["content_hash"] = _content_hash(pf)
         entry["parsed_file"] = parsed_filename(pf.filename)
+        if changed_pages:
+            entry["changed_pages"] = changed_pages
+        if duplicates is not None:
+            if pf.filename in duplicates.files:
+                entry["near_duplicate_of"] = duplicates.files[pf.filename]
+            if pf.filename in duplicates.paragraphs:
+                entry["duplicate_paragraphs"] = len(duplicates.paragraphs[pf.filename])
+            if pf.filename in duplicates.tokens_saved:
+                entry["duplicate_tokens"] = duplicates.tokens_saved[pf.filename]
     entry.update({k: v for k, v in pf.metadata.items()})
     return entry
 
 
+def _detect_duplicates(proj: dict, text_files: list[ParsedFile]):
+    """MinHash near-duplicate report over the parsed text files.
+
+    Preferred formats come first (parser.FORMAT_PRIORITY), so of a spec sent
+    as DOCX and PDF the DOCX is canonical. Signatures are cached by content
+    hash; only files with new text are read and hashed.
+    """
+    ranked = sorted(text_files, key=lambda pf: (
+        FORMAT_PRIORITY.index(pf.format) if pf.format in FORMAT_PRIORITY else len(FORMAT_PRIORITY),
+        pf.filename,
+    ))
+    cache = signature_cache(proj)
+    report = find_duplicates(_file_signatures(ranked, cache))
+    cache.prune()
+    return report
+
+
+def _file_signatures(text_files: list[ParsedFile], cache):
+    """Yield (filename, TextSignatures), reading text only on a cache miss."""
+    for pf in text_files:
+        key = _content_hash(pf)
+        sigs = cache.get(key)
+        if sigs is None:
+            try:
+                sigs = text_signatures(parsed_text(pf))
+            except OSError:
+                continue
+            cache.put(key, sigs)
+        yield pf.filename, sigs
+
+
+def _write_dedup_view(proj: dict, text_files: list[ParsedFile], duplicates) -> Path:
+    """Write output/parsed_dedup/ — parsed files with duplicates replaced by references."""
+    dedup_dir = get_output_path(proj, "parsed_dedup")
+    dedup_dir.mkdir(parents=True, exist_ok=True)
+    keep = set()
+    for pf in text_files:
+        try:
+            text = parsed_text(pf)
+        except OSError:
+            continue
+        if not text:
+            continue
+        out_name = parsed_filename(pf.filename)
+        body = deduplicated_text(pf.filename, text, duplicates)
+        (dedup_dir / out_name).write_text(f"{parsed_header(pf.filename, pf.format)}\n\n{body}",
+                                          encoding="utf-8")
+        keep.add(out_name)
+    for old in dedup_dir.glob("*.md"):
+        if old.name not in keep:
+            old.unlink()
+    return dedup_dir
+
+
+def _dedupe_images(proj: dict, images: list[ParsedFile]) -> dict[str, list[str]]:
+    """Mark near-duplicate images; returns canonical filename → alias filenames.
+
+    Aliases get metadata["duplicate_of"] (so they show in the manifest and
+    build_context skips them).
+    """
+    by_path = {pf.image_path: pf for pf in images}
+    groups = group_duplicates([Path(p) for p in by_path], get_output_path(proj, RENDITION_DIR))
+    aliases = {}
+    for group in groups:
+        first = by_path[str(group[0])]
+        aliases[first.filename] = []
+        for path in group[1:]:
+            alias = by_path[str(path)]
+            alias.metadata["duplicate_of"] = first.filename
+            aliases[first.filename].append(alias.filename)
+    return aliases
+
+
+def _normalize_images(proj: dict, images: list[ParsedFile]) -> dict[str, int]:
+    """Normalize dropped images via core.images; returns original/normalized byte totals.
+
+    Per-image results go into pf.metadata (and so into the manifest).
+    """
+    cache_dir = get_output_path(proj, RENDITION_DIR)
+    settings = image_settings(proj)
+    totals = {"image_original_bytes": 0, "image_normalized_bytes": 0}
+    for pf in images:
+        try:
+            norm = normalize_image(Path(pf.image_path), cache_dir, **settings)
+        except OSError:
+            continue
+        pf.metadata.update(
+            normalized_path=str(norm.path),
+            normalized_media_type=norm.media_type,
+            normalized_bytes=norm.normalized_bytes,
+        )
+        totals["image_original_bytes"] += norm.original_bytes
+        totals["image_normalized_bytes"] += norm.normalized_bytes
+    return totals
+
+
+def _parse_times_by_format(parsed: list[ParsedFile]) -> dict[str, float]:
+    """Total parse seconds per format, slowest first."""
+    totals: dict[str, float] = {}
+    for pf in parsed:
+        secs = pf.metadata.get("parse_seconds")
+        if secs is not None:
+            totals[pf.format] = totals.get(pf.format, 0.0) + secs
+    return {fmt: round(secs, 3)
+            for fmt, secs in sorted(totals.items(), key=lambda kv: kv[1], reverse=True)}
+
+
+def _table_page_counts(parsed: list[ParsedFile]) -> dict[str, int]:
+    """PDF pages parsed this run via the table fast path vs full extraction."""
+    counts = {"table_fast_pages": 0, "table_full_pages": 0}
+    for pf in parsed:
+        if pf.metadata.get("cached"):
+            continue
+        for key in counts:
+            counts[key] += pf.metadata.get(key, 0)
+    return counts
+
+
 def _load_previous_hashes(proj: dict) -> dict[str, str]:
     """Load per-file content hashes from previous manifest (if exists)."""
     manifest_path = get_output_path(proj, "requirements_manifest.json")
@@ -250,7 +511,7 @@ def _detect_changes(parsed: list[ParsedFile], prev_hashes: dict[str, str]) -> di
     for pf in parsed:
         if pf.error or pf.is_image:
             continue
-        current_hash = compute_file_hash(pf.text)
+        current_hash = _content_hash(pf)
         if pf.filename not in prev_hashes:
             changes[pf.filename] = "new"
         elif prev_hashes[pf.filename] != current_hash:
@@ -258,3 +519,48 @@ def _detect_changes(parsed: list[ParsedFile], prev_hashes: dict[str, str]) -> di
         else:
             changes[pf.filename] = "unchanged"
     return changes
+
+
+def _update_page_index(proj: dict, parsed: list[ParsedFile]) -> dict[str, list[int]]:
+    """Compare per-page hashes with the previous ingest and save the new index.
+
+    The index (output/pdf_page_index.json) maps filename → page hashes.
+    Returns {filename: [changed 1-based page numbers]} for files that had a
+    previous index entry; added pages count as changed.
+    """
+    index_path = get_output_path(proj, PAGE_INDEX_FILE)
+    prev = {}
+    if index_path.exists():
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                prev = json.load(f)
+        except json.JSONDecodeError:
+            prev = {}
+
+    index = {}
+    changed = {}
+    for pf in parsed:
+        if pf.error or not pf.page_hashes:
+            continue
+        index[pf.filename] = pf.page_hashes
+        old = prev.get(pf.filename)
+        if old is None:
+            continue
+        pages = [i + 1 for i, h in enumerate(pf.page_hashes) if i >= len(old) or old[i] != h]
+        if pages:
+            changed[pf.filename] = pages
+
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump(index, f)
+    return changed
+
+
+def _page_ranges(pages: list[int]) -> str:
+    """Compact page list: [1, 2, 3, 7] → "1-3, 7"."""
+    ranges = []
+    for p in pages:
+        if ranges and p == ranges[-1][1] + 1:
+            ranges[-1][1] = p
+        else:
+            ranges.append([p, p])
+    return ", ".join(str(a) if a == b else f"{a}-{b}" for a, b in ranges)
@@ -6,12 +6,25 @@ Falls back to breakdown.json if push_ready.json doesn't exist.
 Creates Epics → Features → User Stories (with discipline Tasks) in ADO.
 
 Reliability features:
-- Resume: loads existing ado_mapping.json and skips already-created items
+- Resume: loads the ADO mapping (snapshot + journal) and skips already-created items;
+  each story's tasks, relation links and attachment links are recorded too, so
+  only the missing sub-steps are redone (no ADO queries needed)
+- Sync (--sync): the mapping stores a hash of each story's rendered fields;
+  stories whose push_ready.json content changed get one minimal JSON-Patch
+  each (only the changed fields), sent through $batch. Stories pushed before
+  hashes were recorded only get a baseline on their first sync — nothing is
+  sent, so edits made in ADO since (tags, AC) are not overwritten
 - Dedup: queries ADO for existing Epics/Features before creating new ones
-- Incremental save: writes ado_mapping.json after each story creation
+- Incremental save: appends each created item to the mapping journal (fsync'd)
+- Batching: tasks, relation links and attachment links go through ADO's $batch endpoint
+- Concurrency: independent epics/features/stories are created in parallel, in
+  dependency order (epic → feature → story → tasks), on a bounded worker pool
 """
 
+import hashlib
 import json
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
 
 import click
@@ -19,12 +32,26 @@ import click
 from core.config import get_output_path, update_state
 from core.context import invalidate_downstream
 from core.events import append_event
+from core.mapping import MappingJournal, empty_mapping, load_mapping
 from core import ado as ado_client
+from core.scheduler import DagScheduler, DependencyFailed
+from core.transcripts import PRECOMPACT_SUFFIX, TRANSCRIPTS_DIR
+from core.workitem_cache import work_item_cache
 from core.usage import log_operation
 
+# Concurrent workers for the push graph — all share ado_client's rate limiter
+PUSH_WORKERS = 4
 
-def run(proj: dict, dry_run: bool = False) -> None:
-    """Push stories to Azure DevOps from push_ready.json (or breakdown.json fallback)."""
+STORY_TAGS = "Claude New Story"
+
+
+def run(proj: dict, dry_run: bool = False, workers: int = PUSH_WORKERS,
+        sync: bool = False) -> None:
+    """Push stories to Azure DevOps from push_ready.json (or breakdown.json fallback).
+
+    With sync=True, already-created stories whose rendered content changed
+    since the last push are updated in place.
+    """
     project_name = proj["project"]
     click.secho(f"\n  Pushing to Azure DevOps for '{project_name}'", bold=True)
 
@@ -70,7 +97,7 @@ def run(proj: dict, dry_run: bool = False) -> None:
 
         # Query existing Epics/Features to avoid creating duplicates
         click.echo("  Checking for existing work items...")
-        existing_items = _fetch_existing_items(config)
+        existing_items = _fetch_existing_items(config, proj)
         e_count = len(existing_items["epics"])
         f_count = len(existing_items["features"])
         if e_count or f_count:
@@ -78,6 +105,7 @@ def run(proj: dict, dry_run: bool = False) -> None:
 
     # Load existing mapping for resume support (survives partial failures)
     created = _load_existing_mapping(proj)
+    journal = MappingJournal(proj, created)
     created_story_ids = {s["id"] for s in created.get("stories", [])}
 
     # Count totals and determine what's already done
@@ -106,161 +134,50 @@ def run(proj: dict, dry_run: bool = False) -> None:
     if not dry_run and not click.confirm("  Proceed?", default=True):
         return
 
-    # Main creation loop
-    story_index = 0
-    new_story_count = 0
-
-    for epic in push_data.get("epics", []):
-        epic_name = epic.get("name", "Unknown Epic")
-        epic_id_key = epic.get("id", epic_name)
-        epic_desc = epic.get("description", "")
-
-        feature_names = [f.get("name", "?") for f in epic.get("features", [])]
-        epic_html = (
-            f"<h3>{epic_name}</h3>"
-            f"<p>{epic_desc}</p>"
-            f"<p><b>Features:</b></p><ul>"
-            + "".join(f"<li>{fn}</li>" for fn in feature_names)
-            + "</ul>"
-        )
-
-        click.secho(f"\n  Epic: {epic_name}", fg="cyan", bold=True)
-
-        # Resolve Epic: resume mapping → existing in ADO → create new
-        epic_ado_id = created["epics"].get(epic_id_key)
-        if epic_ado_id:
-            click.echo(f"    ↩ Reusing Epic #{epic_ado_id} (from previous run)")
-        elif dry_run:
-            epic_ado_id = None
-            click.echo(f"    [DRY RUN] Would create Epic: {epic_name}")
-        elif epic_name in existing_items["epics"]:
-            epic_ado_id = existing_items["epics"][epic_name]
-            created["epics"][epic_id_key] = epic_ado_id
-            click.echo(f"    ↩ Reusing existing ADO Epic #{epic_ado_id}")
-        else:
-            result = ado_client.create_work_item(
-                config, "Epic", epic_name,
-                description=epic_html,
-                tags="Claude New Epic",
-            )
-            epic_ado_id = result.get("id")
-            created["epics"][epic_id_key] = epic_ado_id
-            click.echo(f"    ✓ Created Epic #{epic_ado_id}")
-
-        for feature in epic.get("features", []):
-            feat_name = feature.get("name", "Unknown Feature")
-            feat_id_key = feature.get("id", feat_name)
-
-            story_names = [s.get("title", "?") for s in feature.get("stories", [])]
-            feat_html = (
-                f"<h4>{feat_name}</h4>"
-                f"<p><b>Stories:</b></p><ul>"
-                + "".join(f"<li>{sn}</li>" for sn in story_names)
-                + "</ul>"
-            )
-
-            click.echo(f"    Feature: {feat_name}")
-
-            # Resolve Feature: resume mapping → existing in ADO → create new
-            feat_ado_id = created["features"].get(feat_id_key)
-            if feat_ado_id:
-                click.echo(f"      ↩ Reusing Feature #{feat_ado_id} (from previous run)")
-            elif dry_run:
-                feat_ado_id = None
-                click.echo(f"      [DRY RUN] Would create Feature: {feat_name}")
-            elif feat_name in existing_items["features"]:
-                feat_ado_id = existing_items["features"][feat_name]
-                created["features"][feat_id_key] = feat_ado_id
-                click.echo(f"      ↩ Reusing existing ADO Feature #{feat_ado_id}")
-            else:
-                result = ado_client.create_work_item(
-                    config, "Feature", feat_name,
-                    description=feat_html,
-                    tags="Claude New Feature",
-                    parent_id=epic_ado_id,
-                )
-                feat_ado_id = result.get("id")
-                created["features"][feat_id_key] = feat_ado_id
-                click.echo(f"      ✓ Created Feature #{feat_ado_id}")
-
-            for story in feature.get("stories", []):
-                story_index += 1
-                story_title = story.get("title", "Unknown Story")
-                story_id = story.get("id", f"US-{story_index:03d}")
-
-                # Skip if already created (resume support)
-                if story_id in created_story_ids:
-                    click.echo(
-                        f"      [{story_index}/{total_stories}] "
-                        f"{story_title} — already created, skipping"
-                    )
-                    continue
+    # Build the dependency graph: epic → features → stories → feature task batch
+    state = _PushState(
+        proj=proj,
+        config=config,
+        created=created,
+        journal=journal,
+        created_story_ids=created_story_ids,
+        existing_items=existing_items,
+        dry_run=dry_run,
+        total_stories=total_stories,
+        sync=sync,
+    )
+    # Dry runs stay sequential so the preview reads top to bottom
+    sched = _build_push_graph(state, push_data, max_workers=1 if dry_run else workers)
+    if not dry_run:
+        click.echo(f"\n  Pushing with {sched.max_workers} worker(s)...")
 
-                click.echo(f"      [{story_index}/{total_stories}] {story_title}")
+    failures = sched.run()
+    new_story_count = state.new_story_count
 
-                # Read user story and AC from push_ready.json fields;
-                # fallback: breakdown.json has acceptance_criteria as a string
-                user_story_text = story.get("user_story", f"As a user,\nI want to {story_title.lower()},\nSo that I can accomplish this goal.")
-                ac_list = story.get("acceptance_criteria", [])
+    # Sync: one $batch for every story whose rendered fields changed
+    updated_count = 0
+    if sync and state.sync_ops:
+        updated_count = _sync_stories(state)
 
-                # Effort
-                fe = story.get("fe_days", 0)
-                be = story.get("be_days", 0)
-                devops = story.get("devops_days", 0)
-                design = story.get("design_days", 0)
-                total = fe + be + devops + design
+    # Final mapping save (captures Epic/Feature-only changes from reuse),
+    # with stories back in push_ready.json order
+    journal.sort_stories(key=lambda s: state.story_order.get(s["id"], len(state.story_order)))
+    mapping_path = journal.compact()
 
-                ref_sources = story.get("reference_sources", [])
-                description_html = _build_story_description(
-                    user_story_text, epic_name, feat_name, ref_sources
-                )
-                tech_ctx = story.get("technical_context", {})
-                ac_html = _build_ac_html(ac_list, tech_ctx)
-
-                if dry_run:
-                    click.echo(f"        [DRY RUN] Would create User Story: {story_title}")
-                    click.echo(f"        User story: {user_story_text[:100]}...")
-                else:
-                    result = ado_client.create_work_item(
-                        config, "User Story", story_title,
-                        description=description_html,
-                        tags="Claude New Story",
-                        parent_id=feat_ado_id,
-                        extra_fields={
-                            "Microsoft.VSTS.Scheduling.Effort": total,
-                            "Microsoft.VSTS.Common.AcceptanceCriteria": ac_html,
-                        },
-                    )
-                    story_ado_id = result.get("id")
-                    click.secho(f"        ✓ Created Story #{story_ado_id}", fg="green")
-
-                    # Create discipline tasks
-                    _create_tasks(config, project_name, story_ado_id, story_title, story)
-
-                    created["stories"].append({
-                        "ado_id": story_ado_id,
-                        "id": story_id,
-                        "title": story_title,
-                        "epic": epic_name,
-                        "feature": feat_name,
-                    })
-                    created_story_ids.add(story_id)
-                    new_story_count += 1
-
-                    # Save mapping incrementally — progress survives failures
-                    _save_mapping(proj, created)
-
-    # Final mapping save (captures Epic/Feature-only changes from reuse)
-    _save_mapping(proj, created)
-    mapping_path = get_output_path(proj, "ado_mapping.json")
+    if failures:
+        _report_failures(failures)
+        click.echo(f"    Progress is saved in {mapping_path}")
+        click.echo(f"    Re-run to resume: xproject push {project_name}")
+        return
 
     # Create story relation links (predecessors + similar stories)
     if not dry_run:
-        _create_relation_links(config, push_data, created)
+        _create_relation_links(config, push_data, journal)
 
     # Attach reference source files to stories
     if not dry_run:
-        _attach_reference_sources(config, proj, push_data, created)
+        _attach_reference_sources(config, proj, push_data, journal)
+        journal.compact()
 
     # Phase 8: Generate RTM wiki page
     if not dry_run:
@@ -280,55 +197,428 @@ def run(proj: dict, dry_run: bool = False) -> None:
     if not dry_run:
         append_event(proj, "pushed_to_ado",
                      stories=new_story_count, skipped=skip_count,
+                     updated=updated_count,
                      epics=total_epics, features=total_features)
 
     # Log usage
+    stats = ado_client.get_call_stats()
     if not dry_run:
-        stats = ado_client.get_call_stats()
         log_operation(proj, "push",
                       ado_api_calls=stats["count"],
                       duration_seconds=stats["total_seconds"],
                       details={
                           "stories_created": new_story_count,
                           "stories_skipped": skip_count,
+                          "stories_updated": updated_count,
                           "epics": total_epics,
                           "features": total_features,
+                          "connections_opened": stats["connections_opened"],
+                          "connection_reuse_rate": stats["reuse_rate"],
+                          "throttle_events": stats["throttle_events"],
+                          "rate_limit_wait_seconds": stats["rate_limit_wait_seconds"],
                       })
 
     click.secho(f"\n  ✓ Push complete", fg="green", bold=True)
     click.echo(f"    Created: {new_story_count} new stories")
+    if sync:
+        click.echo(f"    Updated: {updated_count} changed stories")
     if skip_count:
         click.echo(f"    Skipped: {skip_count} already-created stories")
+    if not dry_run:
+        click.echo(
+            f"    API calls: {stats['count']} over {stats['connections_opened']} connection(s) "
+            f"({stats['reuse_rate']:.0%} reused)"
+        )
     click.echo(f"    Mapping: {mapping_path}")
     click.echo(f"\n    Next: extract design system from Figma or generate feature code.")
 
 
+# --- Push graph ---
+
+@dataclass
+class _SyncOp:
+    """A queued field update for an already-pushed story."""
+    story_id: str
+    ado_id: int
+    title: str
+    changed: dict   # field path → new value
+    hashes: dict    # field path → hash of every rendered field, journaled on success
+
+
+@dataclass
+class _PushState:
+    """Shared state for push graph nodes.
+
+    `created` is the journal's live mapping: read it under `lock`, change it
+    only through `journal`.
+    """
+    proj: dict
+    config: ado_client.AdoConfig | None
+    created: dict
+    journal: MappingJournal
+    created_story_ids: set
+    existing_items: dict
+    dry_run: bool
+    total_stories: int
+    sync: bool = False
+    story_order: dict = field(default_factory=dict)   # local story ID → position
+    sync_ops: list[_SyncOp] = field(default_factory=list)
+    new_story_count: int = 0
+    done_count: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+def _build_push_graph(state: _PushState, push_data: dict,
+                      max_workers: int = PUSH_WORKERS) -> DagScheduler:
+    """Turn push_data into a DagScheduler of create steps.
+
+    Nodes: epic → feature → story → feature task batch. Node keys carry the
+    item's position so duplicate names in push_data stay distinct.
+    Already-created items (resume mapping) resolve instantly without API calls.
+    """
+    sched = DagScheduler(max_workers=max_workers)
+    story_index = 0
+
+    for ei, epic in enumerate(push_data.get("epics", []), 1):
+        epic_key = epic.get("id", epic.get("name", "Unknown Epic"))
+        epic_node = f"epic[{ei}] {epic_key}"
+        sched.add(epic_node, lambda e=epic: _resolve_epic(state, e))
+
+        for fi, feature in enumerate(epic.get("features", []), 1):
+            feat_key = feature.get("id", feature.get("name", "Unknown Feature"))
+            feat_node = f"feature[{ei}.{fi}] {feat_key}"
+            sched.add(feat_node, lambda e=epic, f=feature: _resolve_feature(state, e, f),
+                      deps=[epic_node])
+
+            feature_tasks = []
+            story_nodes = []
+            for story in feature.get("stories", []):
+                story_index += 1
+                story.setdefault("id", f"US-{story_index:03d}")
+                state.story_order[story["id"]] = story_index
+                story_node = f"story[{story_index}] {story['id']}"
+                sched.add(
+                    story_node,
+                    lambda e=epic, f=feature, st=story, i=story_index, q=feature_tasks:
+                        _push_story(state, e, f, st, i, q),
+                    deps=[feat_node],
+                )
+                story_nodes.append(story_node)
+
+            if story_nodes and not state.dry_run:
+                # always=True: a failed story must not drop its siblings' tasks
+                sched.add(f"tasks[{ei}.{fi}] {feat_key}",
+                          lambda q=feature_tasks: _create_tasks(state, q) if q else 0,
+                          deps=story_nodes, always=True)
+
+    return sched
+
+
+def _resolve_epic(state: _PushState, epic: dict) -> int | None:
+    """Resolve an Epic: resume mapping → existing in ADO → create new."""
+    epic_name = epic.get("name", "Unknown Epic")
+    epic_id_key = epic.get("id", epic_name)
+
+    with state.lock:
+        epic_ado_id = state.created["epics"].get(epic_id_key)
+    if epic_ado_id:
+        click.echo(f"    ↩ Epic '{epic_name}': reusing #{epic_ado_id} (from previous run)")
+        return epic_ado_id
+    if state.dry_run:
+        click.secho(f"\n  Epic: {epic_name}", fg="cyan", bold=True)
+        click.echo(f"    [DRY RUN] Would create Epic: {epic_name}")
+        return None
+
+    if epic_name in state.existing_items["epics"]:
+        epic_ado_id = state.existing_items["epics"][epic_name]
+        click.echo(f"    ↩ Epic '{epic_name}': reusing existing ADO Epic #{epic_ado_id}")
+    else:
+        feature_names = [f.get("name", "?") for f in epic.get("features", [])]
+        epic_html = (
+            f"<h3>{epic_name}</h3>"
+            f"<p>{epic.get('description', '')}</p>"
+            f"<p><b>Features:</b></p><ul>"
+            + "".join(f"<li>{fn}</li>" for fn in feature_names)
+            + "</ul>"
+        )
+        result = ado_client.create_work_item(
+            state.config, "Epic", epic_name,
+            description=epic_html,
+            tags="Claude New Epic",
+        )
+        epic_ado_id = result.get("id")
+        click.secho(f"    ✓ Created Epic #{epic_ado_id}: {epic_name}", fg="cyan")
+
+    state.journal.record_epic(epic_id_key, epic_ado_id)
+    return epic_ado_id
+
+
+def _resolve_feature(state: _PushState, epic: dict, feature: dict) -> int | None:
+    """Resolve a Feature: resume mapping → existing in ADO → create new."""
+    feat_name = feature.get("name", "Unknown Feature")
+    feat_id_key = feature.get("id", feat_name)
+    epic_id_key = epic.get("id", epic.get("name", "Unknown Epic"))
+
+    with state.lock:
+        feat_ado_id = state.created["features"].get(feat_id_key)
+        epic_ado_id = state.created["epics"].get(epic_id_key)
+    if feat_ado_id:
+        click.echo(f"      ↩ Feature '{feat_name}': reusing #{feat_ado_id} (from previous run)")
+        return feat_ado_id
+    if state.dry_run:
+        click.echo(f"    Feature: {feat_name}")
+        click.echo(f"      [DRY RUN] Would create Feature: {feat_name}")
+        return None
+
+    if feat_name in state.existing_items["features"]:
+        feat_ado_id = state.existing_items["features"][feat_name]
+        click.echo(f"      ↩ Feature '{feat_name}': reusing existing ADO Feature #{feat_ado_id}")
+    else:
+        story_names = [s.get("title", "?") for s in feature.get("stories", [])]
+        feat_html = (
+            f"<h4>{feat_name}</h4>"
+            f"<p><b>Stories:</b></p><ul>"
+            + "".join(f"<li>{sn}</li>" for sn in story_names)
+            + "</ul>"
+        )
+        result = ado_client.create_work_item(
+            state.config, "Feature", feat_name,
+            description=feat_html,
+            tags="Claude New Feature",
+            parent_id=epic_ado_id,
+        )
+        feat_ado_id = result.get("id")
+        click.echo(f"      ✓ Created Feature #{feat_ado_id}: {feat_name}")
+
+    state.journal.record_feature(feat_id_key, feat_ado_id)
+    return feat_ado_id
+
+
+def _push_story(state: _PushState, epic: dict, feature: dict, story: dict,
+                story_index: int, feature_tasks: list) -> int | None:
+    """Create one User Story and queue its tasks for the feature's batch.
+
+    Already-created stories re-queue missing tasks and, in sync mode, queue
+    a field update if their rendered content changed.
+    """
+    epic_name = epic.get("name", "Unknown Epic")
+    feat_name = feature.get("name", "Unknown Feature")
+    feat_id_key = feature.get("id", feat_name)
+    story_title = story.get("title", "Unknown Story")
+    story_id = story["id"]
+    progress = f"[{story_index}/{state.total_stories}]"
+
+    with state.lock:
+        already_created = story_id in state.created_story_ids
+        feat_ado_id = state.created["features"].get(feat_id_key)
+
+    fields = _render_story_fields(epic_name, feat_name, story)
+    hashes = _field_hashes(fields)
+
+    if already_created:
+        _resume_story(state, story, story_id, progress, fields, hashes, feature_tasks)
+        return None
+
+    if state.dry_run:
+        user_story_text = story.get("user_story", "")
+        click.echo(f"      {progress} {story_title}")
+        click.echo(f"        [DRY RUN] Would create User Story: {story_title}")
+        click.echo(f"        User story: {user_story_text[:100]}...")
+        return None
+
+    result = ado_client.create_work_item(
+        state.config, "User Story", story_title,
+        description=fields["System.Description"],
+        tags=fields["System.Tags"],
+        parent_id=feat_ado_id,
+        extra_fields={
+            "Microsoft.VSTS.Scheduling.Effort": fields["Microsoft.VSTS.Scheduling.Effort"],
+            "Microsoft.VSTS.Common.AcceptanceCriteria":
+                fields["Microsoft.VSTS.Common.AcceptanceCriteria"],
+        },
+    )
+    story_ado_id = result.get("id")
+
+    # Queue discipline tasks — created in one batch per feature
+    task_ops = _task_operations(state.config, story_ado_id, story_title, story, story_id)
+
+    with state.lock:
+        feature_tasks.extend(task_ops)
+        # Journal the story right away — progress survives failures. The empty
+        # sub-step records mark it as tracked, so a resume knows nothing is done yet
+        state.journal.record_story({
+            "ado_id": story_ado_id,
+            "id": story_id,
+            "title": story_title,
+            "epic": epic_name,
+            "feature": feat_name,
+            "tasks": {},
+            "links": [],
+            "attachments": [],
+            "hashes": hashes,
+        })
+        state.created_story_ids.add(story_id)
+        state.new_story_count += 1
+        state.done_count += 1
+        done = state.done_count
+
+    click.secho(f"      {progress} ✓ Created Story #{story_ado_id}: {story_title} "
+                f"({done} new this run)", fg="green")
+    return story_ado_id
+
+
+def _resume_story(state: _PushState, story: dict, story_id: str, progress: str,
+                  fields: dict, hashes: dict, feature_tasks: list) -> None:
+    """Handle an already-created story: re-queue missing tasks, diff for sync."""
+    story_title = story.get("title", "Unknown Story")
+    entry = state.journal.story(story_id) or {}
+    notes = []
+
+    # Re-queue tasks that were never recorded (crash or batch failure after
+    # the story was created). Entries without "tasks" predate task tracking.
+    if not state.dry_run and "tasks" in entry:
+        task_ops = _task_operations(state.config, entry["ado_id"], story_title, story,
+                                    story_id, done=entry["tasks"])
+        if task_ops:
+            with state.lock:
+                feature_tasks.extend(task_ops)
+            notes.append(f"re-queueing {len(task_ops)} missing task(s)")
+
+    if state.sync and "hashes" not in entry:
+        # Pushed before sync existed: ADO may have been edited since, so the
+        # current content becomes the baseline instead of being sent
+        if not state.dry_run:
+            state.journal.record_hashes(story_id, hashes)
+        notes.append(f"{'would record' if state.dry_run else 'recorded'} sync baseline")
+    elif state.sync:
+        old = entry["hashes"]
+        changed = {path: value for path, value in fields.items()
+                   if old.get(path) != hashes[path]}
+        if changed:
+            with state.lock:
+                state.sync_ops.append(_SyncOp(story_id, entry.get("ado_id"), story_title,
+                                              changed, hashes))
+            names = ", ".join(path.rsplit(".", 1)[-1] for path in changed)
+            notes.append(f"{'would update' if state.dry_run else 'queued update'}: {names}")
+
+    if notes:
+        click.echo(f"      {progress} {story_title} — already created, {'; '.join(notes)}")
+    else:
+        click.echo(f"      {progress} {story_title} — already created, skipping")
+
+
+def _sync_stories(state: _PushState) -> int:
+    """Send the queued sync updates in one $batch and journal the new hashes.
+
+    Returns the number of stories updated.
+    """
+    if state.dry_run:
+        return 0
+
+    click.echo(f"\n  Syncing {len(state.sync_ops)} changed stories...")
+    ops = [
+        ado_client.update_operation(state.config, op.ado_id, [
+            {"op": "add", "path": f"/fields/{path}", "value": value}
+            for path, value in op.changed.items()
+        ])
+        for op in state.sync_ops
+    ]
+    updated = 0
+    for res in ado_client.batch_work_items(state.config, ops):
+        op = state.sync_ops[res.index]
+        if res.ok:
+            updated += 1
+            state.journal.record_hashes(op.story_id, op.hashes)
+            if "System.Title" in op.changed:
+                state.journal.record_story({"id": op.story_id, "title": op.title})
+            click.secho(f"    ✓ Updated Story #{op.ado_id}: {op.title} "
+                        f"({len(op.changed)} field(s))", fg="green")
+        else:
+            click.secho(f"    ⚠ Failed to update story #{op.ado_id} {op.title}: {res.error}",
+                        fg="yellow")
+    return updated
+
+
+def _render_story_fields(epic_name: str, feat_name: str, story: dict) -> dict:
+    """Render a story's ADO field values (field path → value) from push_ready.json."""
+    story_title = story.get("title", "Unknown Story")
+
+    # Read user story and AC from push_ready.json fields;
+    # fallback: breakdown.json has acceptance_criteria as a string
+    user_story_text = story.get("user_story", f"As a user,\nI want to {story_title.lower()},\nSo that I can accomplish this goal.")
+    ac_list = story.get("acceptance_criteria", [])
+
+    # Effort
+    fe = story.get("fe_days", 0)
+    be = story.get("be_days", 0)
+    devops = story.get("devops_days", 0)
+    design = story.get("design_days", 0)
+    total = fe + be + devops + design
+
+    ref_sources = story.get("reference_sources", [])
+    description_html = _build_story_description(
+        user_story_text, epic_name, feat_name, ref_sources
+    )
+    tech_ctx = story.get("technical_context", {})
+    ac_html = _build_ac_html(ac_list, tech_ctx)
+
+    return {
+        "System.Title": story_title,
+        "System.Description": description_html,
+        "Microsoft.VSTS.Common.AcceptanceCriteria": ac_html,
+        "Microsoft.VSTS.Scheduling.Effort": total,
+        "System.Tags": STORY_TAGS,
+    }
+
+
+def _field_hashes(fields: dict) -> dict:
+    """Hash each rendered field value so sync can tell which ones changed."""
+    return {
+        path: hashlib.sha256(json.dumps(value, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+        for path, value in fields.items()
+    }
+
+
+def _report_failures(failures: dict[str, Exception]) -> None:
+    """Print push graph nodes that failed or were skipped because of a failure."""
+    failed = {k: e for k, e in failures.items() if not isinstance(e, DependencyFailed)}
+    skipped = len(failures) - len(failed)
+    click.secho(f"\n  ✗ Push incomplete: {len(failed)} step(s) failed"
+                + (f", {skipped} dependent step(s) skipped" if skipped else ""), fg="red")
+    for key, exc in failed.items():
+        click.echo(f"    {key}: {str(exc).splitlines()[0] if str(exc) else type(exc).__name__}")
+
+
 # --- Resume and dedup helpers ---
 
-def _fetch_existing_items(config) -> dict:
+def _fetch_existing_items(config, proj: dict) -> dict:
     """Fetch existing Epics and Features from ADO for duplicate detection.
 
-    Only queries the current project to avoid cross-project matches.
+    Served from the project's work item cache after a delta refresh (only
+    items changed since the last run are downloaded). Only items of the
+    current project count, to avoid cross-project matches.
     Returns {"epics": {title: ado_id}, "features": {title: ado_id}}.
     """
-    project = config.project
-    wiql = (
-        "SELECT [System.Id], [System.Title], [System.WorkItemType] "
-        "FROM WorkItems WHERE [System.WorkItemType] IN ('Epic', 'Feature') "
-        "AND [System.State] <> 'Removed' "
-        f"AND [System.TeamProject] = '{project}' "
-        "ORDER BY [System.Id] ASC"
-    )
+    cache = work_item_cache(proj)
     try:
-        items = ado_client.get_work_items_by_query(config, wiql)
+        # max_age=0: always delta-refresh — a stale cache could miss an Epic
+        # created since the last run and make push create a duplicate
+        items = cache.get_items(config, ["Epic", "Feature"], max_age=0)
     except Exception as e:
         click.secho(f"    ⚠ Could not query existing items: {e}", fg="yellow")
         return {"epics": {}, "features": {}}
+    refreshed = cache.last_refresh
+    if refreshed:
+        click.echo(f"    Work item cache: {refreshed['fetched']} changed, "
+                   f"{refreshed['removed']} removed since last sync")
 
     epics = {}
     features = {}
     for item in items:
         fields = item.get("fields", {})
+        if (fields.get("System.State") == "Removed"
+                or fields.get("System.TeamProject", config.project) != config.project):
+            continue
         wit = fields.get("System.WorkItemType", "")
         title = fields.get("System.Title", "")
         ado_id = item.get("id")
@@ -341,38 +631,28 @@ def _fetch_existing_items(config) -> dict:
 
 
 def _load_existing_mapping(proj: dict) -> dict:
-    """Load existing ado_mapping.json for resume support.
+    """Load the existing ADO mapping (snapshot + journal) for resume support.
 
-    If the file exists and is valid, returns its contents so the push
-    can skip already-created items. Otherwise returns an empty mapping.
+    If a valid mapping exists, returns it so the push can skip
+    already-created items. Otherwise returns an empty mapping.
     """
-    mapping_path = get_output_path(proj, "ado_mapping.json")
-    if mapping_path.exists():
-        try:
-            with open(mapping_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            # Validate structure
-            if (isinstance(data.get("epics"), dict)
-                    and isinstance(data.get("features"), dict)
-                    and isinstance(data.get("stories"), list)):
-                return data
-        except (json.JSONDecodeError, KeyError):
-            pass
-    return {"epics": {}, "features": {}, "stories": []}
-
-
-def _save_mapping(proj: dict, created: dict) -> None:
-    """Save ado_mapping.json incrementally after each story creation."""
-    mapping_path = get_output_path(proj, "ado_mapping.json")
-    with open(mapping_path, "w", encoding="utf-8") as f:
-        json.dump(created, f, indent=2)
+    try:
+        return load_mapping(proj) or empty_mapping()
+    except ValueError:
+        return empty_mapping()
 
 
 # --- Task and relation helpers ---
 
-def _create_tasks(config, project_name: str, parent_id: int,
-                   story_title: str, story: dict) -> None:
-    """Create FE / BE / DevOps / QA tasks as children of the user story."""
+def _task_operations(config, parent_id: int, story_title: str, story: dict,
+                     story_id: str, done: dict | None = None) -> list[tuple]:
+    """Build $batch create operations for a story's FE / BE / DevOps / QA tasks.
+
+    Returns (story_id, task_key, title, operation) tuples; tasks whose key is
+    already in `done` (recorded in the mapping) are left out.
+    """
+    done = done or {}
+    specs = []
     disciplines = [
         ("fe_days", "FE"),
         ("be_days", "BE"),
@@ -381,60 +661,67 @@ def _create_tasks(config, project_name: str, parent_id: int,
     for field, prefix in disciplines:
         days = story.get(field, 0)
         if days and days > 0:
-            task_title = f"[{prefix}] {story_title}"
-            try:
-                ado_client.create_work_item(
-                    config, "Task", task_title,
-                    parent_id=parent_id,
-                    tags="Claude New Story",
-                    extra_fields={
-                        "Microsoft.VSTS.Scheduling.Effort": days,
-                    },
-                )
-            except Exception as e:
-                click.secho(f"          ⚠ Failed to create {prefix} task: {e}", fg="yellow")
+            specs.append((prefix, f"[{prefix}] {story_title}", {
+                "tags": STORY_TAGS,
+                "extra_fields": {"Microsoft.VSTS.Scheduling.Effort": days},
+            }))
 
     # QA tasks — only for testable stories (skip_qa flag set by Claude
     # during story generation for purely technical stories with no end-user impact)
     if not story.get("skip_qa", False):
         # [QA][TD] — Test Design with manual test cases in description
-        td_title = f"[QA][TD] {story_title}"
-        td_description = story.get("qa_td_description", "")
-        try:
-            ado_client.create_work_item(
-                config, "Task", td_title,
-                parent_id=parent_id,
-                description=td_description,
-                tags="Claude New Story",
-            )
-        except Exception as e:
-            click.secho(f"          ⚠ Failed to create [QA][TD] task: {e}", fg="yellow")
+        specs.append(("QA-TD", f"[QA][TD] {story_title}", {
+            "description": story.get("qa_td_description", ""),
+            "tags": STORY_TAGS,
+        }))
 
         # [QA][TE] — Test Execution time-tracking placeholder (no description)
-        te_title = f"[QA][TE] {story_title}"
-        try:
-            ado_client.create_work_item(
-                config, "Task", te_title,
-                parent_id=parent_id,
-                tags="Claude New Story",
-            )
-        except Exception as e:
-            click.secho(f"          ⚠ Failed to create [QA][TE] task: {e}", fg="yellow")
+        specs.append(("QA-TE", f"[QA][TE] {story_title}", {
+            "tags": STORY_TAGS,
+        }))
+
+    return [
+        (story_id, key, title,
+         ado_client.create_operation(config, "Task", title, parent_id=parent_id, **kwargs))
+        for key, title, kwargs in specs
+        if key not in done
+    ]
 
 
-def _create_relation_links(config, push_data: dict, created: dict) -> None:
+def _create_tasks(state: _PushState, task_ops: list[tuple]) -> int:
+    """Create queued tasks through the $batch endpoint and journal each one.
+
+    Returns the number created.
+    """
+    results = ado_client.batch_work_items(state.config, [op for *_, op in task_ops])
+    created_count = 0
+    for res in results:
+        story_id, key, title, _ = task_ops[res.index]
+        if res.ok:
+            created_count += 1
+            state.journal.record_task(story_id, key, res.id)
+        else:
+            click.secho(f"          ⚠ Failed to create task {title}: {res.error}", fg="yellow")
+    click.echo(f"      ✓ Created {created_count}/{len(task_ops)} tasks")
+    return created_count
+
+
+def _create_relation_links(config, push_data: dict, journal: MappingJournal) -> None:
     """Create predecessor and similar-story links between ADO work items.
 
     Reads 'predecessors' and 'similar_stories' arrays from each story in
-    push_data, maps local IDs (e.g. US-001) to ADO IDs using the created
-    mapping, and creates the appropriate ADO links.
+    push_data, maps local IDs (e.g. US-001) to ADO IDs using the mapping,
+    and creates the ADO links that the mapping doesn't already record.
+    Links a story already has in ADO (e.g. added before an interrupted push
+    recorded them) are recorded without being sent again. Each link is its
+    own $batch operation, so a failing link doesn't block the others.
     """
     # Build local ID → ADO ID mapping
     id_to_ado = {}
-    for story_info in created.get("stories", []):
+    for story_info in journal.mapping.get("stories", []):
         id_to_ado[story_info["id"]] = story_info["ado_id"]
 
-    link_count = 0
+    pending = []  # (story_local_id, story_ado_id, link_type, target_ado_id, comment)
 
     for epic in push_data.get("epics", []):
         for feature in epic.get("features", []):
@@ -443,50 +730,68 @@ def _create_relation_links(config, push_data: dict, created: dict) -> None:
                 story_ado_id = id_to_ado.get(story_local_id)
                 if not story_ado_id:
                     continue
+                entry = journal.story(story_local_id) or {}
+                recorded = {(l["type"], l["target"]) for l in entry.get("links", [])}
 
+                wanted = []
                 # Predecessor links
                 for pred_id in story.get("predecessors", []):
                     pred_ado_id = id_to_ado.get(pred_id)
                     if pred_ado_id:
-                        try:
-                            ado_client.add_link(
-                                config, story_ado_id, pred_ado_id,
-                                "System.LinkTypes.Dependency-Reverse",
-                                comment="Predecessor: feature builds on this story's output",
-                            )
-                            link_count += 1
-                        except Exception as e:
-                            click.secho(
-                                f"    ⚠ Failed to link {story_local_id} → predecessor {pred_id}: {e}",
-                                fg="yellow",
-                            )
+                        wanted.append(("System.LinkTypes.Dependency-Reverse", pred_ado_id,
+                                       "Predecessor: feature builds on this story's output"))
 
                 # Similar story links
                 for sim_id in story.get("similar_stories", []):
                     sim_ado_id = id_to_ado.get(sim_id)
                     if sim_ado_id:
-                        try:
-                            ado_client.add_link(
-                                config, story_ado_id, sim_ado_id,
-                                "System.LinkTypes.Related",
-                                comment="Similar: same pattern/approach as this story",
-                            )
-                            link_count += 1
-                        except Exception as e:
-                            click.secho(
-                                f"    ⚠ Failed to link {story_local_id} → similar {sim_id}: {e}",
-                                fg="yellow",
-                            )
+                        wanted.append(("System.LinkTypes.Related", sim_ado_id,
+                                       "Similar: same pattern/approach as this story"))
+
+                for link_type, target, comment in wanted:
+                    if (link_type, target) not in recorded:
+                        pending.append((story_local_id, story_ado_id, link_type, target, comment))
+
+    if not pending:
+        return
+
+    existing = _existing_relations(config, {p[1] for p in pending})
+    ops = []
+    op_info = []  # pending entry per operation
+    for story_local_id, story_ado_id, link_type, target, comment in pending:
+        if (link_type, str(target)) in existing.get(story_ado_id, set()):
+            journal.record_link(story_local_id, link_type, target)
+            continue
+        ops.append(ado_client.update_operation(config, story_ado_id, [
+            ado_client.link_patch(config, target, link_type, comment=comment),
+        ]))
+        op_info.append((story_local_id, story_ado_id, link_type, target, comment))
+
+    link_count = 0
+    for res in ado_client.batch_work_items(config, ops):
+        story_local_id, _, link_type, target, _ = op_info[res.index]
+        if res.ok:
+            link_count += 1
+            journal.record_link(story_local_id, link_type, target)
+        else:
+            click.secho(
+                f"    ⚠ Failed to link {story_local_id} → #{target} ({link_type}): {res.error}",
+                fg="yellow",
+            )
 
     if link_count > 0:
         click.secho(f"    ✓ Created {link_count} story relation links", fg="green")
 
 
-def _attach_reference_sources(config, proj: dict, push_data: dict, created: dict) -> None:
+def _attach_reference_sources(config, proj: dict, push_data: dict,
+                              journal: MappingJournal) -> None:
     """Upload reference source files and attach them to the stories that use them.
 
     Each unique file is uploaded once; the attachment URL is then linked to every
-    story whose reference_sources list mentions that file name.
+    story whose reference_sources list mentions that file name. Files already
+    attached (per the mapping) are skipped, and their recorded URLs are reused
+    instead of uploading the blob again. Each story/file link is its own
+    $batch operation, and links the story already has in ADO aren't re-added.
     """
     project_name = proj["project"]
     input_dir = Path(f"projects/{project_name}/input")
@@ -494,22 +799,29 @@ def _attach_reference_sources(config, proj: dict, push_data: dict, created: dict
     if not input_dir.exists():
         return
 
-    # Build local ID → ADO ID mapping
+    # Build local ID → ADO ID mapping, and recorded attachment URLs per file
     id_to_ado = {}
-    for story_info in created.get("stories", []):
+    known_urls: dict[str, str] = {}
+    for story_info in journal.mapping.get("stories", []):
         id_to_ado[story_info["id"]] = story_info["ado_id"]
+        for att in story_info.get("attachments", []):
+            known_urls.setdefault(att["file"], att["url"])
 
-    # Collect all unique source file names and which stories reference them
-    # filename → list of ADO story IDs
-    file_to_stories: dict[str, list[int]] = {}
+    # Collect all unique source file names and which stories still need them
+    # filename → list of (local story ID, ADO story ID)
+    file_to_stories: dict[str, list[tuple[str, int]]] = {}
     for epic in push_data.get("epics", []):
         for feature in epic.get("features", []):
             for story in feature.get("stories", []):
-                story_ado_id = id_to_ado.get(story.get("id", ""))
+                story_local_id = story.get("id", "")
+                story_ado_id = id_to_ado.get(story_local_id)
                 if not story_ado_id:
                     continue
+                entry = journal.story(story_local_id) or {}
+                attached = {a["file"] for a in entry.get("attachments", [])}
                 for src in story.get("reference_sources", []):
-                    file_to_stories.setdefault(src, []).append(story_ado_id)
+                    if src not in attached:
+                        file_to_stories.setdefault(src, []).append((story_local_id, story_ado_id))
 
     if not file_to_stories:
         return
@@ -517,51 +829,91 @@ def _attach_reference_sources(config, proj: dict, push_data: dict, created: dict
     click.echo("\n  Attaching reference source files...")
 
     # Build a lookup of available input files (case-insensitive matching)
+    # (pre-compacted transcript copies are derived by ingest, not sources)
     available_files: dict[str, Path] = {}
     for f in input_dir.iterdir():
-        if f.is_file():
+        if f.is_file() and not f.name.endswith(PRECOMPACT_SUFFIX):
             available_files[f.name.lower()] = f
     # Also check raw-transcripts subfolder
-    raw_dir = input_dir / "raw-transcripts"
+    raw_dir = input_dir / TRANSCRIPTS_DIR
     if raw_dir.exists():
         for f in raw_dir.iterdir():
-            if f.is_file():
+            if f.is_file() and not f.name.endswith(PRECOMPACT_SUFFIX):
                 available_files[f.name.lower()] = f
 
-    attach_count = 0
-    for filename, story_ids in file_to_stories.items():
-        file_path = available_files.get(filename.lower())
-        if not file_path:
-            click.secho(f"    ⚠ Source file not found in input/: {filename}", fg="yellow")
-            continue
+    # Upload each file blob once, then link it to each story that needs it
+    pending = []  # (story_local_id, story_ado_id, filename, attachment_url)
+    for filename, stories in file_to_stories.items():
+        attachment_url = known_urls.get(filename)
+        if not attachment_url:
+            file_path = available_files.get(filename.lower())
+            if not file_path:
+                click.secho(f"    ⚠ Source file not found in input/: {filename}", fg="yellow")
+                continue
 
-        # Upload the file blob once
-        try:
-            attachment_url = ado_client.upload_file_blob(config, str(file_path), filename)
-        except Exception as e:
-            click.secho(f"    ⚠ Failed to upload {filename}: {e}", fg="yellow")
-            continue
-
-        click.echo(f"    ↑ Uploaded: {filename}")
-
-        # Link to each story that references it
-        for story_ado_id in story_ids:
             try:
-                ado_client.link_attachment(
-                    config, story_ado_id, attachment_url,
-                    comment=f"Reference source: {filename}",
-                )
-                attach_count += 1
+                attachment_url = ado_client.upload_file_blob(config, str(file_path), filename)
             except Exception as e:
-                click.secho(
-                    f"    ⚠ Failed to attach {filename} to story #{story_ado_id}: {e}",
-                    fg="yellow",
-                )
+                click.secho(f"    ⚠ Failed to upload {filename}: {e}", fg="yellow")
+                continue
+
+            click.echo(f"    ↑ Uploaded: {filename}")
+
+        for story_local_id, story_ado_id in stories:
+            pending.append((story_local_id, story_ado_id, filename, attachment_url))
+
+    existing = _existing_relations(config, {p[1] for p in pending}) if pending else {}
+    ops = []
+    op_info = []  # pending entry per operation
+    for story_local_id, story_ado_id, filename, url in pending:
+        if ("AttachedFile", _relation_key(url)) in existing.get(story_ado_id, set()):
+            journal.record_attachment(story_local_id, filename, url)
+            continue
+        ops.append(ado_client.update_operation(config, story_ado_id, [
+            ado_client.attachment_patch(url, comment=f"Reference source: {filename}"),
+        ]))
+        op_info.append((story_local_id, story_ado_id, filename, url))
+
+    attach_count = 0
+    for res in ado_client.batch_work_items(config, ops):
+        story_local_id, story_ado_id, filename, url = op_info[res.index]
+        if res.ok:
+            attach_count += 1
+            journal.record_attachment(story_local_id, filename, url)
+        else:
+            click.secho(
+                f"    ⚠ Failed to attach {filename} to story #{story_ado_id}: {res.error}",
+                fg="yellow",
+            )
 
     if attach_count > 0:
         click.secho(f"    ✓ Attached {attach_count} source file links", fg="green")
 
 
+def _existing_relations(config, ado_ids: set[int]) -> dict[int, set[tuple[str, str]]]:
+    """Relations the work items already have in ADO: id → {(rel, target key)}.
+
+    The target key is the last segment of the relation URL — the target
+    work item ID for links, the attachment GUID for files. Returns {} if
+    the lookup fails (nothing is then treated as already present).
+    """
+    try:
+        items = ado_client.get_work_items_by_ids(config, sorted(ado_ids))
+    except Exception as e:
+        click.secho(f"    ⚠ Could not read existing relations: {e}", fg="yellow")
+        return {}
+    return {
+        item["id"]: {(rel.get("rel", ""), _relation_key(rel.get("url", "")))
+                     for rel in item.get("relations") or []}
+        for item in items
+    }
+
+
+def _relation_key(url: str) -> str:
+    """Last path segment of a relation URL, lowercased, without query string."""
+    return url.split("?", 1)[0].rstrip("/").rsplit("/", 1)[-1].lower()
+
+
 # --- HTML builders ---
 
 def _build_story_description(user_story: str, epic: str, feature: str,
@@ -13,6 +13,8 @@ import click
 
 from core.config import get_output_path, get_input_dir, get_answers_dir, get_changes_dir
 from core import ado as ado_client
+from core.mapping import load_mapping
+from core.transcripts import PRECOMPACT_SUFFIX
 from core.usage import log_operation
 
 
@@ -128,17 +130,15 @@ def _load_push_data(proj: dict) -> dict | None:
 
 
 def _load_ado_mapping(proj: dict) -> dict | None:
-    """Load ado_mapping.json for local ID → ADO ID resolution."""
-    path = get_output_path(proj, "ado_mapping.json")
-    if not path.exists():
-        click.secho("  ✗ ado_mapping.json not found. Push stories first.", fg="red")
-        return None
+    """Load the ADO mapping (snapshot + journal) for local ID → ADO ID resolution."""
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, KeyError):
+        mapping = load_mapping(proj)
+    except ValueError:
         click.secho("  ✗ Invalid ado_mapping.json", fg="red")
         return None
+    if mapping is None:
+        click.secho("  ✗ ado_mapping.json not found. Push stories first.", fg="red")
+    return mapping
 
 
 # --- Source file scanning ---
@@ -149,7 +149,7 @@ SKIP_FILES = {".ds_store", "thumbs.db", ".gitkeep"}
 def _scan_source_files(proj: dict) -> dict[str, dict]:
     """Walk input/, answers/, changes/ and return {filename: {category, path}}.
 
-    Skips hidden files and OS junk.
+    Skips hidden files, OS junk and pre-compacted transcript copies.
     """
     dirs = [
         (get_input_dir(proj), "Input"),
@@ -165,6 +165,8 @@ def _scan_source_files(proj: dict) -> dict[str, dict]:
                 continue
             if fpath.name.startswith(".") or fpath.name.lower() in SKIP_FILES:
                 continue
+            if fpath.name.endswith(PRECOMPACT_SUFFIX):
+                continue  # derived by ingest, not a source
             result[fpath.name] = {"category": category, "path": str(fpath)}
     return result
 
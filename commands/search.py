@@ -0,0 +1,36 @@
+"""Search command: BM25 search over output/parsed/ → ranked chunks.
+
+Brings the search index up to date first (cheap when ingest already did),
+then prints the best-matching chunks with their parsed file and character
+offset, so only the relevant parts of large documents need to be read.
+"""
+
+import time
+import click
+
+from core.search import search_index
+
+
+def run(proj: dict, query: str, limit: int = 10) -> None:
+    """Print the top `limit` parsed chunks for a query."""
+    index = search_index(proj)
+    if not index.parsed_dir.exists():
+        click.secho("  ✗ No parsed files yet.", fg="red")
+        click.echo(f"    Run: xproject ingest {proj['project']}")
+        return
+
+    index.update()
+    started = time.perf_counter()
+    hits = index.search(query, limit=limit)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    if not hits:
+        click.secho(f"\n  No matches for \"{query}\" ({elapsed_ms:.1f} ms)", fg="yellow")
+        return
+
+    click.secho(f"\n  {len(hits)} result(s) for \"{query}\" ({elapsed_ms:.1f} ms)", bold=True)
+    for rank, hit in enumerate(hits, 1):
+        click.echo(f"\n  {rank:>2}. {hit.file} @ {hit.offset}  "
+                   f"({hit.length} chars, score {hit.score:.2f})")
+        snippet = " ".join(hit.text.split())
+        click.echo(f"      {snippet[:200]}{'…' if len(snippet) > 200 else ''}")
@@ -2,16 +2,17 @@
 
 Reads YAML files from output/specs/fe/ and output/specs/be/.
 Reads ado_mapping.json to find story ADO IDs.
-Looks up [FE] and [BE] child tasks of each story.
+Looks up [FE] and [BE] child tasks of each story (from the mapping when push
+recorded them, otherwise by querying the story's children).
 Uploads each spec as an attachment to the matching task.
 """
 
-import json
 import click
 from pathlib import Path
 
-from core.config import get_output_path, get_specs_dir
+from core.config import get_specs_dir
 from core import ado as ado_client
+from core.mapping import load_mapping
 from core.usage import log_operation
 
 
@@ -57,6 +58,9 @@ def run(proj: dict) -> None:
 
     # Build a lookup of story title/id → ADO story ID
     story_lookup = {}
+    # Cache for child tasks: story_ado_id → {prefix → task_ado_id},
+    # seeded with the task IDs push recorded in the mapping
+    task_cache = {}
     for story in mapping.get("stories", []):
         ado_id = story.get("ado_id")
         title = story.get("title", "")
@@ -64,9 +68,8 @@ def run(proj: dict) -> None:
         if ado_id:
             story_lookup[title.lower()] = ado_id
             story_lookup[sid.lower()] = ado_id
-
-    # Cache for child tasks: story_ado_id → {prefix → task_ado_id}
-    task_cache = {}
+            if story.get("tasks"):
+                task_cache[ado_id] = story["tasks"]
 
     uploaded = 0
     errors = 0
@@ -180,15 +183,13 @@ def _find_task(config, story_ado_id: int, prefix: str, cache: dict) -> int | Non
 
 
 def _load_mapping(proj: dict) -> dict | None:
-    """Load ado_mapping.json."""
-    path = get_output_path(proj, "ado_mapping.json")
-    if not path.exists():
-        click.secho("  ✗ ado_mapping.json not found.", fg="red")
-        click.echo("    Run: xproject push first to create the ADO mapping.")
-        return None
+    """Load the ADO mapping (ado_mapping.json + journal)."""
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except json.JSONDecodeError as e:
+        mapping = load_mapping(proj)
+    except ValueError as e:
         click.secho(f"  ✗ Failed to parse ado_mapping.json: {e}", fg="red")
         return None
+    if mapping is None:
+        click.secho("  ✗ ado_mapping.json not found.", fg="red")
+        click.echo("    Run: xproject push first to create the ADO mapping.")
+    return mapping
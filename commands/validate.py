@@ -1,7 +1,8 @@
 """Validate command: fetch Figma screenshots + ADO stories → validation_bundle.json.
 
 Fetches all top-level frame screenshots from a Figma file using the REST API,
-downloads them locally, fetches all ADO stories, and bundles everything into
+downloads them locally, normalizes them for Claude vision (core.images),
+fetches all ADO stories, and bundles everything into
 validation_bundle.json for analysis in conversation.
 """
 
@@ -15,6 +16,14 @@ from pathlib import Path
 
 from core.config import get_output_path, update_state
 from core import ado as ado_client
+from core.images import (
+    RENDITION_DIR,
+    dedupe_screens,
+    human_bytes,
+    image_settings,
+    normalize_screens,
+)
+from core.workitem_cache import work_item_cache
 
 
 def run(proj: dict, figma_link: str) -> None:
@@ -41,6 +50,15 @@ def run(proj: dict, figma_link: str) -> None:
         return
     click.secho(f"  ✓ Downloaded {len(screens)} screenshots\n", fg="green")
 
+    # Collapse duplicate frames, then normalize screenshots (downsized +
+    # re-encoded, cached in output/image_cache/)
+    image_cache = get_output_path(proj, RENDITION_DIR)
+    fetched = len(screens)
+    screens = dedupe_screens(screens, image_cache)
+    if len(screens) < fetched:
+        click.echo(f"  Collapsed {fetched - len(screens)} duplicate screenshot(s) into aliases")
+    image_bytes = normalize_screens(screens, image_cache, image_settings(proj))
+
     # Step 4: Fetch ADO stories
     stories = _fetch_ado_stories(proj)
     if stories is None:
@@ -51,6 +69,8 @@ def run(proj: dict, figma_link: str) -> None:
         "figma_file_key": file_key,
         "screens": screens,
         "stories": stories,
+        "image_bytes": image_bytes,
+        "duplicate_screens": fetched - len(screens),
     }
     bundle_path = get_output_path(proj, "validation_bundle.json")
     with open(bundle_path, "w", encoding="utf-8") as f:
@@ -60,7 +80,9 @@ def run(proj: dict, figma_link: str) -> None:
 
     click.secho(f"\n  ✓ Validation bundle ready", fg="green", bold=True)
     click.echo(f"    Bundle: {bundle_path}")
-    click.echo(f"    Screens: {len(screens)}")
+    click.echo(f"    Screens: {len(screens)} "
+               f"({human_bytes(image_bytes['original_bytes'])} → "
+               f"{human_bytes(image_bytes['normalized_bytes'])} normalized)")
     click.echo(f"    Stories: {len(stories)}")
     click.echo(f"\n  Next: analyze the bundle in conversation to find gaps.")
 
@@ -167,7 +189,7 @@ def _fetch_ado_stories(proj: dict) -> list[dict] | None:
 
     click.echo("  Fetching stories from ADO...")
     try:
-        data = ado_client.get_all_work_items(config)
+        data = ado_client.get_all_work_items(config, cache=work_item_cache(proj))
     except Exception as e:
         click.secho(f"  ✗ ADO fetch failed: {e}", fg="red")
         return None
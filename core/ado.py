@@ -4,32 +4,298 @@ import json
 import logging
 import time
 import base64
+import email.utils
+import http.client
+import io
+import random
+import threading
 import urllib.parse
-import urllib.request
 import urllib.error
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 logger = logging.getLogger(__name__)
 
 
 ADO_API_VERSION = "7.1"
-RATE_LIMIT_DELAY = 0.3  # seconds between API calls to avoid throttling
+
+# Adaptive rate limiting — token bucket tuned by ADO's rate-limit response headers
+RATE_LIMIT_RATE = 8.0        # initial requests per second
+RATE_LIMIT_MIN_RATE = 0.5    # floor when ADO keeps asking us to slow down
+RATE_LIMIT_MAX_RATE = 25.0   # ceiling while responses come back unthrottled
+RATE_LIMIT_BURST = 8         # tokens available for back-to-back calls
+BACKOFF_BASE = 1.0           # seconds, first retry delay on 429/5xx
+BACKOFF_CAP = 60.0           # seconds, longest retry delay
+MAX_RETRIES = 4
+
+# ADO accepts at most 200 operations per /_apis/wit/$batch request
+BATCH_MAX_OPERATIONS = 200
+
+# Keep-alive connection pool settings
+POOL_MAX_PER_HOST = 8     # idle connections kept open per host
+HTTP_TIMEOUT = 60         # seconds
+MAX_REDIRECTS = 5
 
 # Module-level API call counter for usage tracking
 _call_count = 0
 _call_total_seconds = 0.0
+_stats_lock = threading.Lock()
 
 
 def reset_call_counter() -> None:
-    """Reset the API call counter and timer to zero."""
+    """Reset the API call counter, timer, and connection stats to zero."""
     global _call_count, _call_total_seconds
-    _call_count = 0
-    _call_total_seconds = 0.0
+    with _stats_lock:
+        _call_count = 0
+        _call_total_seconds = 0.0
+    _pool.reset_stats()
+    _limiter.reset_stats()
 
 
 def get_call_stats() -> dict:
-    """Return current API call count and total elapsed seconds."""
-    return {"count": _call_count, "total_seconds": round(_call_total_seconds, 2)}
+    """Return API call count, elapsed seconds, connection reuse, and throttling stats."""
+    with _stats_lock:
+        stats = {"count": _call_count, "total_seconds": round(_call_total_seconds, 2)}
+    stats.update(_pool.get_stats())
+    stats.update(_limiter.get_stats())
+    return stats
+
+
+def configure_pool(max_per_host: int = POOL_MAX_PER_HOST, timeout: float = HTTP_TIMEOUT) -> None:
+    """Resize the shared keep-alive pool. Existing idle connections are closed."""
+    global _pool
+    if max_per_host < 1:
+        raise ValueError(f"Pool size must be at least 1, got {max_per_host}")
+    old = _pool
+    _pool = _ConnectionPool(max_per_host=max_per_host, timeout=timeout)
+    old.close_all()
+
+
+def close_pool() -> None:
+    """Close all idle pooled connections (e.g. at the end of a command)."""
+    _pool.close_all()
+
+
+def configure_rate_limit(
+    rate: float = RATE_LIMIT_RATE,
+    burst: int = RATE_LIMIT_BURST,
+    min_rate: float = RATE_LIMIT_MIN_RATE,
+    max_rate: float = RATE_LIMIT_MAX_RATE,
+) -> None:
+    """Replace the shared rate limiter (e.g. to be gentler on a busy organization)."""
+    global _limiter
+    if not 0 < min_rate <= rate <= max_rate:
+        raise ValueError(f"Expected 0 < min_rate <= rate <= max_rate, got {min_rate}, {rate}, {max_rate}")
+    _limiter = _RateLimiter(rate=rate, burst=burst, min_rate=min_rate, max_rate=max_rate)
+
+
+def _record_call(elapsed: float) -> None:
+    """Add one successful API call to the usage counters."""
+    global _call_count, _call_total_seconds
+    with _stats_lock:
+        _call_count += 1
+        _call_total_seconds += elapsed
+
+
+class _ConnectionPool:
+    """Thread-safe pool of keep-alive HTTP(S) connections, keyed by scheme + host.
+
+    Every helper in this module goes through the shared pool, so a push
+    reuses a handful of TLS connections instead of opening one per call.
+    """
+
+    # Errors that mean a pooled socket was closed by the server while idle
+    _STALE_ERRORS = (
+        http.client.RemoteDisconnected,
+        http.client.CannotSendRequest,
+        ConnectionResetError,
+        BrokenPipeError,
+    )
+
+    def __init__(self, max_per_host: int = POOL_MAX_PER_HOST, timeout: float = HTTP_TIMEOUT):
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self._idle: dict[tuple[str, str], list[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._reused = 0
+        self._requests = 0
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        body: bytes | None = None,
+        headers: dict | None = None,
+    ) -> tuple[int, str, http.client.HTTPMessage, bytes]:
+        """Send one request and return (status, reason, headers, body)."""
+        parts = urllib.parse.urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        path = parts.path or "/"
+        if parts.query:
+            path += f"?{parts.query}"
+
+        while True:
+            conn, reused = self._checkout(key)
+            try:
+                conn.request(method, path, body=body, headers=headers or {})
+                resp = conn.getresponse()
+                data = resp.read()
+            except self._STALE_ERRORS:
+                conn.close()
+                if reused:
+                    # Idle socket was dropped server-side — retry on a fresh one
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                raise
+
+            with self._lock:
+                self._requests += 1
+                if reused:
+                    self._reused += 1
+
+            if resp.will_close:
+                conn.close()
+            else:
+                self._checkin(key, conn)
+            return resp.status, resp.reason, resp.headers, data
+
+    def get_stats(self) -> dict:
+        """Return connection counters and the share of requests on reused sockets."""
+        with self._lock:
+            rate = self._reused / self._requests if self._requests else 0.0
+            return {
+                "connections_opened": self._opened,
+                "connections_reused": self._reused,
+                "reuse_rate": round(rate, 3),
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._opened = 0
+            self._reused = 0
+            self._requests = 0
+
+    def close_all(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+    def _checkout(self, key: tuple[str, str]) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+            self._opened += 1
+
+        scheme, host = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, timeout=self.timeout), False
+        return http.client.HTTPConnection(host, timeout=self.timeout), False
+
+    def _checkin(self, key: tuple[str, str], conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+
+_pool = _ConnectionPool()
+
+
+class _RateLimiter:
+    """Thread-safe token bucket that adapts its rate to ADO's throttling headers.
+
+    ADO reports throttling through response headers rather than fixed quotas:
+      - Retry-After: seconds to wait before the next request (pause everyone)
+      - X-RateLimit-Delay: seconds ADO delayed this request (slow down)
+      - X-RateLimit-Remaining / X-RateLimit-Limit: TSTUs left in the window
+
+    The rate is raised additively while responses are clean and cut
+    multiplicatively when ADO signals pressure (AIMD).
+    """
+
+    def __init__(
+        self,
+        rate: float = RATE_LIMIT_RATE,
+        burst: int = RATE_LIMIT_BURST,
+        min_rate: float = RATE_LIMIT_MIN_RATE,
+        max_rate: float = RATE_LIMIT_MAX_RATE,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self._wait_seconds = 0.0
+        self._throttle_events = 0
+
+    def acquire(self) -> None:
+        """Block until the caller may send one request."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            # Reserve a token now; a negative balance is the queue of waiting callers
+            self._tokens -= 1
+            wait = max(self._paused_until - now, -self._tokens / self.rate, 0.0)
+            self._wait_seconds += wait
+        if wait > 0:
+            time.sleep(wait)
+
+    def observe(self, status: int, headers) -> None:
+        """Adjust the rate from one response's status code and headers."""
+        retry_after = _parse_retry_after(headers.get("Retry-After"))
+        delay = _header_float(headers.get("X-RateLimit-Delay"))
+        remaining = _header_float(headers.get("X-RateLimit-Remaining"))
+        limit = _header_float(headers.get("X-RateLimit-Limit"))
+
+        with self._lock:
+            now = time.monotonic()
+            if retry_after is not None:
+                self._paused_until = max(self._paused_until, now + retry_after)
+
+            if status == 429 or status == 503 or retry_after is not None:
+                self._throttle_events += 1
+                self._set_rate(self.rate * 0.5)
+            elif delay:
+                self._throttle_events += 1
+                self._set_rate(self.rate * 0.7)
+            elif remaining is not None and limit and remaining / limit < 0.1:
+                self._set_rate(self.rate * 0.85)
+            elif status < 400:
+                self._set_rate(self.rate + 0.5)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "rate_per_second": round(self.rate, 2),
+                "throttle_events": self._throttle_events,
+                "rate_limit_wait_seconds": round(self._wait_seconds, 2),
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._wait_seconds = 0.0
+            self._throttle_events = 0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._tokens = min(float(self.burst), self._tokens + elapsed * self.rate)
+
+    def _set_rate(self, rate: float) -> None:
+        self.rate = min(self.max_rate, max(self.min_rate, rate))
+
+
+_limiter = _RateLimiter()
 
 
 @dataclass
@@ -91,41 +357,7 @@ def create_work_item(
     wit_encoded = urllib.parse.quote(work_item_type, safe="")
     url = f"{config.base_url}/wit/workitems/${wit_encoded}?api-version={ADO_API_VERSION}"
 
-    # Build patch document
-    patches = [
-        {"op": "add", "path": "/fields/System.Title", "value": title},
-    ]
-
-    if description:
-        patches.append({
-            "op": "add",
-            "path": "/fields/System.Description",
-            "value": description,
-        })
-
-    if tags:
-        patches.append({
-            "op": "add",
-            "path": "/fields/System.Tags",
-            "value": tags,
-        })
-
-    if parent_id is not None:
-        patches.append({
-            "op": "add",
-            "path": "/relations/-",
-            "value": {
-                "rel": "System.LinkTypes.Hierarchy-Reverse",
-                "url": f"https://dev.azure.com/{config.organization}/_apis/wit/workItems/{parent_id}",
-            },
-        })
-
-    if extra_fields:
-        for field_path, value in extra_fields.items():
-            if not field_path.startswith("/fields/"):
-                field_path = f"/fields/{field_path}"
-            patches.append({"op": "add", "path": field_path, "value": value})
-
+    patches = _build_create_patches(config, title, description, tags, parent_id, extra_fields)
     return _api_request(config, url, method="POST", body=patches,
                         content_type="application/json-patch+json")
 
@@ -182,20 +414,126 @@ def add_link(
         Updated work item dict
     """
     url = f"{config.base_url}/wit/workitems/{source_id}?api-version={ADO_API_VERSION}"
+    patches = [link_patch(config, target_id, link_type, comment)]
+    return _api_request(config, url, method="PATCH", body=patches,
+                        content_type="application/json-patch+json")
 
+
+def link_patch(config: AdoConfig, target_id: int, link_type: str, comment: str = "") -> dict:
+    """Build the JSON Patch operation that adds one work item relation link."""
     link_value = {
         "rel": link_type,
         "url": f"https://dev.azure.com/{config.organization}/_apis/wit/workItems/{target_id}",
     }
     if comment:
         link_value["attributes"] = {"comment": comment}
+    return {"op": "add", "path": "/relations/-", "value": link_value}
 
-    patches = [
-        {"op": "add", "path": "/relations/-", "value": link_value},
-    ]
 
-    return _api_request(config, url, method="PATCH", body=patches,
-                        content_type="application/json-patch+json")
+def attachment_patch(attachment_url: str, comment: str = "") -> dict:
+    """Build the JSON Patch operation that links an uploaded attachment."""
+    return {
+        "op": "add",
+        "path": "/relations/-",
+        "value": {
+            "rel": "AttachedFile",
+            "url": attachment_url,
+            "attributes": {"comment": comment},
+        },
+    }
+
+
+# --- Batch operations ---
+
+@dataclass
+class BatchResult:
+    """Outcome of a single operation inside a $batch request."""
+    index: int                # position in the operations list passed in
+    ok: bool
+    status: int
+    item: dict = field(default_factory=dict)   # work item dict on success
+    error: str = ""
+
+    @property
+    def id(self) -> int | None:
+        return self.item.get("id")
+
+
+def create_operation(
+    config: AdoConfig,
+    work_item_type: str,
+    title: str,
+    description: str = "",
+    tags: str = "",
+    parent_id: int | None = None,
+    extra_fields: dict | None = None,
+) -> dict:
+    """Build a $batch operation that creates a work item.
+
+    Takes the same arguments as create_work_item(); pass the result to
+    batch_work_items() together with other operations.
+    """
+    proj = urllib.parse.quote(config.project, safe="")
+    wit_encoded = urllib.parse.quote(work_item_type, safe="")
+    return {
+        "method": "PATCH",
+        "uri": f"/{proj}/_apis/wit/workitems/${wit_encoded}?api-version={ADO_API_VERSION}",
+        "headers": {"Content-Type": "application/json-patch+json"},
+        "body": _build_create_patches(config, title, description, tags, parent_id, extra_fields),
+    }
+
+
+def update_operation(config: AdoConfig, work_item_id: int, patches: list[dict]) -> dict:
+    """Build a $batch operation that applies a raw JSON Patch to a work item."""
+    return {
+        "method": "PATCH",
+        "uri": f"/_apis/wit/workitems/{work_item_id}?api-version={ADO_API_VERSION}",
+        "headers": {"Content-Type": "application/json-patch+json"},
+        "body": patches,
+    }
+
+
+def batch_work_items(config: AdoConfig, operations: list[dict]) -> list[BatchResult]:
+    """
+    Send create/update operations through the /_apis/wit/$batch endpoint.
+
+    Operations are sent in chunks of BATCH_MAX_OPERATIONS. ADO applies each
+    operation independently (a batch is not a transaction), so one failing
+    item does not roll back the others.
+
+    Args:
+        config: ADO connection config
+        operations: Dicts from create_operation() / update_operation()
+
+    Returns:
+        One BatchResult per operation, in the same order. If a whole chunk
+        request fails, every operation in that chunk is reported as failed.
+    """
+    url = f"https://dev.azure.com/{config.organization}/_apis/wit/$batch?api-version={ADO_API_VERSION}"
+    results: list[BatchResult] = []
+
+    for start in range(0, len(operations), BATCH_MAX_OPERATIONS):
+        chunk = operations[start:start + BATCH_MAX_OPERATIONS]
+        try:
+            response = _api_request(config, url, method="POST", body=chunk)
+        except Exception as e:
+            results.extend(
+                BatchResult(index=start + i, ok=False, status=0, error=str(e))
+                for i in range(len(chunk))
+            )
+            continue
+
+        values = response.get("value", [])
+        for i in range(len(chunk)):
+            if i >= len(values):
+                results.append(BatchResult(
+                    index=start + i, ok=False, status=0,
+                    error="No response returned for this operation",
+                ))
+                continue
+            results.append(_parse_batch_value(start + i, values[i]))
+
+    return results
 
 
 def get_work_items_by_query(config: AdoConfig, wiql: str) -> list[dict]:
@@ -209,15 +547,28 @@ def get_work_items_by_query(config: AdoConfig, wiql: str) -> list[dict]:
     Returns:
         List of work item dicts with full details
     """
+    return get_work_items_by_ids(config, query_work_item_ids(config, wiql))
+
+
+def query_work_item_ids(config: AdoConfig, wiql: str, time_precision: bool = False) -> list[int]:
+    """
+    Run a WIQL query and return only the matching work item IDs.
+
+    Args:
+        config: ADO connection config
+        wiql: WIQL query string
+        time_precision: Compare dates including the time of day (needed for
+            [System.ChangedDate] > '<timestamp>' delta queries)
+    """
     url = f"{config.base_url}/wit/wiql?api-version={ADO_API_VERSION}"
+    if time_precision:
+        url += "&timePrecision=true"
     result = _api_request(config, url, method="POST", body={"query": wiql})
+    return [wi["id"] for wi in result.get("workItems", [])]
 
-    work_items = result.get("workItems", [])
-    if not work_items:
-        return []
 
-    # Fetch full details in batches of 200
-    ids = [wi["id"] for wi in work_items]
+def get_work_items_by_ids(config: AdoConfig, ids: list[int]) -> list[dict]:
+    """Fetch full details (fields + relations) for work item IDs, 200 per request."""
     detailed = []
     for i in range(0, len(ids), 200):
         batch = ids[i:i + 200]
@@ -232,8 +583,23 @@ def get_work_items_by_query(config: AdoConfig, wiql: str) -> list[dict]:
     return detailed
 
 
-def get_all_stories(config: AdoConfig, tag_filter: str | None = None) -> list[dict]:
-    """Get all user stories, optionally filtered by tag."""
+def get_all_stories(config: AdoConfig, tag_filter: str | None = None,
+                    cache=None, max_age: float | None = None) -> list[dict]:
+    """Get all user stories, optionally filtered by tag.
+
+    With a WorkItemCache (core.workitem_cache), stories are served from the
+    local cache after an incremental refresh — see WorkItemCache.get_items()
+    for the `max_age` freshness policy.
+    """
+    if cache is not None:
+        items = cache.get_items(config, ["User Story"], max_age=max_age)
+        if tag_filter:
+            items = [
+                item for item in items
+                if tag_filter in item.get("fields", {}).get("System.Tags", "")
+            ]
+        return items
+
     wiql = (
         "SELECT [System.Id], [System.Title], [System.Description], "
         "[System.Tags], [System.State] "
@@ -246,10 +612,15 @@ def get_all_stories(config: AdoConfig, tag_filter: str | None = None) -> list[di
     return get_work_items_by_query(config, wiql)
 
 
-def get_all_work_items(config: AdoConfig) -> dict:
+def get_all_work_items(config: AdoConfig, cache=None, max_age: float | None = None) -> dict:
     """
     Get all epics, features, and stories organized hierarchically.
 
+    Args:
+        config: ADO connection config
+        cache: Optional WorkItemCache to serve from (incrementally refreshed)
+        max_age: Cache freshness policy, see WorkItemCache.get_items()
+
     Returns:
         {
             "epics": [{"id": ..., "title": ..., "features": [...]}],
@@ -257,13 +628,16 @@ def get_all_work_items(config: AdoConfig) -> dict:
             "stories": [...]
         }
     """
-    wiql = (
-        "SELECT [System.Id], [System.Title], [System.WorkItemType], "
-        "[System.Description], [System.Tags], [System.State] "
-        "FROM WorkItems WHERE [System.WorkItemType] IN ('Epic', 'Feature', 'User Story') "
-        "ORDER BY [System.WorkItemType] ASC, [System.Id] ASC"
-    )
-    items = get_work_items_by_query(config, wiql)
+    if cache is not None:
+        items = cache.get_items(config, ["Epic", "Feature", "User Story"], max_age=max_age)
+    else:
+        wiql = (
+            "SELECT [System.Id], [System.Title], [System.WorkItemType], "
+            "[System.Description], [System.Tags], [System.State] "
+            "FROM WorkItems WHERE [System.WorkItemType] IN ('Epic', 'Feature', 'User Story') "
+            "ORDER BY [System.WorkItemType] ASC, [System.Id] ASC"
+        )
+        items = get_work_items_by_query(config, wiql)
 
     epics = []
     features = []
@@ -347,24 +721,15 @@ def upload_attachment(
         "Authorization": config.auth_header,
         "Content-Type": "application/octet-stream",
     }
-    req = urllib.request.Request(upload_url, data=file_data, headers=headers, method="POST")
 
-    time.sleep(RATE_LIMIT_DELAY)
-    with urllib.request.urlopen(req) as resp:
-        upload_result = json.loads(resp.read().decode("utf-8"))
+    _limiter.acquire()
+    _, resp_body = _http_request("POST", upload_url, headers=headers, data=file_data)
+    upload_result = json.loads(resp_body.decode("utf-8"))
 
     attachment_url = upload_result.get("url", "")
 
     # Step 2: Link the attachment to the work item
-    patches = [{
-        "op": "add",
-        "path": "/relations/-",
-        "value": {
-            "rel": "AttachedFile",
-            "url": attachment_url,
-            "attributes": {"comment": comment or filename},
-        },
-    }]
+    patches = [attachment_patch(attachment_url, comment or filename)]
 
     wi_url = f"{config.base_url}/wit/workitems/{work_item_id}?api-version={ADO_API_VERSION}"
     return _api_request(config, wi_url, method="PATCH", body=patches,
@@ -396,11 +761,10 @@ def upload_file_blob(config: AdoConfig, file_path: str, filename: str | None = N
         "Authorization": config.auth_header,
         "Content-Type": "application/octet-stream",
     }
-    req = urllib.request.Request(upload_url, data=file_data, headers=headers, method="POST")
 
-    time.sleep(RATE_LIMIT_DELAY)
-    with urllib.request.urlopen(req) as resp:
-        upload_result = json.loads(resp.read().decode("utf-8"))
+    _limiter.acquire()
+    _, resp_body = _http_request("POST", upload_url, headers=headers, data=file_data)
+    upload_result = json.loads(resp_body.decode("utf-8"))
 
     return upload_result.get("url", "")
 
@@ -408,15 +772,7 @@ def upload_file_blob(config: AdoConfig, file_path: str, filename: str | None = N
 def link_attachment(config: AdoConfig, work_item_id: int, attachment_url: str,
                     comment: str = "") -> dict:
     """Link an already-uploaded attachment URL to a work item."""
-    patches = [{
-        "op": "add",
-        "path": "/relations/-",
-        "value": {
-            "rel": "AttachedFile",
-            "url": attachment_url,
-            "attributes": {"comment": comment},
-        },
-    }]
+    patches = [attachment_patch(attachment_url, comment)]
     wi_url = f"{config.base_url}/wit/workitems/{work_item_id}?api-version={ADO_API_VERSION}"
     return _api_request(config, wi_url, method="PATCH", body=patches,
                         content_type="application/json-patch+json")
@@ -614,14 +970,12 @@ def get_wiki_page(
         "Authorization": config.auth_header,
         "Content-Type": "application/json",
     }
-    req = urllib.request.Request(url, headers=headers, method="GET")
-
     try:
-        time.sleep(RATE_LIMIT_DELAY)
-        with urllib.request.urlopen(req) as resp:
-            etag = resp.headers.get("ETag", "")
-            body = json.loads(resp.read().decode("utf-8"))
-            return {"content": body.get("content", ""), "etag": etag}
+        _limiter.acquire()
+        resp_headers, resp_body = _http_request("GET", url, headers=headers)
+        etag = resp_headers.get("ETag", "")
+        body = json.loads(resp_body.decode("utf-8"))
+        return {"content": body.get("content", ""), "etag": etag}
     except urllib.error.HTTPError as e:
         if e.code == 404:
             return {"error": "Page not found", "status": 404}
@@ -673,12 +1027,11 @@ def upsert_wiki_page(
         headers["If-Match"] = etag
 
     body = json.dumps({"content": content}).encode("utf-8")
-    req = urllib.request.Request(url, data=body, headers=headers, method="PUT")
 
     try:
-        time.sleep(RATE_LIMIT_DELAY)
-        with urllib.request.urlopen(req) as resp:
-            return json.loads(resp.read().decode("utf-8"))
+        _limiter.acquire()
+        _, resp_body = _http_request("PUT", url, headers=headers, data=body)
+        return json.loads(resp_body.decode("utf-8"))
     except urllib.error.HTTPError as e:
         body_text = ""
         try:
@@ -766,12 +1119,10 @@ def upload_wiki_attachment(
         "Authorization": config.auth_header,
         "Content-Type": "application/octet-stream",
     }
-    req = urllib.request.Request(url, data=file_data, headers=headers, method="PUT")
-
     try:
-        time.sleep(RATE_LIMIT_DELAY)
-        with urllib.request.urlopen(req) as resp:
-            result = json.loads(resp.read().decode("utf-8"))
+        _limiter.acquire()
+        _, resp_body = _http_request("PUT", url, headers=headers, data=file_data)
+        result = json.loads(resp_body.decode("utf-8"))
         return result.get("path", default_path)
     except urllib.error.HTTPError as e:
         # 500 with "already exists" or 409 Conflict — attachment was uploaded before
@@ -798,6 +1149,74 @@ def list_repositories(config: AdoConfig) -> list[dict]:
 
 # --- Internal helpers ---
 
+def _build_create_patches(
+    config: AdoConfig,
+    title: str,
+    description: str = "",
+    tags: str = "",
+    parent_id: int | None = None,
+    extra_fields: dict | None = None,
+) -> list[dict]:
+    """Build the JSON Patch document for creating a work item."""
+    patches = [
+        {"op": "add", "path": "/fields/System.Title", "value": title},
+    ]
+
+    if description:
+        patches.append({
+            "op": "add",
+            "path": "/fields/System.Description",
+            "value": description,
+        })
+
+    if tags:
+        patches.append({
+            "op": "add",
+            "path": "/fields/System.Tags",
+            "value": tags,
+        })
+
+    if parent_id is not None:
+        patches.append({
+            "op": "add",
+            "path": "/relations/-",
+            "value": {
+                "rel": "System.LinkTypes.Hierarchy-Reverse",
+                "url": f"https://dev.azure.com/{config.organization}/_apis/wit/workItems/{parent_id}",
+            },
+        })
+
+    if extra_fields:
+        for field_path, value in extra_fields.items():
+            if not field_path.startswith("/fields/"):
+                field_path = f"/fields/{field_path}"
+            patches.append({"op": "add", "path": field_path, "value": value})
+
+    return patches
+
+
+def _parse_batch_value(index: int, value: dict) -> BatchResult:
+    """Turn one entry of a $batch response into a BatchResult.
+
+    Each entry carries its own HTTP status and a JSON-encoded body string.
+    """
+    status = value.get("code", 0)
+    raw_body = value.get("body") or ""
+    try:
+        body = json.loads(raw_body) if isinstance(raw_body, str) and raw_body else raw_body or {}
+    except json.JSONDecodeError:
+        body = {"message": raw_body}
+
+    if 200 <= status < 300:
+        return BatchResult(index=index, ok=True, status=status, item=body)
+
+    message = body.get("message", "") if isinstance(body, dict) else str(body)
+    return BatchResult(
+        index=index, ok=False, status=status,
+        error=f"ADO batch item error {status}: {message[:500]}",
+    )
+
+
 def _api_request(
     config: AdoConfig,
     url: str,
@@ -815,20 +1234,15 @@ def _api_request(
     if body is not None:
         data = json.dumps(body).encode("utf-8")
 
-    req = urllib.request.Request(url, data=data, headers=headers, method=method)
-
-    global _call_count, _call_total_seconds
-
-    retries = 3
+    retries = MAX_RETRIES
     for attempt in range(retries):
         try:
-            time.sleep(RATE_LIMIT_DELAY)
+            _limiter.acquire()
             t0 = time.monotonic()
-            with urllib.request.urlopen(req) as resp:
-                resp_body = resp.read().decode("utf-8")
-                _call_total_seconds += time.monotonic() - t0
-                _call_count += 1
-                return json.loads(resp_body) if resp_body else {}
+            _, raw = _http_request(method, url, headers=headers, data=data)
+            _record_call(time.monotonic() - t0)
+            resp_body = raw.decode("utf-8")
+            return json.loads(resp_body) if resp_body else {}
         except urllib.error.HTTPError as e:
             body_text = ""
             try:
@@ -836,13 +1250,9 @@ def _api_request(
             except Exception:
                 pass
 
-            if e.code == 429:  # Rate limited
-                delay = 2 ** (attempt + 1)
-                logger.warning("Rate limited, waiting %ds...", delay)
-                time.sleep(delay)
-                continue
-            elif e.code >= 500 and attempt < retries - 1:
-                delay = 2 ** attempt
+            if e.code == 429 or (e.code >= 500 and attempt < retries - 1):
+                delay = _backoff_delay(attempt, e.headers)
+                logger.warning("ADO returned %d, retrying in %.1fs...", e.code, delay)
                 time.sleep(delay)
                 continue
             else:
@@ -853,3 +1263,78 @@ def _api_request(
                 )
 
     raise RuntimeError(f"ADO API request failed after {retries} retries: {url}")
+
+
+def _http_request(
+    method: str,
+    url: str,
+    headers: dict | None = None,
+    data: bytes | None = None,
+) -> tuple[http.client.HTTPMessage, bytes]:
+    """Send a request over the shared keep-alive pool.
+
+    Follows redirects and raises urllib.error.HTTPError for 4xx/5xx responses,
+    so callers keep the same error handling they had with urllib.request.
+
+    Returns:
+        (response headers, raw response body)
+    """
+    headers = dict(headers or {})
+    for _ in range(MAX_REDIRECTS + 1):
+        status, reason, resp_headers, body = _pool.request(method, url, body=data, headers=headers)
+        _limiter.observe(status, resp_headers)
+
+        if status in (301, 302, 303, 307, 308) and resp_headers.get("Location"):
+            next_url = urllib.parse.urljoin(url, resp_headers["Location"])
+            # Never forward the PAT to a different host
+            if urllib.parse.urlsplit(next_url).netloc != urllib.parse.urlsplit(url).netloc:
+                headers.pop("Authorization", None)
+            if status == 303 or (status in (301, 302) and method == "POST"):
+                method, data = "GET", None
+                headers.pop("Content-Type", None)
+            url = next_url
+            continue
+
+        if status >= 400:
+            raise urllib.error.HTTPError(url, status, reason, resp_headers, io.BytesIO(body))
+        return resp_headers, body
+
+    raise RuntimeError(f"Too many redirects: {url}")
+
+
+def _backoff_delay(attempt: int, headers=None) -> float:
+    """Delay before retry number `attempt` (0-based) after a 429/5xx.
+
+    Honours Retry-After when ADO sends it; otherwise exponential backoff
+    with jitter so concurrent callers don't retry in lockstep.
+    """
+    if headers is not None:
+        retry_after = _parse_retry_after(headers.get("Retry-After"))
+        if retry_after is not None:
+            return min(retry_after, BACKOFF_CAP)
+    ceiling = min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt)
+    return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds."""
+    if not value:
+        return None
+    seconds = _header_float(value)
+    if seconds is not None:
+        return max(seconds, 0.0)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(when.timestamp() - time.time(), 0.0)
+
+
+def _header_float(value: str | None) -> float | None:
+    """Parse a numeric header value, returning None if absent or malformed."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
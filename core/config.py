@@ -1,10 +1,29 @@
-"""Project configuration and state management for xProject pipeline."""
-
+"""Project configuration and state management for xProject pipeline.
+
+project.yaml is written atomically (temp file + rename) under an advisory
+file lock. Inside project_session(proj) — opened by the CLI around each
+command — save_project() and the update_* helpers only mark the project
+dirty, and one write happens when the session ends. That write applies
+the top-level keys (and the keys inside mapping sections such as
+`state`) that changed during the session to the file as it is on disk
+then, and appends new `changes` records. Commands running at the same
+time therefore keep each other's updates.
+"""
+
+import copy
 import os
 import yaml
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime, timezone
 
+from core.filelock import file_lock
+
+try:  # libyaml-backed loader/dumper when PyYAML was built with it
+    from yaml import CSafeLoader as _YamlLoader, CDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, Dumper as _YamlDumper
+
 
 # Base directory: projects/ lives next to the xproject script
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -98,7 +117,7 @@ def init_project(
 
     # Add a .gitignore to keep sensitive data out
     gitignore = proj_dir / ".gitignore"
-    gitignore.write_text("project.yaml\nsnapshots/\n")
+    gitignore.write_text("project.yaml\nproject.yaml.lock\nsnapshots/\n")
 
     config["path"] = str(proj_dir)
     return config
@@ -143,11 +162,55 @@ def load_project(name: str) -> dict:
     return config
 
 
+class ProjectSession:
+    """Pending project.yaml changes for one project dict (see project_session)."""
+
+    def __init__(self, proj: dict):
+        self.proj = proj
+        self.baseline = copy.deepcopy(_config_of(proj))
+        self.dirty = False
+
+    def commit(self) -> None:
+        """Write the session's changes to project.yaml if anything was saved."""
+        if not self.dirty:
+            return
+        _commit_project(self.proj, self.baseline)
+        self.baseline = copy.deepcopy(_config_of(self.proj))
+        self.dirty = False
+
+
+# Open sessions, keyed by id() of the project dict they batch
+_SESSIONS: dict[int, ProjectSession] = {}
+
+
+@contextmanager
+def project_session(proj: dict):
+    """Batch project.yaml writes for `proj` until the with-block ends.
+
+    Saves made inside the block (directly or via update_state,
+    update_status, add_change_record, invalidate_downstream) are written
+    once on exit, also when the block raises, since each of them was a
+    request to persist. Nested sessions on the same dict join the outer one.
+    """
+    session = _SESSIONS.get(id(proj))
+    if session is not None:
+        yield session
+        return
+    session = _SESSIONS[id(proj)] = ProjectSession(proj)
+    try:
+        yield session
+    finally:
+        del _SESSIONS[id(proj)]
+        session.commit()
+
+
 def save_project(proj: dict) -> None:
-    """Save project config back to project.yaml."""
-    proj_dir = Path(proj["path"])
-    config = {k: v for k, v in proj.items() if k != "path"}
-    _save_yaml(proj_dir / "project.yaml", config)
+    """Save project config back to project.yaml (deferred inside project_session)."""
+    session = _SESSIONS.get(id(proj))
+    if session is not None:
+        session.dirty = True
+        return
+    _commit_project(proj, baseline=None)
 
 
 def update_state(proj: dict, **kwargs) -> None:
@@ -205,19 +268,65 @@ def get_specs_dir(proj: dict) -> Path:
 
 # --- Internal helpers ---
 
+def _config_of(proj: dict) -> dict:
+    """The part of a project dict that is stored in project.yaml."""
+    return {k: v for k, v in proj.items() if k != "path"}
+
+
+def _commit_project(proj: dict, baseline: dict | None) -> None:
+    """Write project.yaml under its lock.
+
+    With a baseline (the config as the session first saw it), only what
+    changed since then is applied to the current file. Without one the
+    whole config is written.
+    """
+    yaml_path = Path(proj["path"]) / "project.yaml"
+    config = _config_of(proj)
+    with file_lock(yaml_path):
+        if baseline is not None and yaml_path.exists():
+            config = _merge_config(_load_yaml(yaml_path), baseline, config)
+        _save_yaml(yaml_path, config)
+
+
+def _merge_config(disk: dict, baseline: dict, ours: dict) -> dict:
+    """Apply the changes from `baseline` to `ours` onto `disk`."""
+    merged = dict(disk)
+    for key, value in ours.items():
+        base = baseline.get(key)
+        if key in baseline and base == value:
+            continue
+        if isinstance(value, dict) and isinstance(base, dict) and isinstance(disk.get(key), dict):
+            section = dict(disk[key])
+            section.update({k: v for k, v in value.items() if k not in base or base[k] != v})
+            for k in base.keys() - value.keys():
+                section.pop(k, None)
+            merged[key] = section
+        elif isinstance(value, list) and isinstance(base, list) \
+                and value[:len(base)] == base and isinstance(disk.get(key), list):
+            merged[key] = disk[key] + value[len(base):]  # appended records (e.g. changes)
+        else:
+            merged[key] = value
+    for key in baseline.keys() - ours.keys():
+        merged.pop(key, None)
+    return merged
+
+
 def _load_yaml(path: Path) -> dict:
     """Load a YAML file."""
     with open(path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+        return yaml.load(f, Loader=_YamlLoader) or {}
 
 
 def _save_yaml(path: Path, data: dict) -> None:
-    """Save a dict to YAML with clean formatting."""
-    with open(path, "w", encoding="utf-8") as f:
+    """Save a dict to YAML with clean formatting (atomically: temp file + rename)."""
+    tmp_path = path.with_suffix(".yaml.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
         yaml.dump(
             data, f,
+            Dumper=_YamlDumper,
             default_flow_style=False,
             sort_keys=False,
             allow_unicode=True,
             width=120,
         )
+    os.replace(tmp_path, path)
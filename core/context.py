@@ -4,6 +4,7 @@ import hashlib
 import click
 from pathlib import Path
 from core.config import get_input_dir, get_output_path, get_answers_dir
+from core.transcripts import PRECOMPACT_SUFFIX
 
 
 # Dependency graph: command → list of (state_key, error_message)
@@ -102,14 +103,17 @@ def invalidate_downstream(proj: dict, command: str) -> None:
 
 
 def compute_input_hash(proj: dict) -> str:
-    """Compute a hash of all files in the input/ directory."""
+    """Compute a hash of all files in the input/ directory.
+
+    Pre-compacted transcript copies are derived by ingest, so they don't count.
+    """
     input_dir = get_input_dir(proj)
     if not input_dir.exists():
         return ""
 
     hasher = hashlib.md5()
     for fpath in sorted(input_dir.rglob("*")):
-        if fpath.is_file():
+        if fpath.is_file() and not fpath.name.endswith(PRECOMPACT_SUFFIX):
             hasher.update(fpath.name.encode())
             hasher.update(str(fpath.stat().st_size).encode())
             hasher.update(str(fpath.stat().st_mtime).encode())
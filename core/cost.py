@@ -1,13 +1,27 @@
-"""Per-project cost tracking — reads Claude Code JSONL transcripts for exact token counts."""
+"""Per-project cost tracking — reads Claude Code JSONL transcripts for exact token counts.
 
+Logged session costs live in the project's telemetry store (core.telemetry).
+
+Workspace scans (read_all_sessions_for_cwd) are incremental: a cursor per
+transcript — inode, size, mtime, the byte offset of the last complete line
+and the token/cost totals up to it — is kept in a per-user cache file, so
+an unchanged session costs one stat() and an appended one only parses the
+new bytes. Large backlogs are parsed on a process pool. Alongside each
+cursor the scan keeps the transcript's per-message usage records in a
+binary column file, which core.cost_analytics reads for breakdowns.
+"""
+
+import hashlib
 import json
 import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timezone
 from pathlib import Path
 
-from core.config import get_output_path
-
-COST_LOG_FILE = "cost_log.json"
+from core.filelock import file_lock
+from core.telemetry import telemetry_store
 
 # Claude API pricing (USD per 1M tokens) — updated 2026-02
 # https://www.anthropic.com/pricing
@@ -47,6 +61,20 @@ DEFAULT_PRICING = {
 }
 
 
+# Session scan cache (cursor per transcript). Bump the version when pricing
+# or the parsed fields change — cached totals are then recomputed.
+SCAN_CACHE_VERSION = 2
+SCAN_CACHE_FILE = "session_scan.json"
+COLUMNS_DIR = "session_columns"
+# One record per usage message, int64 each: timestamp (epoch seconds, -1 if
+# missing), model (index into the cursor's models, -1 if missing), input,
+# output, cache_create and cache_read tokens
+RECORD_FIELDS = 6
+RECORD_BYTES = RECORD_FIELDS * array("q").itemsize
+SCAN_POOL_MIN_BYTES = 32 * 1024 * 1024  # unparsed bytes before using a process pool
+SCAN_WORKERS = min(8, os.cpu_count() or 1)
+
+
 def _get_claude_projects_dir() -> Path:
     """Find the Claude Code projects directory."""
     home = Path.home()
@@ -59,7 +87,7 @@ def _get_claude_projects_dir() -> Path:
     return home / ".claude" / "projects"
 
 
-def _match_model(model_str: str) -> dict:
+def match_model(model_str: str) -> dict:
     """Match a model string to pricing. Handles partial matches."""
     if not model_str:
         return DEFAULT_PRICING
@@ -79,7 +107,7 @@ def _match_model(model_str: str) -> dict:
 
 def _calc_message_cost(usage: dict, model: str) -> float:
     """Calculate cost for a single message's usage data."""
-    pricing = _match_model(model)
+    pricing = match_model(model)
     input_tokens = usage.get("input_tokens", 0)
     output_tokens = usage.get("output_tokens", 0)
     cache_create = usage.get("cache_creation_input_tokens", 0)
@@ -135,6 +163,18 @@ def read_all_sessions_for_cwd() -> list[dict]:
     where the cwd path has / replaced with - (e.g. /Users/foo → -Users-foo).
     Also checks the old project name (presales-pipeline → xproject rename).
     """
+    paths = workspace_transcripts()
+    sessions = []
+    for path, totals in zip(paths, scan_transcripts(paths)):
+        result = _session_result(path.stem, totals)
+        if result["message_count"] > 0:
+            sessions.append(result)
+
+    return sessions
+
+
+def workspace_transcripts() -> list[Path]:
+    """Session JSONL files for the current working directory (one per session ID)."""
     cwd = os.getcwd()
     projects_dir = _get_claude_projects_dir()
 
@@ -148,7 +188,7 @@ def read_all_sessions_for_cwd() -> list[dict]:
         legacy = encoded.replace("xproject", "presales-pipeline")
         candidate_dirs.append(projects_dir / legacy)
 
-    sessions = []
+    paths = []
     seen_ids = set()
     for session_dir in candidate_dirs:
         if not session_dir.exists():
@@ -158,81 +198,268 @@ def read_all_sessions_for_cwd() -> list[dict]:
             if session_id in seen_ids:
                 continue
             seen_ids.add(session_id)
-            result = _parse_jsonl(f, session_id)
-            if result and result["message_count"] > 0:
-                sessions.append(result)
+            paths.append(f)
+    return paths
 
-    return sessions
+
+def _scan_cache_path() -> Path:
+    """Per-user location of the session scan cache."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "xproject" / SCAN_CACHE_FILE
+
+
+def columns_path(transcript: Path) -> Path:
+    """Column file holding a transcript's per-message usage records."""
+    key = hashlib.sha1(str(Path(transcript).resolve()).encode("utf-8")).hexdigest()[:16]
+    return _scan_cache_path().parent / COLUMNS_DIR / f"{key}.bin"
+
+
+def scan_transcripts(paths: list[Path], include_tail: bool = True) -> list[dict]:
+    """Bring cursors and column files up to date; return totals per transcript.
+
+    Totals are {"input", "output", "cache_create", "cache_read", "cost",
+    "models", "messages", "first_ts", "last_ts"}. By default they include
+    an incomplete last line; with include_tail=False they are the committed
+    totals, matching the column file: `messages` records for the complete
+    lines, with model indexes into `models`.
+    """
+    cache_path = _scan_cache_path()
+    cursors = _load_scan_cache(cache_path)
+
+    results: list[dict | None] = []
+    pending = []  # (position, path, cursor to resume from or None)
+    pending_bytes = 0
+    for path in paths:
+        key = str(path.resolve())
+        try:
+            st = path.stat()
+        except OSError:
+            results.append(_new_totals())
+            continue
+        cursor = cursors.get(key)
+        if cursor and not _columns_match(path, cursor):
+            cursor = None  # column file lost or out of step — rebuild it
+        if cursor and cursor["inode"] == st.st_ino and cursor["size"] == st.st_size \
+                and cursor["mtime_ns"] == st.st_mtime_ns:
+            results.append(_with_tail(path, cursor) if include_tail else cursor["totals"])
+            continue
+        if not (cursor and cursor["inode"] == st.st_ino and st.st_size > cursor["size"]):
+            cursor = None  # new, replaced or truncated — parse from the start
+        pending.append((len(results), path, cursor))
+        pending_bytes += st.st_size - (cursor["offset"] if cursor else 0)
+        results.append(None)
+
+    if pending:
+        scanned = _scan_many([(path, cursor) for _, path, cursor in pending], pending_bytes)
+        for (pos, path, _), cursor in zip(pending, scanned):
+            cursors[str(path.resolve())] = cursor
+            results[pos] = _with_tail(path, cursor) if include_tail else cursor["totals"]
+        _save_scan_cache(cache_path, cursors)
+
+    return results
+
+
+def _scan_many(jobs: list[tuple[Path, dict | None]], total_bytes: int) -> list[dict]:
+    """Advance cursors, on a process pool when there's a large backlog."""
+    if len(jobs) < 2 or total_bytes < SCAN_POOL_MIN_BYTES or SCAN_WORKERS <= 1:
+        return [_advance_cursor(path, cursor) for path, cursor in jobs]
+    try:
+        with ProcessPoolExecutor(max_workers=min(SCAN_WORKERS, len(jobs))) as pool:
+            futures = [pool.submit(_advance_cursor, path, cursor) for path, cursor in jobs]
+            return [f.result() for f in futures]
+    except (BrokenProcessPool, OSError):
+        # No usable process pool (sandbox, worker killed) — scan in-process
+        return [_advance_cursor(path, cursor) for path, cursor in jobs]
+
+
+def _advance_cursor(path: Path, cursor: dict | None) -> dict:
+    """Parse the complete lines appended since `cursor` and return the new cursor.
+
+    A trailing line without a newline (still being written) is left for
+    the next scan; _with_tail() counts it in the meantime. The records of
+    the parsed lines are appended to the transcript's column file.
+    """
+    st = path.stat()
+    offset = cursor["offset"] if cursor else 0
+    totals = dict(cursor["totals"]) if cursor else _new_totals()
+    kept = totals["messages"] * RECORD_BYTES
+    records = array("q")
+    with open(path, "rb") as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            offset += len(line)
+            record = _add_line(totals, line)
+            if record:
+                records.extend(record)
+
+    col_path = columns_path(path)
+    col_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(col_path, "r+b" if kept else "wb") as f:
+        f.truncate(kept)
+        f.seek(kept)
+        records.tofile(f)
+    return {
+        "inode": st.st_ino,
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "offset": offset,
+        "totals": totals,
+    }
+
+
+def _with_tail(path: Path, cursor: dict) -> dict:
+    """Cursor totals plus any incomplete last line past the cursor offset."""
+    if cursor["offset"] >= cursor["size"]:
+        return cursor["totals"]
+    totals = dict(cursor["totals"])
+    with open(path, "rb") as f:
+        f.seek(cursor["offset"])
+        _add_line(totals, f.read(cursor["size"] - cursor["offset"]))
+    return totals
+
+
+def _columns_match(path: Path, cursor: dict) -> bool:
+    """True if the column file holds exactly the cursor's committed records."""
+    try:
+        size = columns_path(path).stat().st_size
+    except OSError:
+        return False
+    return size == cursor["totals"]["messages"] * RECORD_BYTES
+
+
+def _load_scan_cache(cache_path: Path) -> dict:
+    if not cache_path.exists():
+        return {}
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return {}
+    if data.get("version") != SCAN_CACHE_VERSION:
+        return {}
+    return data.get("files", {})
+
+
+def _save_scan_cache(cache_path: Path, cursors: dict) -> None:
+    """Write the cursors atomically, dropping transcripts that no longer exist."""
+    for key in [k for k in cursors if not os.path.exists(k)]:
+        del cursors[key]
+        columns_path(Path(key)).unlink(missing_ok=True)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    with file_lock(cache_path):
+        tmp_path = cache_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": SCAN_CACHE_VERSION, "files": cursors}, f)
+        os.replace(tmp_path, cache_path)
 
 
 def _parse_jsonl(path: Path, session_id: str) -> dict:
     """Parse a JSONL transcript and extract token usage."""
-    total_input = 0
-    total_output = 0
-    total_cache_create = 0
-    total_cache_read = 0
-    total_cost = 0.0
-    models = set()
-    msg_count = 0
-    first_ts = None
-    last_ts = None
-
-    with open(path, "r", encoding="utf-8") as f:
+    totals = _new_totals()
+    with open(path, "rb") as f:
         for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                msg = json.loads(line)
-            except json.JSONDecodeError:
-                continue
+            _add_line(totals, line)
+    return _session_result(session_id, totals)
 
-            # Track timestamps
-            ts = msg.get("timestamp")
-            if ts:
-                if first_ts is None:
-                    first_ts = ts
-                last_ts = ts
 
-            # Usage can be at top level or nested under message.usage
-            usage = msg.get("usage")
-            inner = msg.get("message", {})
-            if not usage and isinstance(inner, dict):
-                usage = inner.get("usage")
+def _new_totals() -> dict:
+    return {
+        "input": 0,
+        "output": 0,
+        "cache_create": 0,
+        "cache_read": 0,
+        "cost": 0.0,
+        "models": [],
+        "messages": 0,
+        "first_ts": None,
+        "last_ts": None,
+    }
 
-            if not usage:
-                continue
 
-            msg_count += 1
+def _add_line(totals: dict, line: bytes) -> tuple | None:
+    """Fold one transcript line into running totals (in place).
+
+    Returns the message's column record (see RECORD_FIELDS), or None if
+    the line carries no usage.
+    """
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        msg = json.loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    if not isinstance(msg, dict):
+        return None
+
+    # Track timestamps
+    ts = msg.get("timestamp")
+    if ts:
+        if totals["first_ts"] is None:
+            totals["first_ts"] = ts
+        totals["last_ts"] = ts
+
+    # Usage can be at top level or nested under message.usage
+    usage = msg.get("usage")
+    inner = msg.get("message", {})
+    if not usage and isinstance(inner, dict):
+        usage = inner.get("usage")
+
+    if not usage:
+        return None
+
+    totals["messages"] += 1
 
-            # Model can be at top level or nested under message.model
-            model = msg.get("model", "") or inner.get("model", "")
-            if model:
-                models.add(model)
+    # Model can be at top level or nested under message.model
+    model = msg.get("model", "") or (inner.get("model", "") if isinstance(inner, dict) else "")
+    if model and model not in totals["models"]:
+        totals["models"] = totals["models"] + [model]
 
-            inp = usage.get("input_tokens", 0)
-            out = usage.get("output_tokens", 0)
-            cc = usage.get("cache_creation_input_tokens", 0)
-            cr = usage.get("cache_read_input_tokens", 0)
+    inp = usage.get("input_tokens", 0)
+    out = usage.get("output_tokens", 0)
+    cc = usage.get("cache_creation_input_tokens", 0)
+    cr = usage.get("cache_read_input_tokens", 0)
 
-            total_input += inp
-            total_output += out
-            total_cache_create += cc
-            total_cache_read += cr
-            total_cost += _calc_message_cost(usage, model)
+    totals["input"] += inp
+    totals["output"] += out
+    totals["cache_create"] += cc
+    totals["cache_read"] += cr
+    totals["cost"] += _calc_message_cost(usage, model)
 
+    model_idx = totals["models"].index(model) if model else -1
+    return (_epoch_seconds(ts), model_idx, inp, out, cc, cr)
+
+
+def _epoch_seconds(ts) -> int:
+    """ISO-8601 transcript timestamp → UTC epoch seconds (-1 if missing/invalid)."""
+    if not isinstance(ts, str) or not ts:
+        return -1
+    try:
+        dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+    except ValueError:
+        return -1
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+def _session_result(session_id: str, totals: dict) -> dict:
+    """Shape running totals as the session dict returned by the readers."""
     return {
         "session_id": session_id,
-        "total_cost_usd": round(total_cost, 2),
-        "input_tokens": total_input,
-        "output_tokens": total_output,
-        "cache_create_tokens": total_cache_create,
-        "cache_read_tokens": total_cache_read,
-        "total_tokens": total_input + total_output + total_cache_create + total_cache_read,
-        "models_used": sorted(models),
-        "message_count": msg_count,
-        "first_activity": first_ts,
-        "last_activity": last_ts,
+        "total_cost_usd": round(totals["cost"], 2),
+        "input_tokens": totals["input"],
+        "output_tokens": totals["output"],
+        "cache_create_tokens": totals["cache_create"],
+        "cache_read_tokens": totals["cache_read"],
+        "total_tokens": (totals["input"] + totals["output"]
+                         + totals["cache_create"] + totals["cache_read"]),
+        "models_used": sorted(totals["models"]),
+        "message_count": totals["messages"],
+        "first_activity": totals["first_ts"],
+        "last_activity": totals["last_ts"],
     }
 
 
@@ -245,9 +472,10 @@ def log_session(
     description: str,
     session_id: str = "",
     tokens: int = 0,
+    model: str = "",
     details: dict | None = None,
 ) -> dict:
-    """Append a session cost entry to the project's cost_log.json.
+    """Record a session cost entry in the project's telemetry store.
 
     Called by Claude during conversation after completing work on a project.
 
@@ -257,6 +485,7 @@ def log_session(
         description: What was done (e.g. "Generated breakdown + pushed to ADO")
         session_id: Claude Code session ID (optional)
         tokens: Total tokens used (optional)
+        model: Main model used (optional, for the per-model rollup)
         details: Extra metadata (optional)
 
     Returns:
@@ -269,22 +498,19 @@ def log_session(
         "description": description,
         "cost_usd": round(cost_usd, 2),
         "tokens": tokens,
+        "model": model,
         "details": details or {},
     }
 
-    log_path = get_output_path(proj, COST_LOG_FILE)
-    entries = _load_cost_log(log_path)
-    entries.append(entry)
-
-    log_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(log_path, "w", encoding="utf-8") as f:
-        json.dump(entries, f, indent=2)
-
+    telemetry_store(proj).record_session(entry)
     return entry
 
 
-def get_cost_summary(proj: dict) -> dict:
-    """Read cost_log.json and return aggregated stats.
+def get_cost_summary(proj: dict, recent: int | None = None) -> dict:
+    """Return aggregated cost stats (read from the telemetry rollups).
+
+    Args:
+        recent: only return the latest `recent` entries (default: all)
 
     Returns:
         {
@@ -292,46 +518,10 @@ def get_cost_summary(proj: dict) -> dict:
             "total_cost_usd": float,
             "total_tokens": int,
             "entries": list[dict],
+            "by_day": {"2026-02-14": {"sessions": int, "cost": float, "tokens": int}, ...},
+            "by_model": {model: {"sessions": int, "cost": float, "tokens": int}, ...},
             "first_date": str | None,
             "last_date": str | None,
         }
     """
-    log_path = get_output_path(proj, COST_LOG_FILE)
-    entries = _load_cost_log(log_path)
-
-    if not entries:
-        return {
-            "total_sessions": 0,
-            "total_cost_usd": 0.0,
-            "total_tokens": 0,
-            "entries": [],
-            "first_date": None,
-            "last_date": None,
-        }
-
-    total_cost = sum(e.get("cost_usd", 0) for e in entries)
-    total_tokens = sum(e.get("tokens", 0) for e in entries)
-    dates = [e.get("date", "") for e in entries if e.get("date")]
-
-    return {
-        "total_sessions": len(entries),
-        "total_cost_usd": round(total_cost, 2),
-        "total_tokens": total_tokens,
-        "entries": entries,
-        "first_date": min(dates) if dates else None,
-        "last_date": max(dates) if dates else None,
-    }
-
-
-def _load_cost_log(path: Path) -> list[dict]:
-    """Load cost log entries from JSON file."""
-    if not path.exists():
-        return []
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        if isinstance(data, list):
-            return data
-    except (json.JSONDecodeError, OSError):
-        pass
-    return []
+    return telemetry_store(proj).session_summary(recent)
@@ -0,0 +1,172 @@
+"""Columnar cost analytics over Claude Code session transcripts.
+
+The incremental scan in core.cost keeps, next to each transcript's cursor,
+a column file of per-message usage records (timestamp, model, four token
+classes). load_columns() concatenates those into one MessageColumns —
+parallel array("q") columns plus model and session lookup tables — so a
+breakdown never re-decodes transcript JSON; only newly appended lines are
+parsed by the scan that refreshes the files.
+
+Pricing is resolved once per distinct model string rather than per
+message, and group_by() aggregates a whole column per pass over integer
+group codes (day number, model index or session index).
+
+A last line still being written isn't in the columns until a later scan
+sees it completed, so totals can trail `xproject cost --scan` by one message.
+"""
+
+from array import array
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+
+from core.cost import (
+    RECORD_FIELDS,
+    columns_path,
+    match_model,
+    scan_transcripts,
+    workspace_transcripts,
+)
+
+GROUP_KEYS = ("day", "model", "session")
+TOKEN_CLASSES = ("input", "output", "cache_create", "cache_read")
+UNKNOWN = "unknown"  # label for messages without a model / timestamp
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def _int_column() -> array:
+    return array("q")
+
+
+@dataclass
+class MessageColumns:
+    """Per-message usage records, one array per field (all the same length)."""
+    timestamp: array = field(default_factory=_int_column)     # epoch seconds, -1 if unknown
+    model: array = field(default_factory=_int_column)         # index into models, -1 if unknown
+    session: array = field(default_factory=_int_column)       # index into sessions
+    input: array = field(default_factory=_int_column)
+    output: array = field(default_factory=_int_column)
+    cache_create: array = field(default_factory=_int_column)
+    cache_read: array = field(default_factory=_int_column)
+    models: list[str] = field(default_factory=list)
+    sessions: list[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def costs(self) -> array:
+        """USD cost of each message (pricing looked up once per model)."""
+        # Index -1 (no model) picks the trailing default-pricing entry
+        rates = [_per_token_rates(m) for m in self.models] + [_per_token_rates("")]
+        costs = array("d")
+        costs.extend(
+            i * r[0] + o * r[1] + cc * r[2] + cr * r[3]
+            for r, i, o, cc, cr in zip(map(rates.__getitem__, self.model), self.input,
+                                       self.output, self.cache_create, self.cache_read)
+        )
+        return costs
+
+    def group_by(self, key: str, costs: array | None = None) -> dict:
+        """Aggregate messages by "day", "model" or "session".
+
+        Args:
+            key: one of GROUP_KEYS
+            costs: precomputed costs() to reuse across several group-bys
+
+        Returns:
+            {label: {"messages": int, "cost": float, "input": int, "output": int,
+                     "cache_create": int, "cache_read": int, "tokens": int}, ...}
+            ordered by label (ISO dates for days; messages without a
+            timestamp or model are grouped under "unknown").
+        """
+        if key not in GROUP_KEYS:
+            raise ValueError(f"Unknown group key '{key}' (expected one of {', '.join(GROUP_KEYS)})")
+        if costs is None:
+            costs = self.costs()
+
+        if key == "day":
+            codes = [ts // 86400 if ts >= 0 else -1 for ts in self.timestamp]
+        else:
+            codes = self.model if key == "model" else self.session
+        distinct = sorted(set(codes))
+        slot = {code: pos for pos, code in enumerate(distinct)}
+        groups = array("q", map(slot.__getitem__, codes))
+
+        sums = {"messages": _sum_by(groups, None, len(distinct)),
+                "cost": _sum_by(groups, costs, len(distinct), 0.0)}
+        for name in TOKEN_CLASSES:
+            sums[name] = _sum_by(groups, getattr(self, name), len(distinct))
+
+        result = {}
+        for pos, code in enumerate(distinct):
+            row = {name: values[pos] for name, values in sums.items()}
+            row["cost"] = round(row["cost"], 2)
+            row["tokens"] = sum(row[name] for name in TOKEN_CLASSES)
+            result[self._label(key, code)] = row
+        if key != "day":
+            result = dict(sorted(result.items()))
+        return result
+
+    def _label(self, key: str, code: int) -> str:
+        if code < 0:
+            return UNKNOWN
+        if key == "day":
+            return date.fromordinal(_EPOCH_ORDINAL + code).isoformat()
+        if key == "model":
+            return self.models[code]
+        return self.sessions[code]
+
+
+def load_columns(paths: list[Path] | None = None) -> MessageColumns:
+    """Per-message usage for transcripts (default: this workspace's sessions).
+
+    Cursors and column files are brought up to date first, which only
+    parses lines appended since the last scan.
+    """
+    if paths is None:
+        paths = workspace_transcripts()
+    cols = MessageColumns()
+    model_index: dict[str, int] = {}
+
+    for path, totals in zip(paths, scan_transcripts(paths, include_tail=False)):
+        count = totals["messages"]
+        if not count:
+            continue
+        raw = array("q")
+        with open(columns_path(path), "rb") as f:
+            raw.fromfile(f, count * RECORD_FIELDS)
+
+        # File-local model indexes → indexes into cols.models
+        remap = [model_index.setdefault(m, len(model_index)) for m in totals["models"]]
+        remap.append(-1)  # local -1 (no model) stays -1
+
+        cols.timestamp.extend(raw[0::RECORD_FIELDS])
+        cols.model.extend(map(remap.__getitem__, raw[1::RECORD_FIELDS]))
+        cols.session.extend(array("q", [len(cols.sessions)]) * count)
+        cols.input.extend(raw[2::RECORD_FIELDS])
+        cols.output.extend(raw[3::RECORD_FIELDS])
+        cols.cache_create.extend(raw[4::RECORD_FIELDS])
+        cols.cache_read.extend(raw[5::RECORD_FIELDS])
+        cols.sessions.append(path.stem)
+
+    cols.models = list(model_index)
+    return cols
+
+
+def _per_token_rates(model: str) -> tuple[float, float, float, float]:
+    """(input, output, cache_create, cache_read) USD per token for a model string."""
+    pricing = match_model(model)
+    return tuple(pricing[name] / 1_000_000 for name in TOKEN_CLASSES)
+
+
+def _sum_by(groups: array, values, size: int, zero=0) -> list:
+    """Sum `values` per group code (counts rows when values is None)."""
+    acc = [zero] * size
+    if values is None:
+        for g in groups:
+            acc[g] += 1
+    else:
+        for g, v in zip(groups, values):
+            acc[g] += v
+    return acc
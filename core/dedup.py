@@ -0,0 +1,243 @@
+"""Near-duplicate detection for parsed requirements (MinHash + LSH).
+
+Large RFP bundles repeat themselves: the same spec as PDF and DOCX, email
+threads quoting each other in full. find_duplicates() computes a MinHash
+signature for every paragraph (word 5-gram shingles) and, from those, for
+every file — a file's signature is the element-wise minimum of its
+paragraphs' signatures. LSH banding finds candidate pairs without
+comparing everything against everything; candidates are confirmed when
+their estimated Jaccard similarity reaches the threshold.
+
+Files are visited in the order given, so the first copy of anything is
+the canonical one and later copies are flagged as duplicates of it.
+
+Signatures depend only on a file's text, so text_signatures() results are
+cached by content hash in output/.parse_cache/minhash/ (SignatureCache):
+a re-ingest only computes MinHash for new or changed text, and
+find_duplicates() consumes (filename, signatures) pairs one at a time, so
+no file's text has to stay in memory.
+"""
+
+import hashlib
+import json
+import os
+import random
+import re
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from core.config import get_output_path
+from core.parse_cache import CACHE_DIR
+
+NUM_PERM = 64           # signature length
+LSH_BANDS = 16          # 16 bands × 4 rows → candidates from ~50% similarity
+SHINGLE_WORDS = 5
+MIN_PARAGRAPH_WORDS = 8   # shorter paragraphs (headings, sign-offs) are never flagged
+FILE_THRESHOLD = 0.8
+PARAGRAPH_THRESHOLD = 0.8
+SIGNATURE_CACHE_DIR = "minhash"  # inside the parse cache directory
+SIGNATURE_CACHE_VERSION = 1      # bump when signatures or the settings above change
+
+# Fixed XOR masks over a 64-bit shingle hash stand in for NUM_PERM hash
+# permutations; seeded so signatures are stable across runs
+_MASKS = [random.Random(0x5EED + i).getrandbits(64) for i in range(NUM_PERM)]
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass
+class DuplicateReport:
+    """Result of find_duplicates()."""
+    # filename → {"file": canonical filename, "similarity": estimated Jaccard}
+    files: dict = field(default_factory=dict)
+    # filename → [{"paragraph": i, "file": canonical filename, "of": j, "tokens": n}]
+    paragraphs: dict = field(default_factory=dict)
+    # filename → estimated tokens a reader skips in the deduplicated view
+    tokens_saved: dict = field(default_factory=dict)
+
+
+@dataclass
+class TextSignatures:
+    """Everything find_duplicates() needs from one file's text."""
+    paragraphs: list        # MinHash signature per paragraph (None: no words)
+    paragraph_words: list   # word count per paragraph
+    paragraph_tokens: list  # estimated tokens per paragraph
+    tokens: int             # estimated tokens of the whole text
+
+
+def split_paragraphs(text: str) -> list[str]:
+    """Non-empty, stripped blank-line separated paragraphs."""
+    return [p.strip() for p in re.split(r"\n\s*\n", text) if p.strip()]
+
+
+def signature(text: str) -> tuple[int, ...] | None:
+    """MinHash signature of a text's word 5-gram shingles; None if it has no words."""
+    words = _WORD_RE.findall(text.lower())
+    if not words:
+        return None
+    if len(words) < SHINGLE_WORDS:
+        shingles = {" ".join(words)}
+    else:
+        shingles = {" ".join(words[i:i + SHINGLE_WORDS])
+                    for i in range(len(words) - SHINGLE_WORDS + 1)}
+    hashes = [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big")
+              for s in shingles]
+    return tuple(min(map(mask.__xor__, hashes)) for mask in _MASKS)
+
+
+def similarity(a: tuple[int, ...], b: tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+
+def text_signatures(text: str) -> TextSignatures:
+    """Paragraph signatures and sizes of a text (see find_duplicates)."""
+    paras = split_paragraphs(text)
+    return TextSignatures(
+        paragraphs=[signature(p) for p in paras],
+        paragraph_words=[len(_WORD_RE.findall(p)) for p in paras],
+        paragraph_tokens=[len(p) // 4 for p in paras],
+        tokens=len(text.strip()) // 4,
+    )
+
+
+def find_duplicates(files: Iterable[tuple[str, TextSignatures]],
+                    file_threshold: float = FILE_THRESHOLD,
+                    paragraph_threshold: float = PARAGRAPH_THRESHOLD) -> DuplicateReport:
+    """Flag near-duplicate files and paragraphs in (filename, signatures) pairs.
+
+    A file that near-duplicates an earlier one counts as saved in full;
+    otherwise only its duplicate paragraphs do.
+    """
+    report = DuplicateReport()
+    file_index = _LSHIndex()
+    para_index = _LSHIndex()
+
+    for filename, sigs in files:
+        present = [s for s in sigs.paragraphs if s is not None]
+        if not present:
+            continue
+        file_sig = tuple(map(min, zip(*present)))
+
+        match = file_index.best_match(file_sig, file_threshold)
+        if match:
+            report.files[filename] = {"file": match[0], "similarity": round(match[1], 3)}
+            report.tokens_saved[filename] = sigs.tokens
+        file_index.add(filename, file_sig)
+
+        flagged = []
+        for i, (sig, words, tokens) in enumerate(zip(sigs.paragraphs, sigs.paragraph_words,
+                                                     sigs.paragraph_tokens)):
+            if sig is None or words < MIN_PARAGRAPH_WORDS:
+                continue
+            match = para_index.best_match(sig, paragraph_threshold)
+            if match:
+                (src_file, src_para), _ = match
+                flagged.append({"paragraph": i, "file": src_file, "of": src_para,
+                                "tokens": tokens})
+            else:
+                para_index.add((filename, i), sig)
+        if flagged:
+            report.paragraphs[filename] = flagged
+            report.tokens_saved.setdefault(filename, sum(f["tokens"] for f in flagged))
+
+    return report
+
+
+def deduplicated_text(filename: str, text: str, report: DuplicateReport) -> str:
+    """Text of a file with duplicate content replaced by short references."""
+    dup = report.files.get(filename)
+    if dup:
+        return (f"[near-duplicate of {dup['file']} "
+                f"(~{dup['similarity']:.0%} similar) — see that file]")
+    flagged = {f["paragraph"]: f for f in report.paragraphs.get(filename, [])}
+    if not flagged:
+        return text.strip()
+    out = []
+    for i, para in enumerate(split_paragraphs(text)):
+        if i in flagged:
+            ref = flagged[i]
+            where = "above" if ref["file"] == filename else f"in {ref['file']}"
+            out.append(f"[duplicate of paragraph {ref['of'] + 1} {where}]")
+        else:
+            out.append(para)
+    return "\n\n".join(out)
+
+
+def signature_cache(proj: dict) -> "SignatureCache":
+    """Return the MinHash signature cache for a project (output/.parse_cache/minhash/)."""
+    return SignatureCache(get_output_path(proj, CACHE_DIR) / SIGNATURE_CACHE_DIR)
+
+
+class SignatureCache:
+    """TextSignatures stored per content hash, one JSON file each."""
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+        self.hits = 0
+        self.misses = 0
+        self._seen: set[str] = set()
+
+    def get(self, content_hash: str) -> TextSignatures | None:
+        self._seen.add(content_hash)
+        try:
+            with open(self.cache_dir / f"{content_hash}.json", "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self.misses += 1
+            return None
+        if data.pop("version", None) != SIGNATURE_CACHE_VERSION:
+            self.misses += 1
+            return None
+        data["paragraphs"] = [tuple(s) if s is not None else None for s in data["paragraphs"]]
+        self.hits += 1
+        return TextSignatures(**data)
+
+    def put(self, content_hash: str, sigs: TextSignatures) -> None:
+        self._seen.add(content_hash)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.cache_dir / f"{content_hash}.json"
+        tmp_path = path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": SIGNATURE_CACHE_VERSION, **asdict(sigs)}, f)
+        os.replace(tmp_path, path)
+
+    def prune(self) -> None:
+        """Drop entries for content not looked up or stored this run."""
+        if not self.cache_dir.exists():
+            return
+        for path in self.cache_dir.glob("*.json"):
+            if path.stem not in self._seen:
+                path.unlink()
+
+
+class _LSHIndex:
+    """Banded LSH buckets over signatures, with exact-signature confirmation."""
+
+    def __init__(self):
+        self.rows = NUM_PERM // LSH_BANDS
+        self.buckets: dict[tuple, list] = {}
+        self.sigs: dict = {}
+
+    def add(self, key, sig: tuple[int, ...]) -> None:
+        self.sigs[key] = sig
+        for band in self._bands(sig):
+            self.buckets.setdefault(band, []).append(key)
+
+    def best_match(self, sig: tuple[int, ...], threshold: float):
+        """(key, similarity) of the most similar indexed signature at/above threshold."""
+        best = None
+        seen = set()
+        for band in self._bands(sig):
+            for key in self.buckets.get(band, ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                sim = similarity(sig, self.sigs[key])
+                if sim >= threshold and (best is None or sim > best[1]):
+                    best = (key, sim)
+        return best
+
+    def _bands(self, sig: tuple[int, ...]):
+        for b in range(LSH_BANDS):
+            yield (b, sig[b * self.rows:(b + 1) * self.rows])
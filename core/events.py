@@ -1,40 +1,109 @@
 """Lightweight event logging for the xproject pipeline.
 
-Appends timestamped events to projects/<Name>/output/events.json.
-The viewer app reads this file to render the project timeline.
+Events are appended to the events table of the project's telemetry store
+(core.telemetry, output/telemetry.sqlite), so an append costs the same on
+day 300 as on day 1 and concurrent commands can't drop each other's
+events. An events.jsonl / events.json from before the store existed is
+imported on first use.
+
+The viewer still reads output/events.json (getTimeline). append_event()
+keeps that file in step by splicing each new event in before its closing
+bracket, under an advisory file lock (core.filelock); export_events_json()
+rebuilds it from the store whenever it is missing or unreadable.
 """
 
 import json
+import os
 from datetime import datetime, timezone
 from pathlib import Path
 
 from core.config import get_output_path
+from core.filelock import file_lock
+from core.telemetry import telemetry_store
+
+EVENTS_EXPORT = "events.json"
 
 
 def append_event(proj: dict, event_type: str, **data) -> None:
-    """Append an event to the project's events.json.
+    """Append an event to the project's event log.
 
     Args:
         proj: project config dict (from load_project)
         event_type: e.g. "files_ingested", "overview_generated", "pushed_to_ado"
         **data: arbitrary key-value pairs stored in the event's "data" field
     """
-    events_path = get_output_path(proj, "events.json")
-
-    events = []
-    if events_path.exists():
-        try:
-            with open(events_path, "r", encoding="utf-8") as f:
-                events = json.load(f)
-        except (json.JSONDecodeError, ValueError):
-            events = []
-
-    events.append({
+    event = {
         "type": event_type,
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "data": data,
-    })
+    }
+    store = telemetry_store(proj)
+    store.record_event(event)
+
+    export_path = get_output_path(proj, EVENTS_EXPORT)
+    with file_lock(export_path):
+        if not _splice_export(export_path, event):
+            _write_export(export_path, store.events())
+
+
+def read_events(proj: dict, start: int = 0, stop: int | None = None) -> list[dict]:
+    """Return events[start:stop], oldest first (no negative indexes)."""
+    return telemetry_store(proj).events(start, stop)
+
+
+def tail_events(proj: dict, n: int = 20) -> list[dict]:
+    """Return the last `n` events, oldest first."""
+    if n <= 0:
+        return []
+    return telemetry_store(proj).tail_events(n)
+
+
+def export_events_json(proj: dict) -> Path:
+    """Rebuild output/events.json (the viewer's timeline) from the event log."""
+    export_path = get_output_path(proj, EVENTS_EXPORT)
+    store = telemetry_store(proj)
+    with file_lock(export_path):
+        _write_export(export_path, store.events())
+    return export_path
+
+
+# --- Internal helpers ---
+
+def _splice_export(export_path: Path, event: dict) -> bool:
+    """Insert one event before the closing "]" of events.json (lock held).
+
+    Returns False if the file is missing or doesn't end like a JSON array,
+    in which case the caller rebuilds it.
+    """
+    if not export_path.exists():
+        return False
+    with open(export_path, "rb+") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        tail_len = min(size, 64)
+        f.seek(size - tail_len)
+        tail = f.read(tail_len)
+        stripped = tail.rstrip()
+        if not stripped.endswith(b"]"):
+            return False
+        before = stripped[:-1].rstrip()
+        insert_at = size - tail_len + len(before)
+        if before.endswith(b"["):
+            sep = b"\n  "  # empty array
+        elif before.endswith(b"}"):
+            sep = b",\n  "
+        else:
+            return False
+        f.seek(insert_at)
+        f.write(sep + json.dumps(event).encode("utf-8") + b"\n]")
+        f.truncate()
+    return True
+
 
-    events_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(events_path, "w", encoding="utf-8") as f:
+def _write_export(export_path: Path, events: list[dict]) -> None:
+    """Write events.json atomically (lock held)."""
+    export_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = export_path.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
         json.dump(events, f, indent=2)
+    os.replace(tmp_path, export_path)
@@ -0,0 +1,42 @@
+"""Advisory inter-process file locks.
+
+file_lock(path) holds an exclusive lock on a sidecar "<path>.lock" file
+for the duration of a with-block, so commands running at the same time
+(the CLI, the MCP server, the viewer's helpers) serialize their writes to
+`path`. The lock is advisory: only code that also takes it is excluded.
+A sidecar is used rather than `path` itself so the protected file can be
+replaced atomically (temp file + rename) while the lock is held.
+"""
+
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+@contextmanager
+def file_lock(path: Path):
+    """Hold an exclusive advisory lock for `path` (blocks until acquired)."""
+    lock_path = Path(str(path) + ".lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    finally:
+        os.close(fd)
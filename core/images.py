@@ -0,0 +1,304 @@
+"""Shared image pipeline for Claude vision — normalized, size-capped, cached.
+
+Every image sent to Claude (dropped requirement images, Figma screenshots)
+goes through normalize_image(): downsized so its longest side is at most
+`max_edge` and re-encoded as JPEG or WebP at `quality`. Results are cached
+in output/image_cache/ under the source's content hash plus the settings,
+so the same source is never re-encoded. Ingest only records image paths;
+bytes are base64-encoded when a context is actually built.
+
+Settings come from project.yaml (all optional):
+    images:
+      max_edge: 1568    # px
+      format: jpeg      # jpeg | webp | png (png keeps lossless output)
+      quality: 85
+
+Near-duplicates (the same mockup sent twice under different names, Figma
+frame variants) are collapsed by group_duplicates(): a 64-bit dHash per
+image, cached in output/image_cache/dhash_index.json by content hash, and
+images within DHASH_THRESHOLD bits of a group's first image join it.
+
+Resizing, re-encoding and dHash need Pillow (pip install pillow); without
+it the original file is used as-is and only byte-identical images are
+treated as duplicates.
+"""
+
+import base64
+import hashlib
+import io
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+IMAGE_MAX_EDGE = 1568  # px — longest side Claude vision uses without downscaling
+IMAGE_FORMAT = "jpeg"
+IMAGE_QUALITY = 85
+RENDITION_DIR = "image_cache"
+DHASH_INDEX = "dhash_index.json"
+DHASH_THRESHOLD = 6  # max differing bits (of 64) between near-duplicates
+RENDITION_VERSION = 2  # bump when the normalizer's output changes — invalidates cached renditions
+
+MEDIA_TYPES = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+}
+_FORMATS = {  # format setting → (Pillow format, extension, media type)
+    "jpeg": ("JPEG", ".jpg", "image/jpeg"),
+    "webp": ("WEBP", ".webp", "image/webp"),
+    "png": ("PNG", ".png", "image/png"),
+}
+
+
+@dataclass
+class NormalizedImage:
+    """A normalized rendition of a source image."""
+    path: Path
+    media_type: str
+    source_hash: str
+    original_bytes: int
+    normalized_bytes: int
+
+
+def media_type_for(path: Path) -> str:
+    """MIME type for an image file, from its extension."""
+    return MEDIA_TYPES.get(Path(path).suffix.lower(), "image/png")
+
+
+def image_settings(proj: dict) -> dict:
+    """Normalizer settings from project.yaml's optional `images` section."""
+    cfg = proj.get("images", {}) or {}
+    fmt = str(cfg.get("format", IMAGE_FORMAT)).lower()
+    return {
+        "max_edge": int(cfg.get("max_edge", IMAGE_MAX_EDGE)),
+        "fmt": fmt if fmt in _FORMATS else IMAGE_FORMAT,
+        "quality": int(cfg.get("quality", IMAGE_QUALITY)),
+    }
+
+
+def normalize_image(src: Path, cache_dir: Path, max_edge: int = IMAGE_MAX_EDGE,
+                    fmt: str = IMAGE_FORMAT, quality: int = IMAGE_QUALITY) -> NormalizedImage:
+    """Return the cached normalized rendition of `src`, creating it if needed.
+
+    The cache key is the sha256 of the source bytes plus the settings
+    (and RENDITION_VERSION). If the
+    source already fits within `max_edge` in the target format and
+    re-encoding would not make it smaller (or Pillow is missing), the
+    rendition is a copy of the original.
+    """
+    src = Path(src)
+    cache_dir = Path(cache_dir)
+    raw = src.read_bytes()
+    digest = hashlib.sha256(raw).hexdigest()[:16]
+    pil_format, ext, media_type = _FORMATS[fmt]
+    stem = f"{digest}-v{RENDITION_VERSION}-{max_edge}-{fmt}{quality}"
+
+    for candidate_ext, candidate_type in ((ext, media_type), (src.suffix.lower(), media_type_for(src))):
+        cached = cache_dir / f"{stem}{candidate_ext}"
+        if cached.exists():
+            return NormalizedImage(cached, candidate_type, digest, len(raw), cached.stat().st_size)
+
+    encoded = _reencode(raw, max_edge, pil_format, quality)
+    if encoded is None or (encoded[1] and len(encoded[0]) >= len(raw)):
+        data, ext, media_type = raw, src.suffix.lower(), media_type_for(src)
+    else:
+        data = encoded[0]
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    out_path = cache_dir / f"{stem}{ext}"
+    tmp_path = out_path.with_name(out_path.name + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, out_path)
+    return NormalizedImage(out_path, media_type, digest, len(raw), len(data))
+
+
+def encode_image_block(path: Path, cache_dir: Path | None = None,
+                       settings: dict | None = None) -> dict:
+    """Build a Claude vision content block from a normalized rendition of an image.
+
+    Without `cache_dir` the original file is encoded unchanged.
+    """
+    if cache_dir is not None:
+        norm = normalize_image(path, cache_dir, **(settings or {}))
+        data, media_type = norm.path.read_bytes(), norm.media_type
+    else:
+        data, media_type = Path(path).read_bytes(), media_type_for(path)
+    return {
+        "type": "image",
+        "source": {
+            "type": "base64",
+            "media_type": media_type,
+            "data": base64.b64encode(data).decode("ascii"),
+        },
+    }
+
+
+def normalize_screens(screens: list[dict], cache_dir: Path, settings: dict) -> dict:
+    """Normalize Figma screenshots in place for a validate/enrich bundle.
+
+    Each screen's screenshot_path is pointed at the normalized rendition;
+    the downloaded file is kept as original_path. Returns byte totals
+    {"original_bytes": n, "normalized_bytes": n}.
+    """
+    totals = {"original_bytes": 0, "normalized_bytes": 0}
+    for screen in screens:
+        src = Path(screen.get("original_path") or screen["screenshot_path"])
+        try:
+            norm = normalize_image(src, cache_dir, **settings)
+        except OSError:
+            continue
+        screen.update(
+            original_path=str(src),
+            screenshot_path=str(norm.path),
+            media_type=norm.media_type,
+            original_bytes=norm.original_bytes,
+            normalized_bytes=norm.normalized_bytes,
+        )
+        totals["original_bytes"] += norm.original_bytes
+        totals["normalized_bytes"] += norm.normalized_bytes
+    return totals
+
+
+def group_duplicates(paths: list[Path], cache_dir: Path,
+                     threshold: int = DHASH_THRESHOLD) -> list[list[Path]]:
+    """Group images that are exact or near-duplicates of each other.
+
+    Returns groups in input order; each group starts with its canonical
+    image (the first one seen) followed by its aliases. Unreadable files
+    form groups of their own.
+    """
+    index_path = Path(cache_dir) / DHASH_INDEX
+    index = _load_json(index_path)
+    dirty = False
+
+    groups: list[list[Path]] = []
+    keys: list[tuple[str, int | None]] = []  # (content hash, dHash) of each group's canonical
+    for path in paths:
+        path = Path(path)
+        try:
+            raw = path.read_bytes()
+        except OSError:
+            groups.append([path])
+            keys.append(("", None))
+            continue
+        digest = hashlib.sha256(raw).hexdigest()[:16]
+        if digest not in index:
+            dh = _dhash(raw)
+            index[digest] = f"{dh:016x}" if dh is not None else None
+            dirty = True
+        dh = int(index[digest], 16) if index[digest] else None
+
+        for group, (g_digest, g_dh) in zip(groups, keys):
+            if digest == g_digest or (
+                dh is not None and g_dh is not None and bin(dh ^ g_dh).count("1") <= threshold
+            ):
+                group.append(path)
+                break
+        else:
+            groups.append([path])
+            keys.append((digest, dh))
+
+    if dirty:
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = index_path.with_name(index_path.name + ".tmp")
+        tmp_path.write_text(json.dumps(index, indent=2), encoding="utf-8")
+        os.replace(tmp_path, index_path)
+    return groups
+
+
+def dedupe_screens(screens: list[dict], cache_dir: Path) -> list[dict]:
+    """Collapse duplicate Figma screenshots for a validate/enrich bundle.
+
+    Returns the canonical screens only; each carries an "aliases" list of
+    the {name, node_id, page} of screens whose screenshot duplicated it.
+    """
+    by_path = {}
+    for screen in screens:
+        by_path.setdefault(str(Path(screen["screenshot_path"])), []).append(screen)
+    groups = group_duplicates(list(by_path), cache_dir)
+
+    canonical = []
+    for group in groups:
+        members = [s for path in group for s in by_path[str(path)]]
+        first = members[0]
+        first["aliases"] = [
+            {"name": s.get("name", ""), "node_id": s.get("node_id", ""), "page": s.get("page", "")}
+            for s in members[1:]
+        ]
+        canonical.append(first)
+    return canonical
+
+
+def human_bytes(n: int) -> str:
+    """Convert a byte count to human-readable."""
+    if n < 1024 * 1024:
+        return f"{n/1024:.1f} KB"
+    return f"{n/(1024*1024):.1f} MB"
+
+
+def _dhash(raw: bytes) -> int | None:
+    """64-bit difference hash of image bytes; None if Pillow is missing or fails."""
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+
+    try:
+        with Image.open(io.BytesIO(raw)) as img:
+            img.seek(0)
+            small = img.convert("L").resize((9, 8), Image.LANCZOS)
+        pixels = list(small.getdata())
+    except Exception:
+        return None
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            left, right = pixels[row * 9 + col], pixels[row * 9 + col + 1]
+            bits = (bits << 1) | (left > right)
+    return bits
+
+
+def _load_json(path: Path) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _reencode(raw: bytes, max_edge: int, pil_format: str,
+              quality: int) -> tuple[bytes, bool] | None:
+    """Downsize and re-encode image bytes; None if Pillow is missing or fails.
+
+    Returns (encoded bytes, whether the source already fit within
+    `max_edge` in `pil_format`).
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+
+    try:
+        with Image.open(io.BytesIO(raw)) as img:
+            img.seek(0)  # first frame of animated GIF/WebP
+            fits = img.format == pil_format and max(img.size) <= max_edge
+            img = img.copy()
+        if max(img.size) > max_edge:
+            img.thumbnail((max_edge, max_edge), Image.LANCZOS)
+        if pil_format == "JPEG" and img.mode != "RGB":
+            # JPEG has no alpha — flatten onto white like a browser would
+            rgba = img.convert("RGBA")
+            flat = Image.new("RGB", rgba.size, (255, 255, 255))
+            flat.paste(rgba, mask=rgba.split()[-1])
+            img = flat
+        out = io.BytesIO()
+        if pil_format == "PNG":
+            img.save(out, format="PNG", optimize=True)
+        else:
+            img.save(out, format=pil_format, quality=quality)
+        return out.getvalue(), fits
+    except Exception:
+        return None
@@ -0,0 +1,226 @@
+"""ADO mapping store — local IDs → ADO work item IDs for a project.
+
+The mapping lives in two files under output/:
+  - ado_mapping.json            snapshot (the shape the viewer and RTM expect)
+  - ado_mapping.journal.jsonl   append-only log of changes since the snapshot
+
+Writers append one fsync'd JSON line per change instead of rewriting the
+whole snapshot, and compact the journal into the snapshot every
+COMPACT_EVERY records and at the end of a command. Readers replay the
+journal on top of the snapshot, so a crash mid-push loses at most the
+record being written.
+
+Each story entry also tracks its sub-steps, so a resumed push can redo
+exactly what is missing without asking ADO:
+  - tasks        {task key ("FE", "BE", "DevOps", "QA-TD", "QA-TE") → ADO ID}
+  - links        [{"type": link type, "target": ADO ID}]
+  - attachments  [{"file": source file name, "url": attachment URL}]
+  - hashes       {ADO field path → hash of the rendered value last sent}
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+
+from core.config import get_output_path
+
+MAPPING_FILE = "ado_mapping.json"
+JOURNAL_FILE = "ado_mapping.journal.jsonl"
+COMPACT_EVERY = 100  # journal records between automatic compactions
+
+
+def empty_mapping() -> dict:
+    """Return a new, empty mapping in the ado_mapping.json shape."""
+    return {"epics": {}, "features": {}, "stories": []}
+
+
+def load_mapping(proj: dict) -> dict | None:
+    """Load the mapping snapshot and replay the journal on top of it.
+
+    Returns None if neither file exists. Raises ValueError if the snapshot
+    is not valid JSON or does not have the expected structure. A torn last
+    journal line (crash mid-write) is ignored.
+    """
+    snapshot_path = get_output_path(proj, MAPPING_FILE)
+    journal_path = get_output_path(proj, JOURNAL_FILE)
+    if not snapshot_path.exists() and not journal_path.exists():
+        return None
+
+    mapping = empty_mapping()
+    if snapshot_path.exists():
+        try:
+            with open(snapshot_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid {MAPPING_FILE}: {e}") from e
+        if not (isinstance(data, dict)
+                and isinstance(data.get("epics"), dict)
+                and isinstance(data.get("features"), dict)
+                and isinstance(data.get("stories"), list)):
+            raise ValueError(f"Invalid {MAPPING_FILE}: unexpected structure")
+        mapping = data
+
+    story_index = _index_stories(mapping)
+    for record in _read_journal(journal_path):
+        _apply(mapping, record, story_index)
+    return mapping
+
+
+class MappingJournal:
+    """Append-only writer for a project's ADO mapping.
+
+    `mapping` is the live in-memory view; every change goes through one of
+    the record_* methods, which update it and append a journal line.
+    Thread-safe — push workers share one journal.
+    """
+
+    def __init__(self, proj: dict, mapping: dict | None = None,
+                 compact_every: int = COMPACT_EVERY):
+        self.proj = proj
+        self.mapping = mapping if mapping is not None else empty_mapping()
+        self.compact_every = compact_every
+        self.snapshot_path = get_output_path(proj, MAPPING_FILE)
+        self.journal_path = get_output_path(proj, JOURNAL_FILE)
+        self._lock = threading.RLock()
+        self._pending = 0
+        self._story_index = _index_stories(self.mapping)
+        _terminate_torn_line(self.journal_path)
+
+    def record_epic(self, key: str, ado_id: int) -> None:
+        self._append({"op": "epic", "key": key, "ado_id": ado_id})
+
+    def record_feature(self, key: str, ado_id: int) -> None:
+        self._append({"op": "feature", "key": key, "ado_id": ado_id})
+
+    def record_story(self, entry: dict) -> None:
+        """Add or update a story entry (matched on its local "id").
+
+        Sub-step keys missing from `entry` keep their recorded values.
+        """
+        self._append({"op": "story", "value": entry})
+
+    def record_task(self, story_id: str, key: str, ado_id: int) -> None:
+        self._append({"op": "task", "story": story_id, "key": key, "ado_id": ado_id})
+
+    def record_link(self, story_id: str, link_type: str, target_id: int) -> None:
+        self._append({"op": "link", "story": story_id, "type": link_type, "target": target_id})
+
+    def record_attachment(self, story_id: str, filename: str, url: str) -> None:
+        self._append({"op": "attachment", "story": story_id, "file": filename, "url": url})
+
+    def record_hashes(self, story_id: str, hashes: dict) -> None:
+        """Replace a story's rendered-field hashes (used by push --sync)."""
+        self._append({"op": "hashes", "story": story_id, "hashes": hashes})
+
+    def story(self, story_id: str) -> dict | None:
+        """Return a copy of a story entry, or None if it isn't recorded."""
+        with self._lock:
+            pos = self._story_index.get(story_id)
+            if pos is None:
+                return None
+            return json.loads(json.dumps(self.mapping["stories"][pos]))
+
+    def sort_stories(self, key) -> None:
+        """Reorder story entries in memory (persisted by the next compact())."""
+        with self._lock:
+            self.mapping["stories"].sort(key=key)
+            self._story_index = _index_stories(self.mapping)
+
+    def compact(self) -> Path:
+        """Write the full mapping to the snapshot atomically and clear the journal."""
+        with self._lock:
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.snapshot_path.with_suffix(".json.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.mapping, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+            # Records already in the snapshot are idempotent on replay, so a
+            # crash between replace and truncate is harmless
+            if self.journal_path.exists():
+                self.journal_path.unlink()
+            self._pending = 0
+            return self.snapshot_path
+
+    def _append(self, record: dict) -> None:
+        with self._lock:
+            _apply(self.mapping, record, self._story_index)
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._pending += 1
+            if self._pending >= self.compact_every:
+                self.compact()
+
+
+# --- Internal helpers ---
+
+def _read_journal(path: Path) -> list[dict]:
+    """Read journal records, skipping blank or torn lines."""
+    if not path.exists():
+        return []
+    records = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+
+def _terminate_torn_line(path: Path) -> None:
+    """Make sure new records don't get glued onto a half-written last line."""
+    if not path.exists() or path.stat().st_size == 0:
+        return
+    with open(path, "rb+") as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b"\n":
+            f.write(b"\n")
+
+
+def _index_stories(mapping: dict) -> dict[str, int]:
+    """Map local story ID → position in mapping["stories"]."""
+    return {s.get("id"): i for i, s in enumerate(mapping["stories"])}
+
+
+def _apply(mapping: dict, record: dict, story_index: dict[str, int]) -> None:
+    """Apply one journal record to an in-memory mapping (idempotent)."""
+    op = record.get("op")
+    if op == "epic":
+        mapping["epics"][record["key"]] = record["ado_id"]
+    elif op == "feature":
+        mapping["features"][record["key"]] = record["ado_id"]
+    elif op == "story":
+        entry = dict(record["value"])
+        pos = story_index.get(entry.get("id"))
+        if pos is None:
+            story_index[entry.get("id")] = len(mapping["stories"])
+            mapping["stories"].append(entry)
+        else:
+            mapping["stories"][pos] = {**mapping["stories"][pos], **entry}
+    elif op in ("task", "link", "attachment", "hashes"):
+        pos = story_index.get(record.get("story"))
+        if pos is None:
+            return
+        story = mapping["stories"][pos]
+        if op == "task":
+            story.setdefault("tasks", {})[record["key"]] = record["ado_id"]
+        elif op == "hashes":
+            story["hashes"] = dict(record["hashes"])
+        elif op == "link":
+            link = {"type": record["type"], "target": record["target"]}
+            links = story.setdefault("links", [])
+            if link not in links:
+                links.append(link)
+        else:
+            attachments = story.setdefault("attachments", [])
+            if not any(a.get("file") == record["file"] for a in attachments):
+                attachments.append({"file": record["file"], "url": record["url"]})
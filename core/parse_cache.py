@@ -0,0 +1,137 @@
+"""Persistent parse cache for ingest — skip re-parsing unchanged files.
+
+Lives in output/.parse_cache/:
+  - index.json        source path → {size, mtime_ns, digest}
+  - <digest>.json     the serialized ParsedFile for that raw content
+
+A lookup first compares path + size + mtime (no file read). If the stat
+changed, the raw bytes are hashed and a matching digest still counts as a
+hit (e.g. a file that was touched or copied back). Only successful parses
+are cached. Bump PARSE_CACHE_VERSION in core/parser.py when a parser's
+output changes to invalidate everything.
+
+Results are keyed by content, so identical uploads under different names
+share one. A streamed PDF's parsed_path is re-pointed at the requesting
+file's own output on every hit; parse_directory() re-parses if it doesn't
+exist.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import asdict
+from pathlib import Path
+
+from core.config import get_output_path
+from core.parser import PARSE_CACHE_VERSION, ParsedFile, parsed_filename
+
+CACHE_DIR = ".parse_cache"
+
+
+def parse_cache(proj: dict) -> "ParseCache":
+    """Return the parse cache for a project (output/.parse_cache/)."""
+    return ParseCache(get_output_path(proj, CACHE_DIR))
+
+
+class ParseCache:
+    """Fingerprint-keyed store of ParsedFile results."""
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+        self.index_path = self.cache_dir / "index.json"
+        self.index = self._load_index()
+        self.hits = 0
+        self.misses = 0
+        self._seen: set[str] = set()
+
+    def get(self, filepath: Path) -> ParsedFile | None:
+        """Return the cached ParsedFile for a file, or None on a miss."""
+        key = str(Path(filepath).resolve())
+        self._seen.add(key)
+        st = filepath.stat()
+        entry = self.index.get(key)
+
+        if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            digest = entry["digest"]
+        else:
+            digest = _digest(filepath)
+            if not entry or entry["digest"] != digest:
+                self.misses += 1
+                return None
+            entry.update(size=st.st_size, mtime_ns=st.st_mtime_ns)
+
+        pf = self._load_result(digest)
+        if pf is None:
+            self.misses += 1
+            return None
+        pf.filename = filepath.name
+        _rebind_paths(pf, Path(filepath))
+        self.hits += 1
+        return pf
+
+    def put(self, filepath: Path, pf: ParsedFile) -> None:
+        """Store a successful parse result for a file."""
+        if pf.error:
+            return
+        key = str(Path(filepath).resolve())
+        self._seen.add(key)
+        st = filepath.stat()
+        digest = _digest(filepath)
+        self.index[key] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "digest": digest}
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        data = asdict(pf)
+        data["metadata"] = {k: v for k, v in pf.metadata.items() if k != "parse_seconds"}
+        result_path = self.cache_dir / f"{digest}.json"
+        tmp_path = result_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, result_path)
+
+    def save(self) -> None:
+        """Write the index, dropping files not seen this run and orphaned results."""
+        self.index = {k: v for k, v in self.index.items() if k in self._seen}
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": PARSE_CACHE_VERSION, "files": self.index}, f, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+        live = {entry["digest"] for entry in self.index.values()}
+        for result_path in self.cache_dir.glob("*.json"):
+            if result_path != self.index_path and result_path.stem not in live:
+                result_path.unlink()
+
+    def _load_index(self) -> dict:
+        if not self.index_path.exists():
+            return {}
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return {}
+        if data.get("version") != PARSE_CACHE_VERSION:
+            return {}
+        return data.get("files", {})
+
+    def _load_result(self, digest: str) -> ParsedFile | None:
+        try:
+            with open(self.cache_dir / f"{digest}.json", "r", encoding="utf-8") as f:
+                return ParsedFile(**json.load(f))
+        except (OSError, json.JSONDecodeError, TypeError):
+            return None
+
+
+def _rebind_paths(pf: ParsedFile, filepath: Path) -> None:
+    """Point a shared result's file-specific output path at `filepath`'s own."""
+    if pf.parsed_path:
+        pf.parsed_path = str(Path(pf.parsed_path).parent / parsed_filename(filepath.name))
+
+
+def _digest(filepath: Path) -> str:
+    """SHA-256 of a file's raw bytes, read in 1 MB blocks."""
+    h = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
@@ -7,20 +7,31 @@ Supported formats:
   - CSV (.csv)           → csv module
   - Email (.eml)         → email module
   - Plain text (.txt, .md, .rtf) → direct read
-  - Images (.png, .jpg, .jpeg, .gif, .webp) → base64 for Claude vision
+  - Transcripts (.vtt, .srt, anything in input/raw-transcripts/) → direct
+    read, then rule-based pre-compaction (core.transcripts)
+  - Images (.png, .jpg, .jpeg, .gif, .webp) → path reference; encoded for
+    Claude vision only when build_context() needs it (core.images)
 """
 
 import csv
 import email
-import base64
 import hashlib
 import mimetypes
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from dataclasses import dataclass, field
+from typing import Iterator
+
+from core.images import MEDIA_TYPES, encode_image_block
+from core.transcripts import PRECOMPACT_SUFFIX, is_transcript, precompact_with_stats
 
 
 # Extensions grouped by parser type
 TEXT_EXTS = {".txt", ".md", ".rtf", ".text"}
+TRANSCRIPT_EXTS = {".vtt", ".srt"}
 PDF_EXTS = {".pdf"}
 DOCX_EXTS = {".docx"}
 EXCEL_EXTS = {".xlsx", ".xls"}
@@ -28,7 +39,24 @@ CSV_EXTS = {".csv"}
 EMAIL_EXTS = {".eml"}
 IMAGE_EXTS = {".png", ".jpg", ".jpeg", ".gif", ".webp"}
 
-ALL_SUPPORTED = TEXT_EXTS | PDF_EXTS | DOCX_EXTS | EXCEL_EXTS | CSV_EXTS | EMAIL_EXTS | IMAGE_EXTS
+ALL_SUPPORTED = TEXT_EXTS | TRANSCRIPT_EXTS | PDF_EXTS | DOCX_EXTS | EXCEL_EXTS | CSV_EXTS | EMAIL_EXTS | IMAGE_EXTS
+
+# Worker processes for parse_directory (PDF tables / Excel loading are CPU-bound)
+PARSE_WORKERS = min(8, os.cpu_count() or 1)
+
+# Large PDFs are split into page ranges parsed on separate worker processes
+PDF_SPLIT_PAGES = 200   # page count at which a PDF gets split
+PDF_CHUNK_PAGES = 50    # pages per range
+
+# Bump when any parser's output changes — invalidates the ingest parse cache
+PARSE_CACHE_VERSION = 5
+
+# Context building (build_context / iter_context)
+CONTEXT_BUDGET_TOKENS = 150_000  # default budget for plan_context()
+IMAGE_TOKENS = 1600              # ~cost of one normalized image (1568px edge) in Claude vision
+MIN_TRUNCATED_TOKENS = 500       # smaller remainders drop the section instead of truncating it
+CHANGE_PRIORITY = {"new": 0, "changed": 1}             # anything else ranks after these
+FORMAT_PRIORITY = ["docx", "pdf", "email", "text", "excel", "csv", "image"]
 
 
 @dataclass
@@ -38,23 +66,37 @@ class ParsedFile:
     format: str          # "text", "pdf", "docx", "excel", "csv", "email", "image"
     text: str = ""       # Extracted text content
     is_image: bool = False
-    image_base64: str = ""       # Base64-encoded image data (for vision)
     image_media_type: str = ""   # MIME type of image
+    image_path: str = ""         # Source path of an image, encoded lazily by build_context()
     metadata: dict = field(default_factory=dict)  # Extra info (sheet names, email headers, etc.)
     error: str = ""      # Error message if parsing failed
+    parsed_path: str = ""  # Set when text was streamed straight to output/parsed/ (text stays empty)
+    page_hashes: list = field(default_factory=list)  # Per-page content hashes (PDF)
 
 
-def parse_file(filepath: Path) -> ParsedFile:
+def parse_file(filepath: Path, stream_dir: Path | None = None,
+               full_tables: bool = False) -> ParsedFile:
     """
     Parse a single file and extract its content.
     Routes to the appropriate parser based on extension.
+
+    With `stream_dir`, PDFs are written page by page straight into
+    stream_dir/<parsed_filename> instead of being held in memory; the
+    result then has parsed_path set and an empty text.
+
+    PDF pages without any ruling lines, rects or curves skip table
+    extraction; `full_tables` runs extract_tables() on every page instead.
     """
     ext = filepath.suffix.lower()
 
-    if ext in TEXT_EXTS:
-        return _parse_text(filepath)
+    if ext in TEXT_EXTS or ext in TRANSCRIPT_EXTS:
+        pf = _parse_text(filepath)
+        return _precompact(pf) if is_transcript(filepath) else pf
     elif ext in PDF_EXTS:
-        return _parse_pdf(filepath)
+        if stream_dir is not None:
+            return _stream_pdf(filepath, Path(stream_dir) / parsed_filename(filepath.name),
+                               full_tables)
+        return _parse_pdf(filepath, full_tables)
     elif ext in DOCX_EXTS:
         return _parse_docx(filepath)
     elif ext in EXCEL_EXTS:
@@ -73,20 +115,44 @@ def parse_file(filepath: Path) -> ParsedFile:
         )
 
 
-def parse_directory(directory: Path) -> list[ParsedFile]:
+def parse_directory(directory: Path, workers: int | None = None,
+                    cache=None, stream_dir: Path | None = None,
+                    pdf_split_pages: int | None = None,
+                    pdf_chunk_pages: int | None = None,
+                    full_tables: bool = False) -> list[ParsedFile]:
     """
     Parse all supported files in a directory (recursively).
     Returns list of ParsedFile objects, sorted by filename.
+
+    Files are parsed on a pool of `workers` processes (default PARSE_WORKERS;
+    1 parses in-process). Results keep the sorted order regardless of which
+    file finishes first. Each result records its parse time in
+    metadata["parse_seconds"].
+
+    With a ParseCache (core.parse_cache), unchanged files are served from
+    the cache without parsing (metadata["cached"] = True) and fresh
+    results are stored in it. Images are always read directly. Every result
+    carries the source's metadata["mtime"] (used to rank context sections).
+
+    With `stream_dir`, PDFs are streamed into it (see parse_file()).
+
+    PDFs with at least `pdf_split_pages` pages (default PDF_SPLIT_PAGES) are
+    split into ranges of `pdf_chunk_pages` (default PDF_CHUNK_PAGES) that
+    are parsed on the same pool and merged back in page order.
+
+    `full_tables` disables the table fast path (see parse_file()) and
+    bypasses cache lookups, for verifying fast-path output.
     """
     results = []
     if not directory.exists():
         return results
 
+    to_parse = []  # (position in results, path)
     for f in sorted(directory.rglob("*")):
         if not f.is_file():
             continue
-        if f.name.startswith("."):
-            continue
+        if f.name.startswith(".") or f.name.endswith(PRECOMPACT_SUFFIX):
+            continue  # hidden files, pre-compacted transcript copies
         if f.suffix.lower() not in ALL_SUPPORTED:
             results.append(ParsedFile(
                 filename=f.name,
@@ -94,15 +160,157 @@ def parse_directory(directory: Path) -> list[ParsedFile]:
                 error=f"Skipped unsupported format: {f.suffix}",
             ))
             continue
-        results.append(parse_file(f))
+        cacheable = cache is not None and f.suffix.lower() not in IMAGE_EXTS
+        cached = cache.get(f) if cacheable and not full_tables else None
+        if cached is not None and cached.parsed_path and not Path(cached.parsed_path).exists():
+            cached = None  # streamed output was deleted — parse again
+        if cached is not None:
+            cached.metadata.update(parse_seconds=0.0, cached=True, mtime=f.stat().st_mtime)
+            results.append(cached)
+            continue
+        to_parse.append((len(results), f))
+        results.append(None)
+
+    paths = [f for _, f in to_parse]
+    split = (pdf_split_pages or PDF_SPLIT_PAGES, pdf_chunk_pages or PDF_CHUNK_PAGES)
+    parsed = _parse_many(paths, workers, stream_dir, split, full_tables)
+    for (pos, path), pf in zip(to_parse, parsed):
+        results[pos] = pf
+        pf.metadata["mtime"] = path.stat().st_mtime
+        if cache is not None and path.suffix.lower() not in IMAGE_EXTS:
+            cache.put(path, pf)
 
     return results
 
 
-def build_context(parsed_files: list[ParsedFile]) -> tuple[str, list[dict]]:
+def _parse_many(paths: list[Path], workers: int | None = None,
+                stream_dir: Path | None = None,
+                split: tuple[int, int] = (PDF_SPLIT_PAGES, PDF_CHUNK_PAGES),
+                full_tables: bool = False) -> list[ParsedFile]:
+    """Parse files on a process pool, returning results in input order.
+
+    `split` is (page threshold, pages per chunk) for splitting large PDFs.
+    """
+    workers = workers or PARSE_WORKERS
+    if workers <= 1 or not paths:
+        return [_timed_parse(p, stream_dir, full_tables) for p in paths]
+
+    plans = [(p, _pdf_chunks(p, *split)) for p in paths]
+    job_count = sum(len(chunks) or 1 for _, chunks in plans)
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers, job_count)) as pool:
+            jobs = []
+            for path, chunks in plans:
+                if chunks:
+                    futures = [pool.submit(_pdf_page_range, path, a, b, full_tables)
+                               for a, b in chunks]
+                    jobs.append((path, time.perf_counter(), futures))
+                else:
+                    jobs.append((path, None,
+                                 pool.submit(_timed_parse, path, stream_dir, full_tables)))
+
+            results = []
+            for path, started, job in jobs:
+                if started is None:
+                    results.append(job.result())
+                else:
+                    results.append(_merge_pdf_chunks(path, job, started, stream_dir))
+            return results
+    except (BrokenProcessPool, OSError):
+        # No usable process pool (sandbox, worker killed) — parse in-process
+        return [_timed_parse(p, stream_dir, full_tables) for p in paths]
+
+
+def _pdf_chunks(filepath: Path, split_pages: int, chunk_pages: int) -> list[tuple[int, int]]:
+    """Page ranges [(start, stop)] for a PDF big enough to split, else []."""
+    if filepath.suffix.lower() not in PDF_EXTS:
+        return []
+    try:
+        import pdfplumber
+        with pdfplumber.open(filepath) as pdf:
+            page_count = len(pdf.pages)
+    except Exception:
+        return []  # let the regular parser report the problem
+    if page_count < split_pages:
+        return []
+    return [(a, min(a + chunk_pages, page_count)) for a in range(0, page_count, chunk_pages)]
+
+
+def _pdf_page_range(filepath: Path, start: int, stop: int,
+                    full_tables: bool = False) -> tuple[list[str], dict]:
+    """Worker job: the page blocks for pages [start, stop) of a PDF, plus table stats."""
+    stats = {}
+    pages = list(iter_pdf_pages(filepath, start, stop, full_tables, stats))
+    return pages, stats
+
+
+def _merge_pdf_chunks(filepath: Path, futures: list, started: float,
+                      stream_dir: Path | None) -> ParsedFile:
+    """Assemble a split PDF from its range jobs, in page order."""
+    chunk_count = len(futures)
+    stats = {}
+
+    def pages():
+        for i in range(chunk_count):
+            (chunk, chunk_stats), futures[i] = futures[i].result(), None  # free merged chunks
+            for key, n in chunk_stats.items():
+                stats[key] = stats.get(key, 0) + n
+            yield from chunk
+
+    pages = pages()
+    if stream_dir is not None:
+        pf = _write_pdf_pages(filepath, Path(stream_dir) / parsed_filename(filepath.name), pages)
+    else:
+        try:
+            page_list = list(pages)
+            pf = ParsedFile(
+                filename=filepath.name,
+                format="pdf",
+                text="\n\n".join(page_list),
+                metadata={"page_count": len(page_list)},
+                page_hashes=[compute_file_hash(p) for p in page_list],
+            )
+        except Exception as e:
+            pf = ParsedFile(filename=filepath.name, format="pdf", error=str(e))
+    pf.metadata["parse_seconds"] = round(time.perf_counter() - started, 3)
+    if not pf.error:
+        pf.metadata["page_chunks"] = chunk_count
+        pf.metadata.update(stats)
+    return pf
+
+
+def _timed_parse(filepath: Path, stream_dir: Path | None = None,
+                 full_tables: bool = False) -> ParsedFile:
+    """parse_file() plus wall-clock timing in metadata["parse_seconds"]."""
+    start = time.perf_counter()
+    pf = parse_file(filepath, stream_dir, full_tables)
+    pf.metadata["parse_seconds"] = round(time.perf_counter() - start, 3)
+    return pf
+
+
+@dataclass
+class ContextReport:
+    """What a budgeted context includes and drops (see plan_context())."""
+    budget_tokens: int | None = None
+    used_tokens: int = 0
+    included: list = field(default_factory=list)  # {"filename", "format", "tokens", "truncated"}
+    dropped: list = field(default_factory=list)   # {"filename", "format", "tokens"}
+
+
+def build_context(parsed_files: list[ParsedFile], rendition_dir: Path | None = None,
+                  image_settings: dict | None = None, budget_tokens: int | None = None,
+                  changes: dict | None = None,
+                  report: ContextReport | None = None) -> tuple[str, list[dict]]:
     """
     Build a combined context string from all parsed files.
 
+    Images are read and encoded here, not at parse time, as normalized
+    renditions cached in `rendition_dir` (e.g. output/image_cache/), using
+    `image_settings` (see core.images.image_settings) or the defaults.
+
+    With `budget_tokens`, sections are ranked and cut to fit (see
+    iter_context()); without it every file is included in the given order.
+
     Returns:
         (text_context, image_blocks)
         - text_context: combined text from all non-image files
@@ -111,28 +319,116 @@ def build_context(parsed_files: list[ParsedFile]) -> tuple[str, list[dict]]:
     """
     text_parts = []
     image_blocks = []
+    for section in iter_context(parsed_files, budget_tokens, changes, report,
+                                rendition_dir, image_settings):
+        if isinstance(section, dict):
+            image_blocks.append(section)
+        else:
+            text_parts.append(section)
 
-    for pf in parsed_files:
-        if pf.error:
-            continue
+    text_context = "\n\n".join(text_parts)
+    return text_context, image_blocks
+
+
+def iter_context(parsed_files: list[ParsedFile], budget_tokens: int | None = None,
+                 changes: dict | None = None, report: ContextReport | None = None,
+                 rendition_dir: Path | None = None,
+                 image_settings: dict | None = None) -> Iterator[str | dict]:
+    """
+    Stream context sections in priority order within a token budget.
+
+    Yields text sections (str) and image blocks (dict). Sections follow
+    plan_context(): whole files first, then at most one truncated file,
+    then a closing section listing what was dropped so it can be read from
+    output/parsed/ on demand. Text is only read when its section is
+    yielded. `report`, if given, is filled with the plan.
+    """
+    plan = plan_context(parsed_files, budget_tokens, changes)
+    if report is not None:
+        report.__dict__.update(plan.__dict__)
 
+    by_name = {pf.filename: pf for pf in parsed_files}
+    for item in plan.included:
+        pf = by_name[item["filename"]]
         if pf.is_image:
-            image_blocks.append({
-                "type": "image",
-                "source": {
-                    "type": "base64",
-                    "media_type": pf.image_media_type,
-                    "data": pf.image_base64,
-                },
-            })
+            try:
+                block = encode_image_block(Path(pf.image_path), rendition_dir, image_settings)
+            except OSError:
+                continue  # image removed since ingest
+            yield block
             # Also note the image in text context for reference
-            text_parts.append(f"--- [{pf.filename}] (image attached for visual review) ---")
-        elif pf.text.strip():
-            header = f"--- [{pf.filename}] ({pf.format}) ---"
-            text_parts.append(f"{header}\n{pf.text.strip()}")
+            yield f"--- [{pf.filename}] (image attached for visual review) ---"
+            continue
 
-    text_context = "\n\n".join(text_parts)
-    return text_context, image_blocks
+        header = _context_header(pf)
+        body = parsed_text(pf)
+        if item["truncated"]:
+            cut = body[:max(0, item["tokens"] * 4 - len(header) - 1)]
+            para = cut.rfind("\n\n")
+            body = (cut[:para] if para > len(cut) // 2 else cut).rstrip()
+            body += f"\n\n[... truncated — full text in output/parsed/{parsed_filename(pf.filename)}]"
+        yield f"{header}\n{body}"
+
+    if plan.dropped:
+        lines = [f"--- [omitted for context budget: {len(plan.dropped)} file(s)] ---"]
+        for item in plan.dropped:
+            lines.append(f"- {item['filename']} ({item['format']}, ~{item['tokens']} tokens)")
+        yield "\n".join(lines)
+
+
+def plan_context(parsed_files: list[ParsedFile], budget_tokens: int | None = None,
+                 changes: dict | None = None) -> ContextReport:
+    """
+    Decide which files fit in a token budget, without reading any text.
+
+    Files are ranked by change status (`changes`: filename → "new" /
+    "changed" / ..., e.g. from the ingest manifest), then FORMAT_PRIORITY,
+    then most recently modified. Whole sections are taken in that order;
+    the first one that doesn't fit is truncated to the remaining budget
+    (if at least MIN_TRUNCATED_TOKENS are left) and everything after it is
+    dropped. With no budget, everything is included in the given order.
+    """
+    changes = changes or {}
+    candidates = [pf for pf in parsed_files
+                  if not pf.error and not pf.metadata.get("duplicate_of")
+                  and (pf.is_image or pf.parsed_path or pf.text.strip())]
+    if budget_tokens is not None:
+        candidates.sort(key=lambda pf: (
+            CHANGE_PRIORITY.get(changes.get(pf.filename), len(CHANGE_PRIORITY)),
+            FORMAT_PRIORITY.index(pf.format) if pf.format in FORMAT_PRIORITY else len(FORMAT_PRIORITY),
+            -pf.metadata.get("mtime", 0),
+            pf.filename,
+        ))
+
+    report = ContextReport(budget_tokens=budget_tokens)
+    full = False
+    for pf in candidates:
+        # same ~4 chars/token as estimate_tokens(), without materializing text
+        tokens = IMAGE_TOKENS if pf.is_image else (
+            len(_context_header(pf)) + 1 + _context_text_length(pf)) // 4
+        entry = {"filename": pf.filename, "format": pf.format, "tokens": tokens}
+        remaining = (budget_tokens - report.used_tokens) if budget_tokens is not None else tokens
+        if not full and tokens <= remaining:
+            report.included.append({**entry, "truncated": False})
+            report.used_tokens += tokens
+            continue
+        if not full and not pf.is_image and remaining >= MIN_TRUNCATED_TOKENS:
+            report.included.append({**entry, "tokens": remaining, "truncated": True})
+            report.used_tokens += remaining
+        else:
+            report.dropped.append(entry)
+        full = True
+    return report
+
+
+def _context_header(pf: ParsedFile) -> str:
+    return f"--- [{pf.filename}] ({pf.format}) ---"
+
+
+def _context_text_length(pf: ParsedFile) -> int:
+    if pf.parsed_path:
+        return pf.metadata.get("text_length", 0)
+    return len(pf.text.strip())
 
 
 def parsed_filename(source_filename: str) -> str:
@@ -140,6 +436,20 @@ def parsed_filename(source_filename: str) -> str:
     return source_filename.replace(" ", "-") + ".md"
 
 
+def parsed_header(source_filename: str, fmt: str) -> str:
+    """Heading line that starts every output/parsed/ .md file."""
+    return f"# {source_filename} ({fmt})"
+
+
+def parsed_text(pf: ParsedFile) -> str:
+    """A file's stripped text, read back from output/parsed/ if it was streamed."""
+    if not pf.parsed_path:
+        return pf.text.strip()
+    content = Path(pf.parsed_path).read_text(encoding="utf-8")
+    header = parsed_header(pf.filename, pf.format)
+    return content[len(header):].strip() if content.startswith(header) else content.strip()
+
+
 # --- Individual parsers ---
 
 def _parse_text(filepath: Path) -> ParsedFile:
@@ -151,10 +461,19 @@ def _parse_text(filepath: Path) -> ParsedFile:
         return ParsedFile(filename=filepath.name, format="text", error=str(e))
 
 
-def _parse_pdf(filepath: Path) -> ParsedFile:
+def _precompact(pf: ParsedFile) -> ParsedFile:
+    """Replace a transcript's text with its pre-compacted form (ingest stores a copy)."""
+    if pf.error:
+        return pf
+    pf.text, stats = precompact_with_stats(pf.text)
+    pf.metadata.update(stats)
+    return pf
+
+
+def _parse_pdf(filepath: Path, full_tables: bool = False) -> ParsedFile:
     """Parse PDF files using pdfplumber."""
     try:
-        import pdfplumber
+        import pdfplumber  # noqa: F401
     except ImportError:
         return ParsedFile(
             filename=filepath.name, format="pdf",
@@ -162,25 +481,123 @@ def _parse_pdf(filepath: Path) -> ParsedFile:
         )
 
     try:
-        pages = []
-        with pdfplumber.open(filepath) as pdf:
-            for i, page in enumerate(pdf.pages):
-                text = page.extract_text() or ""
-                tables = page.extract_tables()
-                parts = [text]
-                for table in tables:
-                    parts.append(_table_to_text(table))
-                pages.append(f"[Page {i+1}]\n{chr(10).join(parts)}")
+        stats = {}
+        pages = list(iter_pdf_pages(filepath, full_tables=full_tables, stats=stats))
 
         return ParsedFile(
             filename=filepath.name,
             format="pdf",
             text="\n\n".join(pages),
-            metadata={"page_count": len(pages)},
+            metadata={"page_count": len(pages), **stats},
+            page_hashes=[compute_file_hash(p) for p in pages],
+        )
+    except Exception as e:
+        return ParsedFile(filename=filepath.name, format="pdf", error=str(e))
+
+
+def _stream_pdf(filepath: Path, out_path: Path, full_tables: bool = False) -> ParsedFile:
+    """Parse a PDF page by page, writing each page to `out_path` as it goes.
+
+    Memory stays bounded by one page. The file content is identical to what
+    ingest writes for an in-memory parse, and text_length / content_hash in
+    metadata match what len() / compute_file_hash() would give on the text.
+    """
+    try:
+        import pdfplumber  # noqa: F401
+    except ImportError:
+        return ParsedFile(
+            filename=filepath.name, format="pdf",
+            error="pdfplumber not installed. Run: pip install pdfplumber",
         )
+
+    stats = {}
+    pf = _write_pdf_pages(filepath, out_path,
+                          iter_pdf_pages(filepath, full_tables=full_tables, stats=stats))
+    if not pf.error:
+        pf.metadata.update(stats)
+    return pf
+
+
+def _write_pdf_pages(filepath: Path, out_path: Path, pages: Iterator[str]) -> ParsedFile:
+    """Write "[Page N]" blocks to a parsed .md file as they arrive (see _stream_pdf)."""
+    tmp_path = out_path.with_name(out_path.name + ".tmp")
+    text_hash = hashlib.md5()
+    text_length = 0
+    page_hashes = []
+    try:
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as out:
+            out.write(parsed_header(filepath.name, "pdf") + "\n\n")
+            pending = ""  # trailing whitespace held back so the file ends stripped
+            for i, page_text in enumerate(pages):
+                piece = ("\n\n" if i else "") + page_text
+                text_hash.update(piece.encode("utf-8"))
+                text_length += len(piece)
+                page_hashes.append(compute_file_hash(page_text))
+
+                body = pending + piece
+                stripped = body.rstrip()
+                out.write(stripped)
+                pending = body[len(stripped):]
+        os.replace(tmp_path, out_path)
     except Exception as e:
+        if tmp_path.exists():
+            tmp_path.unlink()
         return ParsedFile(filename=filepath.name, format="pdf", error=str(e))
 
+    return ParsedFile(
+        filename=filepath.name,
+        format="pdf",
+        parsed_path=str(out_path),
+        metadata={
+            "page_count": len(page_hashes),
+            "text_length": text_length,
+            "content_hash": text_hash.hexdigest()[:12],
+        },
+        page_hashes=page_hashes,
+    )
+
+
+def iter_pdf_pages(filepath: Path, start: int = 0, stop: int | None = None,
+                   full_tables: bool = False, stats: dict | None = None) -> Iterator[str]:
+    """Yield the "[Page N]" text block (text + tables) of each PDF page in turn.
+
+    Each page's cached layout objects are released once it has been yielded,
+    so only one page is held in memory at a time. Pages with no table
+    geometry skip extract_tables() unless `full_tables` is set; `stats`
+    (if given) counts them as table_fast_pages / table_full_pages.
+    """
+    import pdfplumber
+
+    if stats is not None:
+        stats.setdefault("table_fast_pages", 0)
+        stats.setdefault("table_full_pages", 0)
+
+    with pdfplumber.open(filepath) as pdf:
+        pages = pdf.pages
+        for i in range(start, len(pages) if stop is None else min(stop, len(pages))):
+            page = pages[i]
+            text = page.extract_text() or ""
+            full = full_tables or _has_table_geometry(page)
+            tables = page.extract_tables() if full else []
+            if stats is not None:
+                stats["table_full_pages" if full else "table_fast_pages"] += 1
+            parts = [text]
+            for table in tables:
+                parts.append(_table_to_text(table))
+            yield f"[Page {i+1}]\n{chr(10).join(parts)}"
+            if hasattr(page, "close"):
+                page.close()
+
+
+def _has_table_geometry(page) -> bool:
+    """Cheap pre-check: can extract_tables() find anything on this page?
+
+    pdfplumber's default table strategy builds cells from ruling lines, rect
+    edges and curve edges only, so a page with none of them has no tables.
+    """
+    return bool(page.lines or page.rects or page.curves)
+
 
 def _parse_docx(filepath: Path) -> ParsedFile:
     """Parse Word documents using python-docx."""
@@ -342,29 +759,19 @@ def _parse_email(filepath: Path) -> ParsedFile:
 
 
 def _parse_image(filepath: Path) -> ParsedFile:
-    """Parse image files → base64 for Claude vision."""
+    """Parse image files → path reference (encoded lazily by build_context)."""
     try:
-        raw = filepath.read_bytes()
-        b64 = base64.b64encode(raw).decode("ascii")
-
+        size = filepath.stat().st_size
         mime = mimetypes.guess_type(filepath.name)[0] or "image/png"
-        # Normalize common types
-        mime_map = {
-            ".jpg": "image/jpeg",
-            ".jpeg": "image/jpeg",
-            ".png": "image/png",
-            ".gif": "image/gif",
-            ".webp": "image/webp",
-        }
-        media_type = mime_map.get(filepath.suffix.lower(), mime)
+        media_type = MEDIA_TYPES.get(filepath.suffix.lower(), mime)
 
         return ParsedFile(
             filename=filepath.name,
             format="image",
             is_image=True,
-            image_base64=b64,
             image_media_type=media_type,
-            metadata={"size_bytes": len(raw)},
+            image_path=str(filepath.resolve()),
+            metadata={"size_bytes": size},
         )
     except Exception as e:
         return ParsedFile(filename=filepath.name, format="image", error=str(e))
@@ -0,0 +1,117 @@
+"""Dependency-aware scheduler for running pipeline steps concurrently.
+
+Steps are added as nodes with the keys of the nodes they depend on. Each
+node runs on a bounded thread pool as soon as all of its dependencies have
+succeeded; if a dependency fails, everything downstream of it is skipped.
+"""
+
+import heapq
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+
+class DependencyFailed(Exception):
+    """Raised for a node that was skipped because a dependency failed."""
+
+
+@dataclass
+class _Node:
+    key: str
+    fn: Callable[[], Any]
+    deps: list[str] = field(default_factory=list)
+    always: bool = False
+
+
+class DagScheduler:
+    """Run callables in dependency order on a bounded worker pool.
+
+    Usage:
+        sched = DagScheduler(max_workers=4)
+        sched.add("epic:E1", create_epic)
+        sched.add("feature:F1", create_feature, deps=["epic:E1"])
+        failures = sched.run()
+    """
+
+    def __init__(self, max_workers: int = 4):
+        if max_workers < 1:
+            raise ValueError(f"max_workers must be at least 1, got {max_workers}")
+        self.max_workers = max_workers
+        self._nodes: dict[str, _Node] = {}
+        self.results: dict[str, Any] = {}
+
+    def add(
+        self,
+        key: str,
+        fn: Callable[[], Any],
+        deps: list[str] | tuple = (),
+        always: bool = False,
+    ) -> None:
+        """Register a node. Dependencies must already have been added.
+
+        An `always` node runs once its dependencies have finished, even if
+        some of them failed (e.g. a batch step that should still handle the
+        siblings that succeeded).
+        """
+        if key in self._nodes:
+            raise ValueError(f"Duplicate scheduler node: {key}")
+        missing = [d for d in deps if d not in self._nodes]
+        if missing:
+            raise ValueError(f"Node {key} depends on unknown node(s): {', '.join(missing)}")
+        self._nodes[key] = _Node(key=key, fn=fn, deps=list(deps), always=always)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def run(self) -> dict[str, Exception]:
+        """Run all nodes and return {key: exception} for every node that did not succeed.
+
+        Among ready nodes, the earliest-added runs first, so a single-worker
+        run walks the graph in insertion order (depth-first for a tree built
+        parent-before-children).
+        """
+        remaining = {key: set(node.deps) for key, node in self._nodes.items()}
+        dependents: dict[str, list[str]] = {key: [] for key in self._nodes}
+        for key, node in self._nodes.items():
+            for dep in node.deps:
+                dependents[dep].append(key)
+
+        failures: dict[str, Exception] = {}
+        order = {key: i for i, key in enumerate(self._nodes)}
+        ready = [order[key] for key in self._nodes if not remaining[key]]
+        keys = list(self._nodes)
+        running: dict[Future, str] = {}
+
+        def settle(key: str, ok: bool) -> None:
+            """Release dependents of a finished node; skip them if it failed."""
+            for child in dependents[key]:
+                deps_left = remaining.get(child)
+                if deps_left is None:
+                    continue
+                if not ok and not self._nodes[child].always:
+                    failures[child] = DependencyFailed(f"Skipped: dependency {key} failed")
+                    del remaining[child]
+                    settle(child, ok=False)
+                    continue
+                deps_left.discard(key)
+                if not deps_left:
+                    heapq.heappush(ready, order[child])
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while ready or running:
+                while ready and len(running) < self.max_workers:
+                    key = keys[heapq.heappop(ready)]
+                    remaining.pop(key, None)
+                    running[pool.submit(self._nodes[key].fn)] = key
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    key = running.pop(fut)
+                    exc = fut.exception()
+                    if exc is not None:
+                        failures[key] = exc
+                    else:
+                        self.results[key] = fut.result()
+                    settle(key, ok=exc is None)
+
+        return failures
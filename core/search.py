@@ -0,0 +1,213 @@
+"""Full-text BM25 index over a project's parsed requirements.
+
+Every output/parsed/*.md file is split into paragraph-aligned chunks of
+about CHUNK_CHARS characters, and the chunks are indexed in
+output/search_index.sqlite (inverted index: term → chunk, term frequency).
+update() is incremental: only files whose size or mtime changed since the
+last update are re-indexed, and files that disappeared are dropped. Ingest
+calls it after writing output/parsed/, and `xproject search` before
+querying.
+
+    index = search_index(proj)
+    for hit in index.search("single sign-on"):
+        print(hit.file, hit.offset, hit.score)
+
+Offsets are character offsets into the parsed .md file, so a hit can be
+read back with text[hit.offset:hit.offset + hit.length].
+"""
+
+import math
+import re
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+
+from core.config import get_output_path
+from core.sqlite_util import ClosingConnection, connect
+
+INDEX_FILE = "search_index.sqlite"
+CHUNK_CHARS = 1500   # target chunk size; chunks break on blank lines
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have if in into is it its of on or "
+    "that the their then there these this to was were will with".split()
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    name TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    id INTEGER PRIMARY KEY,
+    file TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    terms INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_chunks_file ON chunks (file);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    chunk_id INTEGER NOT NULL,
+    tf INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_postings_term ON postings (term);
+CREATE INDEX IF NOT EXISTS idx_postings_chunk ON postings (chunk_id);
+"""
+
+
+@dataclass
+class SearchHit:
+    """One ranked chunk of a parsed file."""
+    file: str      # parsed .md file name (in output/parsed/)
+    offset: int    # character offset of the chunk in that file
+    length: int    # chunk length in characters
+    score: float
+    text: str = ""
+
+
+def search_index(proj: dict) -> "SearchIndex":
+    """Return the search index for a project (output/search_index.sqlite)."""
+    return SearchIndex(get_output_path(proj, INDEX_FILE), get_output_path(proj, "parsed"))
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased word tokens, minus stopwords and single characters."""
+    return [t for t in _TOKEN_RE.findall(text.lower()) if len(t) > 1 and t not in _STOPWORDS]
+
+
+def chunk_text(text: str, target: int = CHUNK_CHARS) -> list[tuple[int, int]]:
+    """Split text into (offset, length) chunks of about `target` chars on blank lines.
+
+    A single paragraph longer than `target` becomes its own chunk.
+    """
+    chunks = []
+    start = end = 0
+    for match in re.finditer(r"\n\s*\n", text):
+        if match.start() - start > target and end > start:
+            chunks.append((start, end - start))
+            start = _skip_blank(text, end)
+        end = match.start()
+    if len(text) - start > target and end > start:
+        chunks.append((start, end - start))
+        start = _skip_blank(text, end)
+    if text[start:].strip():
+        chunks.append((start, len(text.rstrip()) - start))
+    return chunks
+
+
+class SearchIndex:
+    """Incremental BM25 index over the .md files in one directory."""
+
+    def __init__(self, path: Path, parsed_dir: Path):
+        self.path = Path(path)
+        self.parsed_dir = Path(parsed_dir)
+
+    def update(self) -> dict:
+        """Re-index new/changed parsed files and drop removed ones.
+
+        Returns {"indexed": n, "removed": n, "unchanged": n}.
+        """
+        current = {}
+        if self.parsed_dir.exists():
+            for f in sorted(self.parsed_dir.glob("*.md")):
+                st = f.stat()
+                current[f.name] = (st.st_size, st.st_mtime_ns)
+
+        with self._connect() as conn:
+            known = {name: (size, mtime) for name, size, mtime
+                     in conn.execute("SELECT name, size, mtime_ns FROM files")}
+            stale = [name for name in known if known[name] != current.get(name)]
+            fresh = [name for name in current if known.get(name) != current[name]]
+
+            for name in stale:
+                conn.execute("DELETE FROM postings WHERE chunk_id IN "
+                             "(SELECT id FROM chunks WHERE file = ?)", (name,))
+                conn.execute("DELETE FROM chunks WHERE file = ?", (name,))
+                conn.execute("DELETE FROM files WHERE name = ?", (name,))
+            for name in fresh:
+                self._index_file(conn, name, *current[name])
+
+        return {
+            "indexed": len(fresh),
+            "removed": len([n for n in stale if n not in current]),
+            "unchanged": len(current) - len(fresh),
+        }
+
+    def search(self, query: str, limit: int = 10, with_text: bool = True) -> list[SearchHit]:
+        """Return the `limit` best chunks for a query, by BM25 score."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self.path.exists():
+            return []
+
+        with self._connect() as conn:
+            n_chunks, avg_terms = conn.execute(
+                "SELECT COUNT(*), AVG(terms) FROM chunks"
+            ).fetchone()
+            if not n_chunks:
+                return []
+            scores: dict[int, float] = {}
+            for term in terms:
+                postings = conn.execute(
+                    "SELECT p.chunk_id, p.tf, c.terms FROM postings p "
+                    "JOIN chunks c ON c.id = p.chunk_id WHERE p.term = ?", (term,)
+                ).fetchall()
+                if not postings:
+                    continue
+                idf = math.log(1 + (n_chunks - len(postings) + 0.5) / (len(postings) + 0.5))
+                for chunk_id, tf, length in postings:
+                    norm = tf + BM25_K1 * (1 - BM25_B + BM25_B * length / avg_terms)
+                    scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * tf * (BM25_K1 + 1) / norm
+
+            best = sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))[:limit]
+            hits = []
+            for chunk_id, score in best:
+                file, offset, length = conn.execute(
+                    "SELECT file, offset, length FROM chunks WHERE id = ?", (chunk_id,)
+                ).fetchone()
+                hits.append(SearchHit(file, offset, length, round(score, 4)))
+
+        if with_text:
+            texts = {}
+            for hit in hits:
+                if hit.file not in texts:
+                    try:
+                        texts[hit.file] = (self.parsed_dir / hit.file).read_text(encoding="utf-8")
+                    except OSError:
+                        texts[hit.file] = ""
+                hit.text = texts[hit.file][hit.offset:hit.offset + hit.length]
+        return hits
+
+    def _index_file(self, conn: sqlite3.Connection, name: str, size: int, mtime_ns: int) -> None:
+        text = (self.parsed_dir / name).read_text(encoding="utf-8")
+        for offset, length in chunk_text(text):
+            tokens = tokenize(text[offset:offset + length])
+            if not tokens:
+                continue
+            chunk_id = conn.execute(
+                "INSERT INTO chunks (file, offset, length, terms) VALUES (?, ?, ?, ?)",
+                (name, offset, length, len(tokens)),
+            ).lastrowid
+            counts: dict[str, int] = {}
+            for t in tokens:
+                counts[t] = counts.get(t, 0) + 1
+            conn.executemany(
+                "INSERT INTO postings (term, chunk_id, tf) VALUES (?, ?, ?)",
+                [(t, chunk_id, tf) for t, tf in counts.items()],
+            )
+        conn.execute("INSERT OR REPLACE INTO files (name, size, mtime_ns) VALUES (?, ?, ?)",
+                     (name, size, mtime_ns))
+
+    def _connect(self) -> ClosingConnection:
+        return connect(self.path, _SCHEMA)
+
+
+def _skip_blank(text: str, pos: int) -> int:
+    """Advance past whitespace so a chunk starts on content."""
+    while pos < len(text) and text[pos].isspace():
+        pos += 1
+    return pos
@@ -0,0 +1,28 @@
+"""Shared sqlite3 helpers for the per-project SQLite caches and indexes."""
+
+import sqlite3
+from pathlib import Path
+
+
+def connect(path: Path, schema: str) -> "ClosingConnection":
+    """Open (creating if needed) a database and apply its CREATE ... IF NOT EXISTS schema."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.executescript(schema)
+    return ClosingConnection(conn)
+
+
+class ClosingConnection:
+    """sqlite3 connection as a context manager that commits *and* closes."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self) -> sqlite3.Connection:
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.conn.commit()
+        self.conn.close()
@@ -0,0 +1,382 @@
+"""Per-project telemetry store — usage, cost and events in one SQLite file.
+
+output/telemetry.sqlite holds three append-only tables:
+  - operations   pipeline runs (core.usage.log_operation)
+  - sessions     logged AI session costs (core.cost.log_session)
+  - events       timeline events (core.events.append_event)
+
+Rollups by operation, by day and by model are maintained in the same
+transaction as each insert, so get_usage_summary() / get_cost_summary()
+read a handful of pre-aggregated rows instead of re-aggregating the whole
+history. Rollups keep unrounded costs; summaries round once at the end.
+The JSON files these modules used to rewrite on every append
+(pipeline_usage.json, cost_log.json, events.jsonl / events.json) are
+imported once, the first time the store is opened.
+
+Writes run in BEGIN IMMEDIATE transactions; reads use plain (deferred)
+transactions, so in WAL mode readers never block writers.
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+
+from core.config import get_output_path
+
+TELEMETRY_FILE = "telemetry.sqlite"
+LEGACY_FILES = {
+    "operations": ["pipeline_usage.json"],
+    "sessions": ["cost_log.json"],
+    "events": ["events.jsonl", "events.json"],  # first one found wins
+}
+# One-time fix-ups applied in the first write transaction (meta key → SQL)
+MIGRATIONS = {
+    # Rollups from before empty timestamps were ignored could hold first_ts = ''
+    "fixed_rollup_first_ts": (
+        "UPDATE rollup_operation SET first_ts = COALESCE((SELECT MIN(timestamp) FROM operations o "
+        "WHERE o.operation = rollup_operation.operation AND o.timestamp != ''), '') "
+        "WHERE first_ts = ''"
+    ),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS operations (
+    id INTEGER PRIMARY KEY,
+    operation TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    duration_seconds REAL,
+    ado_api_calls INTEGER NOT NULL,
+    input_tokens INTEGER NOT NULL,
+    output_tokens INTEGER NOT NULL,
+    estimated_cost_usd REAL NOT NULL,
+    details TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_operations_op ON operations (operation, timestamp);
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    description TEXT NOT NULL,
+    model TEXT NOT NULL,
+    cost_usd REAL NOT NULL,
+    tokens INTEGER NOT NULL,
+    details TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_date ON sessions (date);
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    type TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_type ON events (type, timestamp);
+
+CREATE TABLE IF NOT EXISTS rollup_operation (
+    operation TEXT PRIMARY KEY,
+    runs INTEGER NOT NULL,
+    cost REAL NOT NULL,
+    ado_calls INTEGER NOT NULL,
+    first_ts TEXT NOT NULL,
+    last_ts TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rollup_operation_day (
+    day TEXT NOT NULL,
+    operation TEXT NOT NULL,
+    runs INTEGER NOT NULL,
+    cost REAL NOT NULL,
+    ado_calls INTEGER NOT NULL,
+    PRIMARY KEY (day, operation)
+);
+CREATE TABLE IF NOT EXISTS rollup_session_day (
+    day TEXT PRIMARY KEY,
+    sessions INTEGER NOT NULL,
+    cost REAL NOT NULL,
+    tokens INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rollup_session_model (
+    model TEXT PRIMARY KEY,
+    sessions INTEGER NOT NULL,
+    cost REAL NOT NULL,
+    tokens INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def telemetry_store(proj: dict) -> "TelemetryStore":
+    """Return the telemetry store for a project (output/telemetry.sqlite)."""
+    legacy = {kind: [get_output_path(proj, name) for name in names]
+              for kind, names in LEGACY_FILES.items()}
+    return TelemetryStore(get_output_path(proj, TELEMETRY_FILE), legacy)
+
+
+class TelemetryStore:
+    """Append-only telemetry tables with incrementally maintained rollups."""
+
+    def __init__(self, path: Path, legacy: dict[str, list[Path]] | None = None):
+        self.path = Path(path)
+        self.legacy = legacy or {}
+
+    # --- Writes ---
+
+    def record_operation(self, entry: dict) -> None:
+        """Insert a log_operation() entry and update the operation rollups."""
+        with self._write() as conn:
+            _insert_operation(conn, entry)
+
+    def record_session(self, entry: dict) -> None:
+        """Insert a log_session() entry and update the session rollups."""
+        with self._write() as conn:
+            _insert_session(conn, entry)
+
+    def record_event(self, event: dict) -> None:
+        """Insert a timeline event."""
+        with self._write() as conn:
+            _insert_event(conn, event)
+
+    # --- Reads ---
+
+    def operation_summary(self) -> dict:
+        """Totals and per-operation / per-day stats from the rollups."""
+        with self._read() as conn:
+            by_op = {
+                op: {"runs": runs, "cost": round(cost, 2), "ado_calls": calls}
+                for op, runs, cost, calls, _, _ in conn.execute(
+                    "SELECT * FROM rollup_operation ORDER BY operation")
+            }
+            runs, cost, calls, first, last = conn.execute(
+                "SELECT SUM(runs), SUM(cost), SUM(ado_calls), MIN(NULLIF(first_ts, '')), "
+                "MAX(NULLIF(last_ts, '')) FROM rollup_operation").fetchone()
+            by_day: dict[str, dict] = {}
+            for day, day_runs, day_cost, day_calls in conn.execute(
+                    "SELECT day, SUM(runs), SUM(cost), SUM(ado_calls) FROM rollup_operation_day "
+                    "WHERE day != '' GROUP BY day ORDER BY day"):
+                by_day[day] = {"runs": day_runs, "cost": round(day_cost, 2), "ado_calls": day_calls}
+        return {
+            "total_operations": runs or 0,
+            "total_ado_api_calls": calls or 0,
+            "total_estimated_cost_usd": round(cost or 0.0, 2),
+            "by_operation": by_op,
+            "by_day": by_day,
+            "first_operation": first,
+            "last_operation": last,
+        }
+
+    def session_summary(self, recent: int | None = None) -> dict:
+        """Session totals from the rollups, plus the `recent` latest entries (all if None)."""
+        with self._read() as conn:
+            sessions, cost, tokens = conn.execute(
+                "SELECT SUM(sessions), SUM(cost), SUM(tokens) FROM rollup_session_day").fetchone()
+            by_day = {day: {"sessions": n, "cost": round(day_cost, 2), "tokens": day_tokens}
+                      for day, n, day_cost, day_tokens in conn.execute(
+                          "SELECT * FROM rollup_session_day WHERE day != '' ORDER BY day")}
+            by_model = {model: {"sessions": n, "cost": round(m_cost, 2), "tokens": m_tokens}
+                        for model, n, m_cost, m_tokens in conn.execute(
+                            "SELECT * FROM rollup_session_model ORDER BY cost DESC")}
+            query = ("SELECT date, timestamp, session_id, description, model, cost_usd, "
+                     "tokens, details FROM sessions ORDER BY id DESC")
+            rows = conn.execute(query + (" LIMIT ?" if recent is not None else ""),
+                                (recent,) if recent is not None else ()).fetchall()
+        entries = [
+            {"date": d, "timestamp": ts, "session_id": sid, "description": desc,
+             "model": model, "cost_usd": c, "tokens": t, "details": json.loads(details)}
+            for d, ts, sid, desc, model, c, t, details in reversed(rows)
+        ]
+        return {
+            "total_sessions": sessions or 0,
+            "total_cost_usd": round(cost or 0.0, 2),
+            "total_tokens": tokens or 0,
+            "entries": entries,
+            "by_day": by_day,
+            "by_model": by_model,
+            "first_date": min(by_day) if by_day else None,
+            "last_date": max(by_day) if by_day else None,
+        }
+
+    def events(self, start: int = 0, stop: int | None = None) -> list[dict]:
+        """Events [start:stop] in insertion order."""
+        limit = -1 if stop is None else max(0, stop - start)
+        with self._read() as conn:
+            rows = conn.execute(
+                "SELECT type, timestamp, data FROM events ORDER BY id LIMIT ? OFFSET ?",
+                (limit, start),
+            ).fetchall()
+        return [_event(row) for row in rows]
+
+    def tail_events(self, n: int) -> list[dict]:
+        """The last `n` events, oldest first."""
+        with self._read() as conn:
+            rows = conn.execute(
+                "SELECT type, timestamp, data FROM events ORDER BY id DESC LIMIT ?", (n,)
+            ).fetchall()
+        return [_event(row) for row in reversed(rows)]
+
+    # --- Connections ---
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def _write(self) -> "_Transaction":
+        conn = self._connect()
+        return _Transaction(conn, self, write=True)
+
+    def _read(self) -> "_Transaction":
+        conn = self._connect()
+        if self._pending_setup(conn):
+            # Legacy import / migrations not applied yet: run them in a write first
+            conn.close()
+            with self._write():
+                pass
+            conn = self._connect()
+        return _Transaction(conn, self, write=False)
+
+    def _pending_setup(self, conn: sqlite3.Connection) -> set[str]:
+        """Meta keys of one-time imports and migrations not yet applied."""
+        done = {row[0] for row in conn.execute("SELECT key FROM meta")}
+        return ({f"imported_{kind}" for kind in _INSERTERS} | set(MIGRATIONS)) - done
+
+    def _import_legacy(self, conn: sqlite3.Connection) -> None:
+        """One-time import of the pre-store JSON files and fix-ups (in a write transaction)."""
+        pending = self._pending_setup(conn)
+        if not pending:
+            return
+        for kind, insert in _INSERTERS.items():
+            key = f"imported_{kind}"
+            if key not in pending:
+                continue
+            for path in self.legacy.get(kind, []):
+                entries = _load_legacy(path)
+                if entries is not None:
+                    for entry in entries:
+                        insert(conn, entry)
+                    break
+            conn.execute("INSERT INTO meta (key, value) VALUES (?, '1')", (key,))
+        for key, sql in MIGRATIONS.items():
+            if key in pending:
+                conn.execute(sql)
+                conn.execute("INSERT INTO meta (key, value) VALUES (?, '1')", (key,))
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE (write) or deferred BEGIN (read) … COMMIT around a block.
+
+    Rolls back on error; always closes the connection.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, store: TelemetryStore, write: bool):
+        self.conn = conn
+        self.store = store
+        self.write = write
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.conn.execute("BEGIN IMMEDIATE" if self.write else "BEGIN")
+        if self.write:
+            self.store._import_legacy(self.conn)
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            self.conn.execute("COMMIT" if exc_type is None else "ROLLBACK")
+        finally:
+            self.conn.close()
+
+
+# --- Inserts (rollups updated in the same transaction) ---
+
+def _insert_operation(conn: sqlite3.Connection, e: dict) -> None:
+    ts = e.get("timestamp", "")
+    cost = e.get("estimated_cost_usd", 0) or 0
+    calls = e.get("ado_api_calls", 0) or 0
+    op = e.get("operation", "unknown")
+    conn.execute(
+        "INSERT INTO operations (operation, timestamp, duration_seconds, ado_api_calls, "
+        "input_tokens, output_tokens, estimated_cost_usd, details) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (op, ts, e.get("duration_seconds"), calls, e.get("input_tokens", 0) or 0,
+         e.get("output_tokens", 0) or 0, cost, json.dumps(e.get("details") or {})),
+    )
+    conn.execute(
+        "INSERT INTO rollup_operation VALUES (?, 1, ?, ?, ?, ?) ON CONFLICT(operation) DO UPDATE "
+        "SET runs = runs + 1, cost = cost + excluded.cost, "
+        "ado_calls = ado_calls + excluded.ado_calls, "
+        # empty timestamps never count as first/last seen
+        "first_ts = CASE WHEN excluded.first_ts = '' THEN first_ts WHEN first_ts = '' "
+        "THEN excluded.first_ts ELSE MIN(first_ts, excluded.first_ts) END, "
+        "last_ts = MAX(last_ts, excluded.last_ts)",
+        (op, cost, calls, ts, ts),
+    )
+    conn.execute(
+        "INSERT INTO rollup_operation_day VALUES (?, ?, 1, ?, ?) ON CONFLICT(day, operation) "
+        "DO UPDATE SET runs = runs + 1, cost = cost + excluded.cost, "
+        "ado_calls = ado_calls + excluded.ado_calls",
+        (ts[:10], op, cost, calls),
+    )
+
+
+def _insert_session(conn: sqlite3.Connection, e: dict) -> None:
+    day = e.get("date") or e.get("timestamp", "")[:10]
+    cost = e.get("cost_usd", 0) or 0
+    tokens = e.get("tokens", 0) or 0
+    model = e.get("model") or (e.get("details") or {}).get("model", "") or ""
+    conn.execute(
+        "INSERT INTO sessions (date, timestamp, session_id, description, model, cost_usd, "
+        "tokens, details) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (day, e.get("timestamp", ""), e.get("session_id", ""), e.get("description", ""),
+         model, cost, tokens, json.dumps(e.get("details") or {})),
+    )
+    conn.execute(
+        "INSERT INTO rollup_session_day VALUES (?, 1, ?, ?) ON CONFLICT(day) DO UPDATE "
+        "SET sessions = sessions + 1, cost = cost + excluded.cost, tokens = tokens + excluded.tokens",
+        (day, cost, tokens),
+    )
+    conn.execute(
+        "INSERT INTO rollup_session_model VALUES (?, 1, ?, ?) ON CONFLICT(model) DO UPDATE "
+        "SET sessions = sessions + 1, cost = cost + excluded.cost, tokens = tokens + excluded.tokens",
+        (model or "unknown", cost, tokens),
+    )
+
+
+def _insert_event(conn: sqlite3.Connection, e: dict) -> None:
+    conn.execute(
+        "INSERT INTO events (type, timestamp, data) VALUES (?, ?, ?)",
+        (e.get("type", ""), e.get("timestamp", ""), json.dumps(e.get("data") or {})),
+    )
+
+
+_INSERTERS = {"operations": _insert_operation, "sessions": _insert_session,
+              "events": _insert_event}
+
+
+def _event(row: tuple) -> dict:
+    event_type, timestamp, data = row
+    return {"type": event_type, "timestamp": timestamp, "data": json.loads(data)}
+
+
+def _load_legacy(path: Path) -> list[dict] | None:
+    """Entries of a legacy JSON array or JSONL file; None if it doesn't exist."""
+    if not path.exists():
+        return None
+    try:
+        text = path.read_text(encoding="utf-8")
+    except OSError:
+        return None
+    if path.suffix == ".jsonl":
+        entries = []
+        for line in text.splitlines():
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+        return entries
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        return []
+    return data if isinstance(data, list) else []
@@ -0,0 +1,206 @@
+"""Rule-based pre-compaction of raw meeting transcripts.
+
+Raw transcripts are mostly noise (~10% signal): cue timestamps, speaker
+boilerplate, filler words, greetings and audio checks, repeated turns.
+precompact() strips that deterministically before any model sees the
+text, so the model-side compaction in conversation starts from a much
+smaller input. Nothing that could carry a requirement is rewritten:
+timestamps are only removed as cue lines or as stamps at the start of a
+line (never inside the spoken text), turns are only dropped when they
+consist entirely of small-talk phrases, and a short answer right after a
+question is always kept.
+
+Ingest applies it to text files in input/raw-transcripts/ and to any
+.vtt/.srt file. The compacted text is what lands in output/parsed/, and a
+copy is stored as output/transcripts-compact/<name>.precompact.md with the
+measured reduction in its first line (kept out of input/ so nothing that
+lists sources picks it up as another transcript).
+"""
+
+import re
+from pathlib import Path
+
+TRANSCRIPTS_DIR = "raw-transcripts"
+PRECOMPACT_DIR = "transcripts-compact"  # under output/
+PRECOMPACT_SUFFIX = ".precompact.md"
+
+_CUE_RE = re.compile(r"^\s*\d{1,2}:\d{2}(?::\d{2})?(?:[.,]\d{1,3})?\s*-->\s*\S+.*$")
+_STAMP = r"\d{1,2}:\d{2}(?::\d{2})?(?:[.,]\d{1,3})?(?:\s*[AaPp][Mm])?"
+_STAMP_ONLY_RE = re.compile(rf"^[\[(]?{_STAMP}[\])]?$")
+# "[00:01:02] Jane: ..." / "00:01:02 - Jane: ..." — a stamp that is clearly
+# a transcript marker (bracketed, or with seconds) opening the line
+_LEADING_STAMP_RE = re.compile(
+    r"^(?:[\[(]" + _STAMP + r"[\])]|\d{1,2}:\d{2}:\d{2}(?:[.,]\d{1,3})?)\s*[-–|]?\s*"
+)
+# "Jane Doe   10:02 AM" on its own line (Teams/Zoom export) → speaker header
+_HEADER_RE = re.compile(
+    r"^(?P<name>[A-Z][\w.'-]*(?: [A-Z][\w.'-]*){0,3})(?P<sep>\s{2,}|\t|\s*[|–-]\s*| )"
+    r"(?P<stamp>[\[(]?" + _STAMP + r"[\])]?)$"
+)
+_VOICE_RE = re.compile(r"^<v(?:\.[^ >]*)?\s+([^>]+)>(.*?)(?:</v>)?$")
+_SPEAKER_RE = re.compile(r"^([A-Z][\w.'-]*(?: [A-Z][\w.'-]*){0,3}|Speaker \d+)\s*:\s*(.*)$")
+_TAG_RE = re.compile(r"</?[a-z][^>]*>")
+# Disfluencies only as standalone lowercase words (capitalized when opening
+# the turn), with the comma they bring — "mm", "er" etc. clash with units
+# and abbreviations, so they are left alone
+_FILLER_RE = re.compile(r"(?:^(?:Um+|Uh+|Erm+)|\b(?:um+|uh+|erm+))\b,?")
+# "you know" / "I mean" only when set off by commas; sentence punctuation stays
+_FILLER_PHRASE_RE = re.compile(
+    r"(?P<lead>^|(?<=[.?!])|,)\s*(?:[Yy]ou know|I mean),\s*(?P<next>\w?)"
+    r"|,\s*(?:you know|I mean)(?=[.?!]|$)"
+)
+# Stutters: the same word (never a number) repeated with only spaces between
+_REPEAT_RE = re.compile(r"\b([^\W\d_]+)(?:[ \t]+\1\b)+", re.IGNORECASE)
+
+# A turn made only of these phrases and words is small talk (greetings,
+# thanks, audio checks, acknowledgements). Phrases are removed first, then
+# every remaining word has to be a standalone greeting/acknowledgement.
+_SMALL_TALK_PHRASES = re.compile(r"\b(?:" + "|".join([
+    r"can (?:you|everyone|everybody) (?:hear|see) (?:me|us|it|my screen)",
+    r"(?:you're|you are|i'm|i am|we're|we are) (?:on )?mute(?:d)?",
+    r"let me share my screen", r"(?:just )?(?:one|a) (?:sec|second|moment)",
+    r"thank you(?: (?:all|everyone|everybody|so much))?", r"good (?:morning|afternoon|evening)",
+    r"see you(?: (?:later|soon|all|tomorrow))?", r"talk (?:to you )?(?:later|soon)",
+    r"let's (?:get )?start(?:ed)?", r"go ahead", r"(?:i'm|i am) (?:back|here)",
+    r"(?:sorry|hi|hello|hey),? (?:i'm|i am) late", r"sounds good", r"all good",
+]) + r")\b")
+_SMALL_TALK = frozenset("""
+    hi hello hey everyone everybody guys folks thanks cheers okay ok yeah yep
+    alright right cool great perfect nice awesome bye goodbye sorry welcome so well
+""".split())
+
+
+def is_transcript(filepath: Path) -> bool:
+    """Should this input file be pre-compacted?"""
+    return filepath.parent.name == TRANSCRIPTS_DIR or filepath.suffix.lower() in (".vtt", ".srt")
+
+
+def precompact(text: str) -> str:
+    """Strip timestamps, boilerplate, filler, small talk and repeats from a transcript."""
+    turns = _merge_turns(_clean_turns(_split_turns(text)))
+    return "\n\n".join(f"{speaker}: {body}" if speaker else body for speaker, body in turns)
+
+
+def precompact_with_stats(text: str) -> tuple[str, dict]:
+    """Pre-compact a transcript.
+
+    Returns (compacted text, metadata) with original/compacted character
+    counts and the reduction ratio.
+    """
+    compacted = precompact(text)
+    ratio = 1 - len(compacted) / len(text) if text else 0.0
+    return compacted, {
+        "precompact_original_chars": len(text),
+        "precompact_chars": len(compacted),
+        "precompact_reduction": round(ratio, 3),
+    }
+
+
+def precompact_copy_path(out_dir: Path, filename: str) -> Path:
+    """Where the pre-compacted copy of transcript `filename` is stored."""
+    return Path(out_dir) / f"{filename}{PRECOMPACT_SUFFIX}"
+
+
+def write_precompact_copy(out_dir: Path, filename: str, compacted: str, stats: dict) -> Path:
+    """Store a pre-compacted transcript with its measured reduction; returns the path."""
+    out_path = precompact_copy_path(out_dir, filename)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    header = (f"<!-- pre-compacted from {filename}: {stats['precompact_original_chars']:,} → "
+              f"{stats['precompact_chars']:,} chars "
+              f"({stats['precompact_reduction']:.0%} reduction) -->")
+    out_path.write_text(f"{header}\n\n{compacted}\n", encoding="utf-8")
+    return out_path
+
+
+def _split_turns(text: str) -> list[list]:
+    """Parse raw lines into [speaker, text] turns, dropping cue/timestamp noise."""
+    turns: list[list] = []
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line or line == "WEBVTT" or line.startswith("NOTE") or line.isdigit():
+            continue
+        if _CUE_RE.match(line):
+            continue
+
+        voice = _VOICE_RE.match(line)
+        if voice:
+            turns.append([voice.group(1).strip(), voice.group(2)])
+            continue
+
+        if _STAMP_ONLY_RE.match(line):
+            continue
+        header = _HEADER_RE.match(line)
+        if header and _is_speaker_header(header):
+            turns.append([header.group("name"), ""])
+            continue
+        stripped = _LEADING_STAMP_RE.sub("", line, count=1)
+        if not stripped:
+            continue
+        speaker = _SPEAKER_RE.match(stripped)
+        if speaker:
+            turns.append([speaker.group(1), speaker.group(2)])
+        elif turns:
+            turns[-1][1] = f"{turns[-1][1]} {stripped}".strip()
+        else:
+            turns.append(["", stripped])
+    return turns
+
+
+def _clean_turns(turns: list[list]) -> list[list]:
+    """Remove filler, then small-talk turns and repeated turns."""
+    cleaned = []
+    seen = set()
+    previous_asked = False
+    for speaker, body in turns:
+        body = _TAG_RE.sub("", body)
+        body = _FILLER_PHRASE_RE.sub(_drop_phrase, body)
+        body = _FILLER_RE.sub(" ", body)
+        body = _REPEAT_RE.sub(r"\1", body)
+        body = re.sub(r"\s+([,.?!])", r"\1", re.sub(r"\s+", " ", body)).strip(" ,")
+        if body[:1].islower() and body[:1].isalpha():
+            body = body[0].upper() + body[1:]
+        words = re.findall(r"[a-z']+", body.lower())
+        if not words:
+            continue
+
+        key = " ".join(words)
+        small_talk = len(words) <= 12 and all(
+            w.strip("'") in _SMALL_TALK for w in _SMALL_TALK_PHRASES.sub(" ", key).split())
+        if (small_talk and not previous_asked) or (key in seen and len(words) >= 4):
+            continue
+        seen.add(key)
+        cleaned.append([speaker, body])
+        previous_asked = body.endswith("?")
+    return cleaned
+
+
+def _drop_phrase(match: re.Match) -> str:
+    """_FILLER_PHRASE_RE replacement; a sentence the phrase opened stays capitalized."""
+    following = match.group("next") or ""
+    if match.group("lead") is not None and match.group("lead") != ",":
+        following = following.upper()
+    return f" {following}"
+
+
+def _merge_turns(turns: list[list]) -> list[list]:
+    """Join consecutive turns by the same speaker."""
+    merged: list[list] = []
+    for speaker, body in turns:
+        if merged and merged[-1][0] == speaker:
+            merged[-1][1] = f"{merged[-1][1]} {body}"
+        else:
+            merged.append([speaker, body])
+    return merged
+
+
+def _is_speaker_header(header: re.Match) -> bool:
+    """Tell "Jane Doe   10:02 AM" (a header) from "Deadline 10:30" (content).
+
+    A header has the stamp set apart (tab, 2+ spaces or a separator), or a
+    full name followed by an unmistakable stamp (seconds, AM/PM, brackets).
+    """
+    stamp = header.group("stamp")
+    if header.group("sep") != " ":
+        return True
+    marked = stamp.count(":") == 2 or stamp[:1] in "[(" or stamp[-1:].lower() == "m"
+    return marked and len(header.group("name").split()) >= 2
@@ -1,11 +1,12 @@
-"""Pipeline usage tracking — per-project cost and API call logging."""
+"""Pipeline usage tracking — per-project cost and API call logging.
+
+Entries live in the project's telemetry store (core.telemetry).
+"""
 
-import json
 import math
 from datetime import datetime, timezone
-from pathlib import Path
 
-from core.config import get_output_path
+from core.telemetry import telemetry_store
 
 # Pricing: Claude API rates (USD per 1M tokens)
 PRICING = {
@@ -13,8 +14,6 @@ PRICING = {
     "opus_output_per_1m": 75.0,
 }
 
-USAGE_FILE = "pipeline_usage.json"
-
 
 def estimate_tokens(text: str) -> int:
     """Estimate token count from text (~4 chars per token)."""
@@ -38,7 +37,7 @@ def log_operation(
     output_tokens: int = 0,
     details: dict | None = None,
 ) -> dict:
-    """Append a usage entry to pipeline_usage.json.
+    """Record a usage entry in the project's telemetry store.
 
     Args:
         proj: Project config dict
@@ -65,21 +64,12 @@ def log_operation(
         "details": details or {},
     }
 
-    # Load existing entries
-    usage_path = get_output_path(proj, USAGE_FILE)
-    entries = _load_entries(usage_path)
-    entries.append(entry)
-
-    # Write back
-    usage_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(usage_path, "w", encoding="utf-8") as f:
-        json.dump(entries, f, indent=2)
-
+    telemetry_store(proj).record_operation(entry)
     return entry
 
 
 def get_usage_summary(proj: dict) -> dict:
-    """Read pipeline_usage.json and return aggregated stats.
+    """Return aggregated usage stats (read from the telemetry rollups).
 
     Returns:
         {
@@ -90,64 +80,9 @@ def get_usage_summary(proj: dict) -> dict:
                 "push": {"runs": int, "cost": float, "ado_calls": int},
                 ...
             },
+            "by_day": {"2026-02-14": {"runs": int, "cost": float, "ado_calls": int}, ...},
             "first_operation": str | None,
             "last_operation": str | None,
         }
     """
-    usage_path = get_output_path(proj, USAGE_FILE)
-    entries = _load_entries(usage_path)
-
-    if not entries:
-        return {
-            "total_operations": 0,
-            "total_ado_api_calls": 0,
-            "total_estimated_cost_usd": 0.0,
-            "by_operation": {},
-            "first_operation": None,
-            "last_operation": None,
-        }
-
-    total_ops = len(entries)
-    total_ado = sum(e.get("ado_api_calls", 0) for e in entries)
-    total_cost = sum(e.get("estimated_cost_usd", 0) for e in entries)
-
-    by_op: dict[str, dict] = {}
-    for e in entries:
-        op = e.get("operation", "unknown")
-        if op not in by_op:
-            by_op[op] = {"runs": 0, "cost": 0.0, "ado_calls": 0}
-        by_op[op]["runs"] += 1
-        by_op[op]["cost"] += e.get("estimated_cost_usd", 0)
-        by_op[op]["ado_calls"] += e.get("ado_api_calls", 0)
-
-    # Round costs
-    total_cost = round(total_cost, 2)
-    for info in by_op.values():
-        info["cost"] = round(info["cost"], 2)
-
-    timestamps = [e.get("timestamp", "") for e in entries if e.get("timestamp")]
-    first = min(timestamps) if timestamps else None
-    last = max(timestamps) if timestamps else None
-
-    return {
-        "total_operations": total_ops,
-        "total_ado_api_calls": total_ado,
-        "total_estimated_cost_usd": total_cost,
-        "by_operation": by_op,
-        "first_operation": first,
-        "last_operation": last,
-    }
-
-
-def _load_entries(path: Path) -> list[dict]:
-    """Load usage entries from JSON file, returning empty list if missing/invalid."""
-    if not path.exists():
-        return []
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        if isinstance(data, list):
-            return data
-    except (json.JSONDecodeError, OSError):
-        pass
-    return []
+    return telemetry_store(proj).operation_summary()
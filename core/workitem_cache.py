@@ -0,0 +1,180 @@
+"""Local SQLite cache of a project's ADO work items.
+
+Stores every Epic, Feature and User Story of the configured ADO project by ID together with its
+System.Rev and System.ChangedDate, in output/ado_cache.sqlite. A refresh
+only downloads what changed since the last one:
+
+  1. WIQL delta query: IDs with [System.ChangedDate] > the newest
+     ChangedDate already cached (ADO's own clock, so no client skew).
+     ChangedDate is stored normalized to UTC with microsecond precision
+     ("2026-01-05T10:00:05.120000Z"), since ADO varies the number of
+     fractional digits and raw strings don't sort chronologically.
+  2. WIQL ID-only query over the same types to drop deleted items
+  3. Full details for the changed IDs only (200 per request)
+
+The first refresh (or a scope change, or refresh(full=True)) downloads
+everything. ado_client.get_all_work_items / get_all_stories accept a
+cache and serve from it.
+"""
+
+import json
+import re
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from core import ado as ado_client
+from core.config import get_output_path
+from core.sqlite_util import ClosingConnection, connect
+
+CACHE_FILE = "ado_cache.sqlite"
+SYNC_TYPES = ("Epic", "Feature", "User Story")
+CACHE_MAX_AGE = 300  # seconds a refresh stays fresh enough to skip ADO entirely
+CACHE_FORMAT = "3"   # bump when stored columns or query scope change — forces a full refresh
+
+_ADO_DATE_RE = re.compile(r"^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})(?:\.(\d+))?(Z|[+-]\d{2}:?\d{2})?$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS work_items (
+    id INTEGER PRIMARY KEY,
+    rev INTEGER NOT NULL,
+    changed_date TEXT NOT NULL,
+    work_item_type TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_work_items_type ON work_items (work_item_type);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def work_item_cache(proj: dict) -> "WorkItemCache":
+    """Return the work item cache for a project (output/ado_cache.sqlite)."""
+    return WorkItemCache(get_output_path(proj, CACHE_FILE))
+
+
+class WorkItemCache:
+    """Revision-aware cache of ADO work items, refreshed incrementally."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.last_refresh: dict = {}
+
+    def get_items(self, config: ado_client.AdoConfig, types=SYNC_TYPES,
+                  max_age: float | None = None) -> list[dict]:
+        """Return cached work items of the given types, ordered by ID.
+
+        Freshness policy: if the last refresh is younger than `max_age`
+        seconds (default CACHE_MAX_AGE) the cache is served as-is; otherwise
+        a delta refresh runs first. max_age=0 always refreshes.
+        """
+        if max_age is None:
+            max_age = CACHE_MAX_AGE
+        age = self.age()
+        if age is None or age >= max_age:
+            self.refresh(config)
+        placeholders = ",".join("?" for _ in types)
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT data FROM work_items WHERE work_item_type IN ({placeholders}) "
+                "ORDER BY id",
+                list(types),
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def refresh(self, config: ado_client.AdoConfig, full: bool = False) -> dict:
+        """Bring the cache up to date with ADO.
+
+        Returns {"fetched": n, "removed": n, "full": bool} (also kept in
+        self.last_refresh).
+        """
+        scope = f"{config.organization}/{config.project}"
+        with self._connect() as conn:
+            meta = dict(conn.execute("SELECT key, value FROM meta").fetchall())
+            if meta.get("scope") != scope or meta.get("format") != CACHE_FORMAT:
+                full = True
+            watermark = None if full else conn.execute(
+                "SELECT MAX(changed_date) FROM work_items"
+            ).fetchone()[0]
+
+        type_list = ", ".join(f"'{t}'" for t in SYNC_TYPES)
+        base_wiql = (f"SELECT [System.Id] FROM WorkItems WHERE [System.TeamProject] = @project "
+                     f"AND [System.WorkItemType] IN ({type_list})")
+
+        if watermark:
+            changed_ids = ado_client.query_work_item_ids(
+                config, f"{base_wiql} AND [System.ChangedDate] > '{watermark}'",
+                time_precision=True,
+            )
+            live_ids = set(ado_client.query_work_item_ids(config, base_wiql))
+        else:
+            changed_ids = ado_client.query_work_item_ids(config, base_wiql)
+            live_ids = set(changed_ids)
+
+        items = ado_client.get_work_items_by_ids(config, changed_ids)
+
+        with self._connect() as conn:
+            if full:
+                conn.execute("DELETE FROM work_items")
+            cached_ids = {row[0] for row in conn.execute("SELECT id FROM work_items")}
+            removed = cached_ids - live_ids
+            conn.executemany("DELETE FROM work_items WHERE id = ?", [(i,) for i in removed])
+            conn.executemany(
+                "INSERT INTO work_items (id, rev, changed_date, work_item_type, data) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET rev = excluded.rev, "
+                "changed_date = excluded.changed_date, "
+                "work_item_type = excluded.work_item_type, data = excluded.data "
+                "WHERE excluded.rev >= work_items.rev",
+                [_row(item) for item in items],
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [("scope", scope), ("format", CACHE_FORMAT), ("synced_at", str(time.time()))],
+            )
+
+        self.last_refresh = {"fetched": len(items), "removed": len(removed), "full": full}
+        return self.last_refresh
+
+    def age(self) -> float | None:
+        """Seconds since the last refresh, or None if the cache was never filled."""
+        if not self.path.exists():
+            return None
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'synced_at'").fetchone()
+        return time.time() - float(row[0]) if row else None
+
+    def _connect(self) -> ClosingConnection:
+        return connect(self.path, _SCHEMA)
+
+
+def _row(item: dict) -> tuple:
+    fields = item.get("fields", {})
+    return (
+        item["id"],
+        item.get("rev", fields.get("System.Rev", 0)),
+        normalize_changed_date(fields.get("System.ChangedDate", "")),
+        fields.get("System.WorkItemType", ""),
+        json.dumps(item),
+    )
+
+
+def normalize_changed_date(value: str) -> str:
+    """ADO ChangedDate → "YYYY-MM-DDTHH:MM:SS.ffffffZ" in UTC (sortable as text).
+
+    Fractions beyond microseconds are truncated, which can only move the
+    delta watermark earlier (re-fetching an item, never skipping one).
+    Unparseable values are returned unchanged.
+    """
+    m = _ADO_DATE_RE.match(value or "")
+    if not m:
+        return value or ""
+    base, fraction, zone = m.groups()
+    micros = (fraction or "").ljust(6, "0")[:6]
+    offset = "+00:00" if zone in (None, "Z") else zone
+    if ":" not in offset:
+        offset = f"{offset[:3]}:{offset[3:]}"
+    dt = datetime.fromisoformat(f"{base}.{micros}{offset}").astimezone(timezone.utc)
+    return dt.strftime("%Y-%m-%dT%H:%M:%S.%fZ")